@@ -0,0 +1,129 @@
+"""
+Markdown compaction throughput benchmark
+
+Generates MarkItDown-like output in memory (paragraphs with padded
+whitespace, padded tables, running headers/footers and page numbers on
+every page, repeated disclaimers and empty sections) and compacts it both
+as one document and streamed page by page. Reports MB/s, bytes and
+estimated tokens saved, and what was removed, for each size.
+
+    python -m benchmarks.bench_compaction
+    python -m benchmarks.bench_compaction --pages 100 5000 --repeats 3 -o compaction.json
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from benchmarks.bench_formats import percentile
+from benchmarks.corpus import WORDS
+
+DEFAULT_PAGES = [100, 1000, 5000]
+DEFAULT_REPEATS = 3
+DISCLAIMER = "This document is provided for information purposes only and is not an offer."
+
+def generate_document(pages: int, seed: int = 0) -> List[str]:
+    """
+    Build a synthetic MarkItDown PDF rendering
+
+    Args:
+        pages: Number of pages
+        seed: Random seed, so runs are comparable
+
+    Returns:
+        One string per page, each terminated by a form feed like pdfminer's
+    """
+    rng = random.Random(seed)
+
+    def sentence() -> str:
+        return " ".join(rng.choice(WORDS) for _ in range(12)).capitalize() + "."
+
+    document = []
+    for page in range(1, pages + 1):
+        lines = ["Acme Corporation   Annual Report 2024", "Confidential", ""]
+        if page % 5 == 1:
+            lines += [f"## Chapter {page // 5 + 1}", "", "### Contents", "", "### Overview", ""]
+        for paragraph in range(6):
+            # pdfminer keeps column gaps as runs of spaces and pads line ends
+            lines.append("   ".join(sentence() for _ in range(2)) + "    ")
+            lines.append("")
+            if paragraph == 2:
+                lines += [DISCLAIMER, ""]
+        if page % 3 == 0:
+            lines += ["| Item        | Quantity   | Price      |", "|-------------|------------|------------|"]
+            lines += [f"| {rng.choice(WORDS):<11} | {rng.randint(1, 99):<10} | {rng.random() * 100:<10.2f} |" for _ in range(8)]
+            lines.append("")
+        lines += ["", "", f"Page {page} of {pages}", "\f"]
+        document.append("\n".join(lines))
+    return document
+
+def bench_size(pages: int, repeats: int) -> Dict[str, Any]:
+    """
+    Time whole-document and streamed compaction of one document size
+
+    Args:
+        pages: Pages in the synthetic document
+        repeats: Timed runs per mode
+
+    Returns:
+        Throughput and savings figures
+    """
+    from src.utils.compaction import MarkdownCompactor, compact_markdown, iter_compacted
+
+    document = generate_document(pages)
+    text = "".join(document)
+    mb = len(text.encode("utf-8")) / (1024 * 1024)
+
+    whole: List[float] = []
+    streamed: List[float] = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        output, stats = compact_markdown(text)
+        whole.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        compactor = MarkdownCompactor()
+        streamed_output = "".join(iter_compacted(document, compactor))
+        streamed.append(time.perf_counter() - started)
+
+    return {
+        'pages': pages,
+        'input_mb': round(mb, 3),
+        'whole_mb_per_s': round(mb / percentile(whole, 50), 2),
+        'streamed_mb_per_s': round(mb / percentile(streamed, 50), 2),
+        'bytes_saved': stats.bytes_saved,
+        'tokens_saved': stats.tokens_saved,
+        'size_ratio': round(stats.ratio, 3),
+        'token_ratio': round(stats.output_tokens / stats.input_tokens, 3) if stats.input_tokens else 1.0,
+        'furniture_lines': stats.furniture_lines,
+        'duplicate_lines': stats.duplicate_lines,
+        'empty_sections': stats.empty_sections,
+        'streamed_matches_whole': streamed_output == output,
+    }
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the benchmark from the command line"""
+    parser = argparse.ArgumentParser(description="Markdown compaction benchmark")
+    parser.add_argument("--pages", nargs="+", type=int, default=DEFAULT_PAGES, help="Document sizes in pages")
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Timed runs per size and mode")
+    parser.add_argument("-o", "--output", type=Path, help="Write the JSON report here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for pages in args.pages:
+        print(f"benchmarking {pages} pages", file=sys.stderr)
+        results.append(bench_size(pages, args.repeats))
+    report = {'repeats': args.repeats, 'results': results}
+
+    encoded = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(encoded + "\n")
+    else:
+        print(encoded)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+Fast-path vs MarkItDown benchmark for plain text and HTML
+
+Converts the same synthetic .txt/.html corpus with MarkdownConverter's
+lightweight fast paths and with the generic MarkItDown pipeline, and
+reports files/s, MB/s and p50/p95 latency for each, plus the speedup.
+Each (format, path) pair runs in a fresh process so import costs show up
+in cold_start_ms rather than leaking between runs.
+
+    python -m benchmarks.bench_fast_paths
+    python -m benchmarks.bench_fast_paths --formats txt --repeats 50 -o fast.json
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from benchmarks.bench_formats import percentile
+from benchmarks.corpus import CorpusFile, generate_corpus
+
+FORMATS = ['txt', 'html']
+DEFAULT_REPEATS = 20
+# Bulk ingest is dominated by small documents
+SIZES = {
+    'small': 1,
+    'medium': 10,
+}
+
+def bench_path(files: List[CorpusFile], fast_paths: bool, repeats: int, output_dir: str) -> Dict[str, Any]:
+    """
+    Time every file of one format with one conversion path (runs in a fresh process)
+
+    Args:
+        files: Corpus files of a single format
+        fast_paths: Whether to use the lightweight converters
+        repeats: Timed conversions per file
+        output_dir: Directory for the .md outputs
+
+    Returns:
+        Throughput and latency figures
+    """
+    from src.utils.converters import MarkdownConverter
+
+    converter = MarkdownConverter(fast_paths=fast_paths)
+
+    started = time.perf_counter()
+    converter.convert_file(files[0].path, output_dir=output_dir)
+    cold_start_ms = (time.perf_counter() - started) * 1000
+
+    latencies: List[float] = []
+    errors = set()
+    total_bytes = 0
+    for _ in range(repeats):
+        for corpus_file in files:
+            started = time.perf_counter()
+            result = converter.convert_file(corpus_file.path, output_dir=output_dir)
+            latencies.append(time.perf_counter() - started)
+            total_bytes += corpus_file.bytes
+            if not result.success:
+                errors.add(f"{corpus_file.path.name}: {result.error}")
+
+    elapsed = sum(latencies)
+    return {
+        'files': len(latencies),
+        'files_per_s': round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        'mb_per_s': round(total_bytes / (1024 * 1024) / elapsed, 3) if elapsed else 0.0,
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'cold_start_ms': round(cold_start_ms, 3),
+        'errors': sorted(errors),
+    }
+
+def run_benchmark(formats: List[str], corpus_dir: Path, repeats: int = DEFAULT_REPEATS) -> Dict[str, Any]:
+    """
+    Benchmark both conversion paths for each format
+
+    Returns:
+        JSON-serializable report keyed by format
+    """
+    files = generate_corpus(corpus_dir, formats, SIZES)
+    results: Dict[str, Any] = {}
+    with tempfile.TemporaryDirectory(prefix="murkdown-bench-") as output_dir:
+        for fmt in formats:
+            format_files = [f for f in files if f.format == fmt]
+            results[fmt] = {}
+            for name, fast_paths in (('generic', False), ('fast', True)):
+                print(f"benchmarking {fmt} ({name})", file=sys.stderr)
+                with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                    try:
+                        results[fmt][name] = pool.submit(
+                            bench_path, format_files, fast_paths, repeats, output_dir
+                        ).result()
+                    except Exception as e:
+                        results[fmt][name] = {'errors': [f"benchmark crashed: {e}"]}
+            generic = results[fmt]['generic'].get('files_per_s')
+            fast = results[fmt]['fast'].get('files_per_s')
+            if generic and fast:
+                results[fmt]['speedup'] = round(fast / generic, 2)
+    return {'repeats': repeats, 'sizes': SIZES, 'results': results}
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the benchmark from the command line"""
+    parser = argparse.ArgumentParser(description="Fast-path vs MarkItDown benchmark")
+    parser.add_argument("--formats", nargs="+", default=FORMATS, choices=FORMATS)
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Timed passes over the corpus")
+    parser.add_argument("--corpus-dir", type=Path, help="Reuse or keep the generated corpus here")
+    parser.add_argument("-o", "--output", type=Path, help="Write the JSON report here (default: stdout)")
+    args = parser.parse_args(argv)
+
+    if args.corpus_dir:
+        report = run_benchmark(args.formats, args.corpus_dir, args.repeats)
+    else:
+        with tempfile.TemporaryDirectory(prefix="murkdown-corpus-") as corpus_dir:
+            report = run_benchmark(args.formats, Path(corpus_dir), args.repeats)
+
+    encoded = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(encoded + "\n")
+    else:
+        print(encoded)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+"""
+Per-format conversion benchmark for MurkDown
+
+Runs the synthetic corpus through MarkdownConverter.convert_file and
+reports throughput (MB/s, pages/s), p50/p95 latency and peak RSS per
+format as JSON. Each format runs in a fresh process so peak RSS is not
+inflated by the formats measured before it.
+
+    python -m benchmarks.bench_formats -o bench.json
+    python -m benchmarks.bench_formats --formats pdf docx --baseline bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from benchmarks.corpus import GENERATORS, SIZES, CorpusFile, generate_corpus
+from src import __version__
+
+# Audio is excluded by default: MarkItDown transcribes it with an online recognizer
+DEFAULT_FORMATS = ['pdf', 'docx', 'pptx', 'xlsx', 'txt', 'html', 'png', 'jpg', 'jpeg']
+DEFAULT_REPEATS = 5
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the current process in MB"""
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def summarize(latencies: List[float], total_bytes: int, total_pages: int) -> Dict[str, float]:
+    """Throughput and latency figures for a set of timed conversions"""
+    elapsed = sum(latencies)
+    return {
+        'runs': len(latencies),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+        'mb_per_s': round(total_bytes / (1024 * 1024) / elapsed, 3) if elapsed else 0.0,
+        'pages_per_s': round(total_pages / elapsed, 3) if elapsed else 0.0,
+    }
+
+def bench_format(files: List[CorpusFile], repeats: int, output_dir: str) -> Dict[str, Any]:
+    """
+    Benchmark every file of one format (runs inside a fresh worker process)
+
+    Args:
+        files: Corpus files of a single format
+        repeats: Timed conversions per file
+        output_dir: Directory for the .md outputs
+
+    Returns:
+        Per-size and overall figures for the format
+    """
+    from src.utils.converters import MarkdownConverter
+
+    converter = MarkdownConverter()
+    baseline_rss = peak_rss_mb()
+
+    # The first conversion pays for imports; report it separately
+    started = time.perf_counter()
+    warmup = converter.convert_file(files[0].path, output_dir=output_dir)
+    cold_start_ms = (time.perf_counter() - started) * 1000
+
+    report: Dict[str, Any] = {'sizes': {}, 'errors': [] if warmup.success else [warmup.error]}
+    all_latencies: List[float] = []
+    all_bytes = all_pages = 0
+    for corpus_file in files:
+        latencies = []
+        for _ in range(repeats):
+            started = time.perf_counter()
+            result = converter.convert_file(corpus_file.path, output_dir=output_dir)
+            latencies.append(time.perf_counter() - started)
+            if not result.success:
+                report['errors'].append(f"{corpus_file.path.name}: {result.error}")
+        size_bytes = corpus_file.bytes * repeats
+        size_pages = corpus_file.pages * repeats
+        report['sizes'][corpus_file.size] = {
+            'file': corpus_file.path.name,
+            'bytes': corpus_file.bytes,
+            'pages': corpus_file.pages,
+            **summarize(latencies, size_bytes, size_pages),
+        }
+        all_latencies.extend(latencies)
+        all_bytes += size_bytes
+        all_pages += size_pages
+
+    report.update(summarize(all_latencies, all_bytes, all_pages))
+    report['cold_start_ms'] = round(cold_start_ms, 3)
+    report['baseline_rss_mb'] = round(baseline_rss, 1)
+    report['peak_rss_mb'] = round(peak_rss_mb(), 1)
+    report['errors'] = sorted(set(report['errors']))
+    return report
+
+def run_benchmark(
+    formats: List[str],
+    corpus_dir: Path,
+    repeats: int = DEFAULT_REPEATS,
+    sizes: Dict[str, int] = SIZES,
+) -> Dict[str, Any]:
+    """
+    Generate the corpus and benchmark each format in its own process
+
+    Returns:
+        JSON-serializable benchmark report
+    """
+    files = generate_corpus(corpus_dir, formats, sizes)
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="murkdown-bench-") as output_dir:
+        for fmt in formats:
+            format_files = [f for f in files if f.format == fmt]
+            print(f"benchmarking {fmt} ({len(format_files)} files x {repeats})", file=sys.stderr)
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                try:
+                    results[fmt] = pool.submit(bench_format, format_files, repeats, output_dir).result()
+                except Exception as e:
+                    results[fmt] = {'errors': [f"benchmark crashed: {e}"]}
+
+    return {
+        'meta': {
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            'murkdown': __version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'repeats': repeats,
+            'sizes': sizes,
+        },
+        'results': results,
+    }
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any]) -> List[str]:
+    """
+    Describe changes in p50 latency and throughput against a previous run
+
+    Returns:
+        One line per format present in both reports
+    """
+    lines = []
+    for fmt, result in current['results'].items():
+        previous = baseline.get('results', {}).get(fmt)
+        if not previous or 'p50_ms' not in previous or 'p50_ms' not in result:
+            continue
+        deltas = []
+        for key in ('p50_ms', 'p95_ms', 'mb_per_s', 'peak_rss_mb'):
+            if previous.get(key):
+                change = (result[key] - previous[key]) / previous[key] * 100
+                deltas.append(f"{key} {change:+.1f}%")
+        lines.append(f"{fmt:6} " + "  ".join(deltas))
+    return lines
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the benchmark from the command line"""
+    parser = argparse.ArgumentParser(description="Per-format MurkDown conversion benchmark")
+    parser.add_argument("--formats", nargs="+", default=DEFAULT_FORMATS, choices=sorted(GENERATORS))
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS, help="Timed runs per file")
+    parser.add_argument("--corpus-dir", type=Path, help="Reuse or keep the generated corpus here")
+    parser.add_argument("-o", "--output", type=Path, help="Write the JSON report here (default: stdout)")
+    parser.add_argument("--baseline", type=Path, help="Previous JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    if args.corpus_dir:
+        report = run_benchmark(args.formats, args.corpus_dir, args.repeats)
+    else:
+        with tempfile.TemporaryDirectory(prefix="murkdown-corpus-") as corpus_dir:
+            report = run_benchmark(args.formats, Path(corpus_dir), args.repeats)
+
+    encoded = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(encoded + "\n")
+    else:
+        print(encoded)
+
+    if args.baseline:
+        for line in compare(report, json.loads(args.baseline.read_text())):
+            print(line, file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""
+Synthetic benchmark corpus for MurkDown
+
+Generates deterministic documents for each supported format at several
+sizes. Sizes are expressed in logical pages so throughput can be compared
+across formats: PDF pages, DOCX page breaks, PPTX slides, 50 XLSX rows,
+~3000 characters of TXT/HTML, one image, or ten seconds of audio.
+"""
+from pathlib import Path
+from typing import Callable, Dict, List, Union
+from dataclasses import dataclass
+import math
+import random
+import struct
+import wave
+
+# Constants
+SIZES = {
+    'small': 1,
+    'medium': 10,
+    'large': 100,
+}
+CHARS_PER_PAGE = 3000
+ROWS_PER_PAGE = 50
+AUDIO_SECONDS_PER_PAGE = 10
+WORDS = (
+    "purr meow whisker paw tail feline kitten nap sunbeam cardboard box yarn "
+    "markdown document convert parse table heading paragraph list token model "
+    "context window chunk embed vector index search query answer summary"
+).split()
+
+@dataclass
+class CorpusFile:
+    """Data class for a generated benchmark document"""
+    path: Path
+    format: str
+    size: str
+    pages: int
+
+    @property
+    def bytes(self) -> int:
+        """Size of the generated file"""
+        return self.path.stat().st_size
+
+def _sentence(rng: random.Random, words: int = 12) -> str:
+    """Build a pseudo-random sentence"""
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text.capitalize() + "."
+
+def _paragraph(rng: random.Random, sentences: int = 5) -> str:
+    """Build a pseudo-random paragraph"""
+    return " ".join(_sentence(rng) for _ in range(sentences))
+
+def _page_text(rng: random.Random) -> List[str]:
+    """Build roughly one page worth of paragraphs"""
+    paragraphs = []
+    while sum(len(p) for p in paragraphs) < CHARS_PER_PAGE:
+        paragraphs.append(_paragraph(rng))
+    return paragraphs
+
+def generate_txt(path: Path, pages: int, rng: random.Random) -> None:
+    """Generate a plain text document"""
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(pages):
+            f.write("\n\n".join(_page_text(rng)))
+            f.write("\n\n")
+
+def generate_html(path: Path, pages: int, rng: random.Random) -> None:
+    """Generate an HTML document with headings, lists and a table"""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("<!DOCTYPE html><html><head><title>Benchmark</title></head><body>\n")
+        for page in range(pages):
+            f.write(f"<h1>Section {page + 1}</h1>\n")
+            for paragraph in _page_text(rng):
+                f.write(f"<p>{paragraph}</p>\n")
+            f.write("<ul>" + "".join(f"<li>{_sentence(rng, 5)}</li>" for _ in range(3)) + "</ul>\n")
+            f.write("<table><tr><th>Name</th><th>Value</th></tr>")
+            f.write("".join(f"<tr><td>{rng.choice(WORDS)}</td><td>{rng.randint(0, 9999)}</td></tr>" for _ in range(5)))
+            f.write("</table>\n")
+        f.write("</body></html>\n")
+
+def generate_pdf(path: Path, pages: int, rng: random.Random) -> None:
+    """Generate a text PDF without third-party libraries"""
+    objects: List[bytes] = []
+    page_ids = []
+    font_id = 3
+
+    # 1: catalog, 2: page tree, 3: font, then a page + content stream per page
+    objects.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objects.append(b"")  # page tree, filled in once page ids are known
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    for _ in range(pages):
+        lines = []
+        for paragraph in _page_text(rng):
+            words = paragraph.split()
+            for start in range(0, len(words), 12):
+                lines.append(" ".join(words[start:start + 12]))
+        stream = ["BT", "/F1 10 Tf", "12 TL", "50 800 Td"]
+        for line in lines[:64]:
+            escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            stream.append(f"({escaped}) Tj T*")
+        stream.append("ET")
+        content = "\n".join(stream).encode("latin-1")
+        content_id = len(objects) + 2
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 {font_id} 0 R >> >> /Contents {content_id} 0 R >>".encode()
+        )
+        page_ids.append(len(objects))
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+
+    with open(path, "wb") as f:
+        f.write(b"%PDF-1.4\n")
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(f.tell())
+            f.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+        xref_offset = f.tell()
+        f.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+        for offset in offsets:
+            f.write(b"%010d 00000 n \n" % offset)
+        f.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref_offset))
+
+def generate_docx(path: Path, pages: int, rng: random.Random) -> None:
+    """Generate a Word document with one page break per page"""
+    from docx import Document
+
+    document = Document()
+    for page in range(pages):
+        document.add_heading(f"Section {page + 1}", level=1)
+        for paragraph in _page_text(rng):
+            document.add_paragraph(paragraph)
+        table = document.add_table(rows=4, cols=3)
+        for row in table.rows:
+            for cell in row.cells:
+                cell.text = rng.choice(WORDS)
+        document.add_page_break()
+    document.save(path)
+
+def generate_pptx(path: Path, pages: int, rng: random.Random) -> None:
+    """Generate a PowerPoint deck with one slide per page"""
+    from pptx import Presentation
+
+    presentation = Presentation()
+    layout = presentation.slide_layouts[1]
+    for page in range(pages):
+        slide = presentation.slides.add_slide(layout)
+        slide.shapes.title.text = f"Slide {page + 1}"
+        body = slide.placeholders[1].text_frame
+        body.text = _sentence(rng)
+        for _ in range(5):
+            body.add_paragraph().text = _sentence(rng, 8)
+    presentation.save(path)
+
+def generate_xlsx(path: Path, pages: int, rng: random.Random) -> None:
+    """Generate a spreadsheet with ROWS_PER_PAGE rows per page"""
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Data")
+    sheet.append(["id", "name", "category", "amount", "note"])
+    for row in range(pages * ROWS_PER_PAGE):
+        sheet.append([row, rng.choice(WORDS), rng.choice(WORDS), round(rng.uniform(0, 10000), 2), _sentence(rng, 6)])
+    workbook.save(path)
+
+def _generate_image(path: Path, pages: int, rng: random.Random, image_format: str) -> None:
+    """Generate an image with text, scaled with the page count"""
+    from PIL import Image, ImageDraw
+
+    side = int(512 * math.sqrt(pages))
+    image = Image.new("RGB", (side, side), "white")
+    draw = ImageDraw.Draw(image)
+    for y in range(10, side - 20, 20):
+        draw.text((10, y), _sentence(rng, 10), fill="black")
+    image.save(path, format=image_format)
+
+def generate_png(path: Path, pages: int, rng: random.Random) -> None:
+    """Generate a PNG image"""
+    _generate_image(path, pages, rng, "PNG")
+
+def generate_jpg(path: Path, pages: int, rng: random.Random) -> None:
+    """Generate a JPEG image"""
+    _generate_image(path, pages, rng, "JPEG")
+
+def generate_wav(path: Path, pages: int, rng: random.Random) -> None:
+    """Generate a mono 16kHz WAV file of tones"""
+    rate = 16000
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        for _ in range(pages * AUDIO_SECONDS_PER_PAGE):
+            frequency = rng.choice((220, 330, 440))
+            samples = (int(8000 * math.sin(2 * math.pi * frequency * i / rate)) for i in range(rate))
+            f.writeframes(b"".join(struct.pack("<h", s) for s in samples))
+
+# mp3 has no generator: encoding it needs ffmpeg, which the corpus avoids
+GENERATORS: Dict[str, Callable[[Path, int, random.Random], None]] = {
+    'pdf': generate_pdf,
+    'docx': generate_docx,
+    'pptx': generate_pptx,
+    'xlsx': generate_xlsx,
+    'txt': generate_txt,
+    'html': generate_html,
+    'png': generate_png,
+    'jpg': generate_jpg,
+    'jpeg': generate_jpg,
+    'wav': generate_wav,
+}
+
+def generate_corpus(
+    output_dir: Union[str, Path],
+    formats: List[str],
+    sizes: Dict[str, int] = SIZES,
+    seed: int = 0,
+) -> List[CorpusFile]:
+    """
+    Generate (or reuse) benchmark documents
+
+    Args:
+        output_dir: Directory for the generated files
+        formats: Formats to generate; must be keys of GENERATORS
+        sizes: Mapping of size label to page count
+        seed: Random seed, so runs compare identical inputs
+
+    Returns:
+        List of generated files
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    files = []
+    for fmt in formats:
+        for size, pages in sizes.items():
+            path = output_dir / f"{size}-{pages}p.{fmt}"
+            if not path.exists():
+                GENERATORS[fmt](path, pages, random.Random(f"{seed}-{fmt}-{size}"))
+            files.append(CorpusFile(path=path, format=fmt, size=size, pages=pages))
+    return files
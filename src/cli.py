@@ -0,0 +1,477 @@
+"""
+MurkDown - headless command line interface
+
+Converts files, directories or glob patterns to Markdown without importing
+Streamlit. Per-format libraries are only loaded once a file needs them.
+"""
+import argparse
+import glob
+import itertools
+import json
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.utils.converters import MarkdownConverter, ConversionResult, SUPPORTED_FORMATS
+from src.utils.cache import ConversionCache
+from src.utils.ocr import ocr_available
+from src.utils.audio import RECOGNIZERS
+from src.utils.sync import DirectorySync, SyncReport
+from src.utils.archives import ArchiveError, ZipOutput, extract_zip, is_zip
+from src.utils.chunking import DEFAULT_MAX_TOKENS, DEFAULT_OVERLAP_TOKENS
+from src.utils.dedup import DEFAULT_THRESHOLD, DuplicateMatch, NearDuplicateIndex
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser for the murkdown command"""
+    parser = argparse.ArgumentParser(
+        prog="murkdown",
+        description="Convert documents to LLM-optimized Markdown",
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        help="Files, directories or glob patterns to convert",
+    )
+    parser.add_argument(
+        "-o", "--output-dir",
+        type=Path,
+        help="Directory for the .md files (defaults to next to each input; for ZIP members, <name>/ next to the ZIP)",
+    )
+    parser.add_argument(
+        "-r", "--recursive",
+        action="store_true",
+        help="Descend into subdirectories of directory inputs",
+    )
+    parser.add_argument(
+        "-w", "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1, converts inline)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help="Directory for a persistent conversion cache",
+    )
+    parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Convert .txt and .html with the lightweight built-in converters",
+    )
+    parser.add_argument(
+        "--ocr",
+        action="store_true",
+        help="Recognize text in images and in PDF pages without a text layer (needs Tesseract)",
+    )
+    parser.add_argument(
+        "--ocr-lang",
+        help="Tesseract language(s) for --ocr, e.g. eng+deu (default: eng)",
+    )
+    parser.add_argument(
+        "--transcribe",
+        choices=sorted(RECOGNIZERS),
+        help="Transcribe .mp3/.wav offline with this recognizer, in parallel segments",
+    )
+    parser.add_argument(
+        "--audio-language",
+        help="Language for --transcribe, e.g. en-US (default: the recognizer's)",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Strip redundant whitespace, table padding, repeated page headers/footers and boilerplate",
+    )
+    parser.add_argument(
+        "--max-rows",
+        type=int,
+        help="Spreadsheets: maximum data rows per sheet",
+    )
+    parser.add_argument(
+        "--max-cols",
+        type=int,
+        help="Spreadsheets: maximum columns per sheet",
+    )
+    parser.add_argument(
+        "--split-sheets",
+        action="store_true",
+        help="Spreadsheets: write one .md file per sheet into <name>-sheets/",
+    )
+    parser.add_argument(
+        "--chunks",
+        action="store_true",
+        help="Write heading-aware, token-budgeted chunks as <name>.jsonl instead of Markdown",
+    )
+    parser.add_argument(
+        "--max-tokens",
+        type=int,
+        default=DEFAULT_MAX_TOKENS,
+        help=f"Chunks: token budget per chunk (default: {DEFAULT_MAX_TOKENS})",
+    )
+    parser.add_argument(
+        "--overlap-tokens",
+        type=int,
+        default=DEFAULT_OVERLAP_TOKENS,
+        help=f"Chunks: tokens repeated between consecutive chunks (default: {DEFAULT_OVERLAP_TOKENS})",
+    )
+    parser.add_argument(
+        "--zip",
+        type=Path,
+        metavar="ARCHIVE",
+        help="Collect the .md files into this ZIP archive instead of writing them out",
+    )
+    parser.add_argument(
+        "--dedup",
+        choices=["flag", "skip"],
+        help="Detect near-duplicate documents in the batch and report them, or drop their outputs",
+    )
+    parser.add_argument(
+        "--dedup-threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help=f"Dedup: estimated Jaccard similarity of near-duplicates (default: {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--dedup-index",
+        type=Path,
+        metavar="FILE",
+        help="Dedup: load and save the index here (.npz), so later runs also match earlier batches",
+    )
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Mirror one directory incrementally: convert new or changed files, delete orphaned outputs",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Like --sync, then keep syncing as files change (uses watchdog if installed)",
+    )
+    parser.add_argument(
+        "-q", "--quiet",
+        action="store_true",
+        help="Only report failures",
+    )
+    return parser
+
+def is_supported(file_path: Path) -> bool:
+    """Check whether a path has a supported file extension"""
+    return file_path.suffix.lower()[1:] in SUPPORTED_FORMATS or is_zip(file_path)
+
+def expand_inputs(inputs: Sequence[str], recursive: bool = False) -> List[Path]:
+    """
+    Expand files, directories and glob patterns into a list of files
+
+    Explicitly named files are kept even if unsupported so that the
+    converter reports them; files found by expansion are filtered.
+
+    Args:
+        inputs: Paths or glob patterns from the command line
+        recursive: Whether to descend into subdirectories
+
+    Returns:
+        De-duplicated list of file paths in input order
+    """
+    files: List[Path] = []
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            pattern = "**/*" if recursive else "*"
+            files.extend(sorted(p for p in path.glob(pattern) if p.is_file() and is_supported(p)))
+        elif path.exists() or not any(c in item for c in "*?["):
+            files.append(path)
+        else:
+            matches = sorted(Path(p) for p in glob.glob(item, recursive=recursive))
+            files.extend(p for p in matches if p.is_file() and is_supported(p))
+    return list(dict.fromkeys(files))
+
+def expand_archives(
+    files: List[Path], extract_dir: Path
+) -> Tuple[List[Path], List[ConversionResult], Dict[Path, Path]]:
+    """
+    Replace ZIP inputs with the convertible files they contain
+
+    Args:
+        files: Input files
+        extract_dir: Directory to extract archives into
+
+    Returns:
+        Tuple of (files to convert, failed results for unusable archives,
+        default output directory of each extracted file); the default mirrors
+        the file's place in the archive below <archive stem>/ next to the archive,
+        since extract_dir does not outlive the run
+    """
+    expanded: List[Path] = []
+    failed: List[ConversionResult] = []
+    member_dirs: Dict[Path, Path] = {}
+    for index, file_path in enumerate(files):
+        if not is_zip(file_path):
+            expanded.append(file_path)
+            continue
+        archive_dir = extract_dir / f"{index}-{file_path.stem}"
+        try:
+            members = extract_zip(file_path, archive_dir)
+        except (ArchiveError, OSError) as e:
+            failed.append(ConversionResult(success=False, error=str(e), original_file=str(file_path)))
+            continue
+        for member in members:
+            member_dirs[member] = file_path.parent / file_path.stem / member.parent.relative_to(archive_dir)
+        expanded.extend(members)
+    return expanded, failed, member_dirs
+
+def group_by_output_dir(
+    files: List[Path], output_dir: Optional[Path], member_dirs: Dict[Path, Path]
+) -> List[Tuple[Optional[Path], List[Path]]]:
+    """
+    Batch files by the directory their outputs go to
+
+    Args:
+        files: Files to convert
+        output_dir: Directory for every output, or None for the defaults
+        member_dirs: Default output directories of extracted archive members
+
+    Returns:
+        List of (output directory, files) in input order
+    """
+    if output_dir is not None or not member_dirs:
+        return [(output_dir, files)] if files else []
+    groups: Dict[Optional[Path], List[Path]] = {}
+    for file_path in files:
+        groups.setdefault(member_dirs.get(file_path), []).append(file_path)
+    return list(groups.items())
+
+def add_to_archive(archive: ZipOutput, result: ConversionResult) -> None:
+    """Move the output of a successful conversion into the archive"""
+    if result.output_files:
+        # Per-sheet output: keep the sheets together in their directory
+        sheet_dir = Path(result.output_file).name
+        for sheet_file in map(Path, result.output_files):
+            archive.add_file(sheet_file, f"{sheet_dir}/{sheet_file.name}")
+            sheet_file.unlink()
+    else:
+        archive.add_file(result.output_file)
+        Path(result.output_file).unlink()
+
+def converted_text(result: ConversionResult) -> Optional[str]:
+    """Markdown of a successful conversion, or None for per-sheet output"""
+    if result.content is not None:
+        return result.content
+    output_file = Path(result.output_file)
+    if not output_file.is_file():
+        return None
+    if output_file.suffix == ".jsonl":
+        with open(output_file, encoding="utf-8") as f:
+            return "\n\n".join(json.loads(line)["text"] for line in f if line.strip())
+    return output_file.read_text(encoding="utf-8")
+
+def check_duplicate(index: NearDuplicateIndex, result: ConversionResult, skip: bool) -> Optional[DuplicateMatch]:
+    """Look a converted file up in the dedup index, indexing it unless it is dropped"""
+    if not result.success:
+        return None
+    text = converted_text(result)
+    if text is None:
+        return None
+    return index.check(result.original_file, text, index_duplicates=not skip)
+
+def report_duplicate(match: DuplicateMatch, skipped: bool, quiet: bool = False) -> None:
+    """Print a near-duplicate to stderr"""
+    if quiet:
+        return
+    if skipped:
+        print(f"skip   {match.key}: near-duplicate of {match.duplicate_of} ({match.similarity:.0%})", file=sys.stderr)
+    else:
+        print(f"dup    {match.key} ~ {match.duplicate_of} ({match.similarity:.0%})", file=sys.stderr)
+
+def report(result: ConversionResult, quiet: bool = False) -> None:
+    """Print the outcome of a single conversion to stderr"""
+    if result.success:
+        if not quiet:
+            print(f"ok     {result.original_file} -> {result.output_file}", file=sys.stderr)
+            for sheet_file in result.output_files:
+                print(f"         {sheet_file}", file=sys.stderr)
+            if result.compaction is not None and result.compaction.input_bytes:
+                print(
+                    f"         compaction saved {result.compaction.bytes_saved} bytes "
+                    f"({1 - result.compaction.ratio:.0%}), ~{result.compaction.tokens_saved} tokens",
+                    file=sys.stderr,
+                )
+    else:
+        print(f"error  {result.original_file}: {result.error}", file=sys.stderr)
+
+def report_sync(sync_report: SyncReport, quiet: bool = False) -> None:
+    """Print the outcome of a sync pass to stderr"""
+    if not quiet:
+        for relative in sync_report.converted:
+            print(f"ok     {relative}", file=sys.stderr)
+        for relative in sync_report.removed:
+            print(f"gone   {relative}", file=sys.stderr)
+    for result in sync_report.failed:
+        report(result, quiet)
+    if not quiet:
+        print(
+            f"synced {len(sync_report.converted)} converted, {sync_report.unchanged} unchanged, "
+            f"{len(sync_report.removed)} removed, {len(sync_report.failed)} failed "
+            f"in {sync_report.elapsed:.1f}s",
+            file=sys.stderr,
+        )
+
+def run_sync(args: argparse.Namespace, converter: MarkdownConverter, options: dict) -> int:
+    """Run --sync / --watch for a single source directory"""
+    if len(args.inputs) != 1 or not Path(args.inputs[0]).is_dir():
+        print("murkdown: --sync and --watch take exactly one directory", file=sys.stderr)
+        return 2
+    sync = DirectorySync(
+        args.inputs[0],
+        output_dir=args.output_dir,
+        converter=converter,
+        recursive=args.recursive,
+        workers=args.workers,
+        **options
+    )
+    if args.watch:
+        try:
+            sync.watch(on_report=lambda sync_report: report_sync(sync_report, args.quiet))
+        except KeyboardInterrupt:
+            pass
+        return 0
+    sync_report = sync.sync()
+    report_sync(sync_report, args.quiet)
+    return 1 if sync_report.failed else 0
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Run the murkdown command
+
+    Args:
+        argv: Command line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        Process exit code
+    """
+    args = build_parser().parse_args(argv)
+    sync_mode = args.sync or args.watch
+
+    files = [] if sync_mode else expand_inputs(args.inputs, args.recursive)
+    if not files and not sync_mode:
+        print("murkdown: no matching input files", file=sys.stderr)
+        return 2
+
+    if args.chunks and not 0 <= args.overlap_tokens < args.max_tokens:
+        print("murkdown: --overlap-tokens must be smaller than --max-tokens", file=sys.stderr)
+        return 2
+
+    if args.dedup and sync_mode:
+        print("murkdown: --dedup does not apply to --sync or --watch", file=sys.stderr)
+        return 2
+    if args.dedup and not 0 < args.dedup_threshold <= 1:
+        print("murkdown: --dedup-threshold must be in (0, 1]", file=sys.stderr)
+        return 2
+    dedup_index = None
+    if args.dedup:
+        try:
+            if args.dedup_index is not None and args.dedup_index.exists():
+                dedup_index = NearDuplicateIndex.load(args.dedup_index, threshold=args.dedup_threshold)
+            else:
+                dedup_index = NearDuplicateIndex(threshold=args.dedup_threshold)
+        except ImportError:
+            print("murkdown: --dedup needs numpy", file=sys.stderr)
+            return 2
+
+    if args.ocr and not ocr_available():
+        print("murkdown: --ocr needs pytesseract, Pillow, numpy and the tesseract binary", file=sys.stderr)
+        return 2
+
+    cache = ConversionCache(cache_dir=args.cache_dir) if args.cache_dir else None
+    converter = MarkdownConverter(
+        cache=cache, fast_paths=args.fast, ocr=args.ocr, audio_backend=args.transcribe, compact=args.compact
+    )
+
+    # Only set options are passed so they do not change unrelated cache keys
+    options = {
+        name: value
+        for name, value in (
+            ("max_rows", args.max_rows),
+            ("max_cols", args.max_cols),
+            ("ocr_lang", args.ocr_lang),
+            ("audio_language", args.audio_language),
+        )
+        if value is not None
+    }
+    if sync_mode:
+        return run_sync(args, converter, options)
+
+    with tempfile.TemporaryDirectory(prefix="murkdown-") as work_dir:
+        work_dir = Path(work_dir)
+        files, archive_errors, member_dirs = expand_archives(files, work_dir / "inputs")
+        # With --zip, each output only passes through disk on its way into the archive
+        output_dir = work_dir / "outputs" if args.zip else args.output_dir
+        archive = ZipOutput(args.zip) if args.zip else None
+
+        sheet_files = []
+        if args.split_sheets:
+            sheet_files = [f for f in files if f.suffix.lower() == ".xlsx"]
+            files = [f for f in files if f.suffix.lower() != ".xlsx"]
+
+        def convert_batch(batch_dir: Optional[Path], batch: List[Path]) -> Iterator[ConversionResult]:
+            if args.chunks:
+                return (
+                    converter.convert_file_chunks(
+                        f,
+                        output_dir=batch_dir,
+                        max_tokens=args.max_tokens,
+                        overlap_tokens=args.overlap_tokens,
+                        **options
+                    )
+                    for f in batch
+                )
+            if args.workers > 1 and len(batch) > 1:
+                return converter.convert_many(batch, workers=args.workers, output_dir=batch_dir, **options)
+            return (converter.convert_file_streaming(f, output_dir=batch_dir, **options) for f in batch)
+
+        results = itertools.chain.from_iterable(
+            convert_batch(batch_dir, batch) for batch_dir, batch in group_by_output_dir(files, output_dir, member_dirs)
+        )
+        sheet_results = (
+            converter.convert_sheets(f, output_dir=output_dir or member_dirs.get(f), **options) for f in sheet_files
+        )
+        total = len(files) + len(sheet_files) + len(archive_errors)
+        results = itertools.chain(archive_errors, results, sheet_results)
+
+        failures = 0
+        duplicates = 0
+        try:
+            for result in results:
+                match = None
+                if dedup_index is not None:
+                    match = check_duplicate(dedup_index, result, skip=args.dedup == "skip")
+                if match is not None and args.dedup == "skip":
+                    report_duplicate(match, skipped=True, quiet=args.quiet)
+                    Path(result.output_file).unlink()
+                    duplicates += 1
+                    continue
+                report(result, args.quiet)
+                if match is not None:
+                    report_duplicate(match, skipped=False, quiet=args.quiet)
+                failures += not result.success
+                if archive is not None and result.success:
+                    add_to_archive(archive, result)
+        except BaseException:
+            if archive is not None:
+                archive.discard()
+            raise
+        if archive is not None:
+            archive.close()
+            if not args.quiet:
+                print(f"wrote  {archive.path} ({archive.count} files)", file=sys.stderr)
+
+    if dedup_index is not None and args.dedup_index is not None:
+        dedup_index.save(args.dedup_index)
+    if not args.quiet:
+        summary = f"converted {total - failures - duplicates}/{total} files"
+        if duplicates:
+            summary += f", skipped {duplicates} near-duplicate{'s' if duplicates != 1 else ''}"
+        print(summary, file=sys.stderr)
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
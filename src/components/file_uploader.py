@@ -3,46 +3,92 @@ File uploader component for Streamlit interface
 """
 import streamlit as st
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import List, Tuple
 from src.utils.converters import MarkdownConverter, SUPPORTED_FORMATS
 from src.utils.file_handlers import save_uploaded_file, get_file_size
+from src.utils.spool import SpoolManager, SpoolFullError
+from src.utils.archives import ArchiveError, extract_zip, is_zip, zip_extracted_size
 
-def file_uploader_component(temp_dir: Path) -> Tuple[bool, Optional[Path]]:
+def file_uploader_component(spool: SpoolManager, session_id: str) -> Tuple[List[Path], bool]:
     """
     Display file uploader component
     
+    Several files, or ZIP archives (extracted on the server), can be
+    dropped at once; they are converted as a batch.
+    
     Args:
-        temp_dir: Directory for temporary files
+        spool: Spool the uploads are saved into
+        session_id: Spool session of the current browser session
         
     Returns:
-        Tuple of (file_uploaded, file_path)
+        Tuple of (spooled file paths, is_batch); the list is empty until
+        every upload has been saved
     """
-    # Initialize session state for tracking last uploaded file
+    # Initialize session state for tracking last uploaded files
     if 'last_uploaded_file' not in st.session_state:
         st.session_state.last_uploaded_file = None
     
     # File uploader with custom styling
-    uploaded_file = st.file_uploader(
-        "🐱 Drop your file here for MurDowd to process",
-        type=list(SUPPORTED_FORMATS.keys()),
-        help="MurDowd can handle various file types and convert them to Markdown",
+    uploaded_files = st.file_uploader(
+        "🐱 Drop your files here for MurDowd to process",
+        type=list(SUPPORTED_FORMATS.keys()) + ['zip'],
+        accept_multiple_files=True,
+        help="MurDowd can handle various file types and convert them to Markdown; "
+             "drop several files or a ZIP to get a ZIP of Markdown back",
         key="file_uploader",
         label_visibility="collapsed"
     )
     
-    if uploaded_file is not None:
-        # Check if this is a new file
-        if st.session_state.last_uploaded_file != uploaded_file.name:
-            st.session_state.last_uploaded_file = uploaded_file.name
-            # Reset conversion states for new file
-            st.session_state.conversion_result = None
-            st.session_state.is_converting = False
-            
-        # Save file
-        temp_file = save_uploaded_file(uploaded_file, temp_dir)
-        if temp_file:
-            return True, temp_file
-        else:
-            st.error("😿 MurDowd couldn't save the file")
-    
-    return False, None
+    if not uploaded_files:
+        return [], False
+    
+    # Identify the uploads themselves, not just their names
+    upload_id = tuple(
+        getattr(uploaded_file, "file_id", None) or f"{uploaded_file.name}:{uploaded_file.size}"
+        for uploaded_file in uploaded_files
+    )
+    is_batch = len(uploaded_files) > 1 or is_zip(uploaded_files[0].name)
+    
+    # Check if this is a new selection
+    if st.session_state.last_uploaded_file != upload_id:
+        st.session_state.last_uploaded_file = upload_id
+        st.session_state.spooled_upload = None
+        # Reset conversion states for new files
+        st.session_state.conversion_result = None
+        st.session_state.conversion_job_id = None
+        st.session_state.batch = None
+    
+    # Reuse the spooled copies across reruns instead of hashing the uploads again
+    spooled = st.session_state.get('spooled_upload')
+    if spooled is not None and all(path.exists() for path in spooled):
+        return spooled, is_batch
+    
+    # Save files, extracting archives next to where they were spooled
+    temp_files: List[Path] = []
+    try:
+        for uploaded_file in uploaded_files:
+            with spool.reserving(session_id, uploaded_file.size) as upload_dir:
+                temp_file = save_uploaded_file(uploaded_file, upload_dir)
+                if not temp_file:
+                    # Raising releases the reservation
+                    raise OSError(uploaded_file.name)
+            if is_zip(temp_file):
+                with spool.reserving(session_id, zip_extracted_size(temp_file)) as upload_dir:
+                    temp_files.extend(extract_zip(temp_file, upload_dir / f"{temp_file.parent.name}-files"))
+            else:
+                temp_files.append(temp_file)
+    except SpoolFullError as e:
+        st.error(f"😿 MurDowd has no room for these files right now: {e}")
+        return [], is_batch
+    except ArchiveError as e:
+        st.error(f"😿 MurDowd couldn't open the archive: {e}")
+        return [], is_batch
+    except OSError as e:
+        st.error(f"😿 MurDowd couldn't save {e}")
+        return [], is_batch
+    
+    if not temp_files:
+        st.error("😿 MurDowd found nothing to convert in the archive")
+        return [], is_batch
+    st.session_state.spooled_upload = temp_files
+    return temp_files, is_batch
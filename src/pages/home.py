@@ -3,22 +3,26 @@ MurDown - Your Markdown Cat Assistant
 """
 import streamlit as st
 from pathlib import Path
-import tempfile
 import base64
+import dataclasses
+import html
+import shutil
+import time
+import uuid
+from typing import List
 
-from src.utils.converters import MarkdownConverter
-from src.utils.file_handlers import cleanup_temp_files, ensure_directories
+from src.utils.pool import get_shared_pool
+from src.utils.jobs import JobManager, Job, JobStatus
+from src.utils.preview import MarkdownPreview, open_preview
+from src.utils.file_handlers import ensure_directories, spooled_hash
+from src.utils.history import HistoryStore, get_shared_history
+from src.utils.spool import get_shared_spool
+from src.utils.archives import ZipOutput, fit_for_download
+from src.utils.dedup import NearDuplicateIndex
 from src.components.file_uploader import file_uploader_component
 
-# Configure Streamlit page
-st.set_page_config(
-    page_title="MurkDown",
-    page_icon="🐱",
-    layout="centered"
-)
-
 # Custom CSS
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     @import url('https://fonts.googleapis.com/css2?family=Space+Grotesk:wght@400;500;600;700&display=swap');
 
@@ -227,53 +231,308 @@ st.markdown("""
         padding: 1rem;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+CAT_IMAGE_PATH = 'static/images/cat.png'
+JOB_POLL_INTERVAL = 0.5  # seconds between job status checks
+MAX_OUTLINE_ENTRIES = 500
+HISTORY_PAGE_SIZE = 10
+PARTIAL_PREVIEW_BYTES = 4 * 1024
+DOWNLOAD_MEMORY_LIMIT = 32 * 1024 * 1024  # Streamlit holds each download button's data in memory
 
-# Инициализация состояния сессии
-if 'converted_files' not in st.session_state:
-    st.session_state['converted_files'] = []
-if 'current_file' not in st.session_state:
-    st.session_state['current_file'] = None
+@st.cache_resource
+def get_job_manager() -> JobManager:
+    """Get the background job manager shared by every session"""
+    pool = get_shared_pool()
+    return JobManager(
+        pool=pool,
+        max_workers=pool.size,
+        keep_content=False,
+        spool=get_shared_spool(),
+        history=get_shared_history(),
+    )
 
 def initialize_session_state():
     """Initialize session state variables"""
-    if 'converter' not in st.session_state:
-        st.session_state.converter = MarkdownConverter()
-    if 'temp_dir' not in st.session_state:
-        st.session_state.temp_dir = Path(tempfile.mkdtemp())
-    if 'conversion_history' not in st.session_state:
-        st.session_state.conversion_history = []
+    if 'current_file' not in st.session_state:
+        st.session_state['current_file'] = None
+    if 'spool_session' not in st.session_state:
+        st.session_state.spool_session = uuid.uuid4().hex
+    # Every run renews the session's spool lease; abandoned sessions are reaped on a TTL
+    st.session_state.output_dir = get_shared_spool().output_dir(st.session_state.spool_session)
+
+def show_conversion_history(history: HistoryStore):
+    """Display this session's conversions, one page at a time from the history store"""
+    session_id = st.session_state.spool_session
+    total = history.count(session_id)
+    if not total:
+        return
+    pages = -(-total // HISTORY_PAGE_SIZE)
+    with st.expander(f"🐱 Recent Adventures ({total})"):
+        page = 1
+        if pages > 1:
+            page = st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key="history_page")
+        for entry in history.page(session_id, page=page - 1, page_size=HISTORY_PAGE_SIZE):
+            when = time.strftime("%H:%M", time.localtime(entry.created_at))
+            if entry.success:
+                details = f"{(entry.output_bytes or 0) / 1024:.1f} KB"
+                if entry.seconds is not None:
+                    details += f" in {entry.seconds:.1f}s"
+                if entry.cached:
+                    details += ", reused"
+                st.markdown(f"- {when} 📄 {entry.file_name} → {Path(entry.output_file).name} ({details})")
+            else:
+                st.markdown(f"- {when} 😿 {entry.file_name}: {entry.error}")
+
+def find_previous_conversion(temp_file: Path):
+    """
+    Result of an earlier conversion of exactly this file, if its output is still on disk
+    
+    The history database is shared with other processes, so only outputs
+    inside this app's spool are reused; they are copied into this session's
+    output directory, to live and expire with the session. The reuse is
+    recorded in the history as a cached conversion of this session.
+    """
+    history = get_shared_history()
+    content_hash = spooled_hash(temp_file)
+    entry = history.find(content_hash)
+    if entry is None or not entry.output_available or not get_shared_spool().owns(entry.output_file):
+        return None
+    output_file = st.session_state.output_dir / temp_file.with_suffix('.md').name
+    if Path(entry.output_file).resolve() != output_file.resolve():
+        try:
+            shutil.copyfile(entry.output_file, output_file)
+        except OSError:
+            return None
+    result = dataclasses.replace(
+        entry.to_result(),
+        original_file=str(temp_file),
+        output_file=str(output_file),
+        cached=True,
+    )
+    history.record(result, session_id=st.session_state.spool_session, content_hash=content_hash)
+    return result
+
+def show_job_status(job: Job, job_manager: JobManager):
+    """Display the status of a background conversion job"""
+    if job.status == JobStatus.QUEUED:
+        ahead = job_manager.queue_position(job.job_id)
+        st.info(
+            f"⏳ Waiting for a free cat... {ahead} file(s) ahead of yours, {job.queue_wait:.0f}s so far",
+            icon="ℹ️",
+        )
+    else:
+        st.info(f"🔄 Converting your file... {job.run_time:.0f}s so far", icon="ℹ️")
+    if job.progress is not None:
+        st.progress(job.progress)
+    if job.pieces_done and job.output_file:
+        # Streaming formats flush each page as it is converted
+        with st.expander(f"Partial output ({job.pieces_done} page(s) so far)"):
+            with open(job.output_file, 'rb') as f:
+                head = f.read(PARTIAL_PREVIEW_BYTES + 1)
+            text = head[:PARTIAL_PREVIEW_BYTES].decode('utf-8', errors='replace')
+            st.text(text + ("\n…" if len(head) > PARTIAL_PREVIEW_BYTES else ""))
+
+def _jump_to_heading(preview: MarkdownPreview):
+    """Move the preview to the page of the selected outline heading"""
+    index = st.session_state.preview_heading
+    if index is not None:
+        st.session_state.preview_page = preview.page_of_line(preview.outline[index].line) + 1
+
+def show_preview(output_file: Path):
+    """Display one page of a converted file, read from disk on demand"""
+    preview = open_preview(output_file)
+    if st.session_state.get('preview_file') != str(output_file):
+        st.session_state.preview_file = str(output_file)
+        st.session_state.preview_page = 1
+        st.session_state.preview_heading = None
+    
+    if preview.outline:
+        outline = preview.outline[:MAX_OUTLINE_ENTRIES]
+        st.selectbox(
+            "🧭 Jump to section",
+            range(len(outline)),
+            format_func=lambda i: " " * (outline[i].level - 1) + outline[i].title,
+            index=None,
+            placeholder="Choose a heading",
+            key="preview_heading",
+            on_change=_jump_to_heading,
+            args=(preview,),
+        )
+    if preview.page_count > 1:
+        st.number_input(
+            f"📖 Page (of {preview.page_count})",
+            min_value=1,
+            max_value=preview.page_count,
+            step=1,
+            key="preview_page",
+        )
+    
+    page = min(st.session_state.get('preview_page', 1), preview.page_count) - 1
+    window, truncated = preview.read_page(page)
+    first_line = page * preview.lines_per_page + 1
+    last_line = min(first_line + preview.lines_per_page - 1, preview.line_count)
+    st.markdown(
+        f"""
+        <div class="info-card">
+            <h3>📄 Converted Content</h3>
+            <div class="content-container">
+                <pre><code style="display: inline-block; min-width: max-content;">{html.escape(window, quote=False)}</code></pre>
+            </div>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+    caption = f"Lines {first_line}–{last_line} of {preview.line_count} · {preview.size / 1024:.1f} KB total"
+    if truncated:
+        caption += " · page cut short, download the file for the rest"
+    st.caption(caption)
+
+def new_dedup_index():
+    """Near-duplicate index for a batch, or None without numpy"""
+    try:
+        return NearDuplicateIndex()
+    except ImportError:
+        return None
 
-def show_conversion_history():
-    """Display conversion history"""
-    if st.session_state.conversion_history:
-        st.markdown(
-            """
-            <div class="info-card">
-                <h3>🐱 Recent Adventures</h3>
-            """,
-            unsafe_allow_html=True
+def run_batch(temp_files: List[Path]):
+    """
+    Convert several files as background jobs, adding each to a ZIP as it finishes
+    
+    Near-duplicates of files already in the archive are left out and listed
+    in duplicates.txt instead.
+    """
+    job_manager = get_job_manager()
+    batch = st.session_state.get('batch')
+    if batch is None:
+        batch_dir = st.session_state.output_dir / f"batch-{uuid.uuid4().hex[:8]}"
+        batch = {
+            # One output directory per file, so equal names never collide
+            'jobs': [
+                job_manager.submit(
+                    path,
+                    stream=True,
+                    client_id=st.session_state.spool_session,
+                    output_dir=batch_dir / str(index),
+                ).job_id
+                for index, path in enumerate(temp_files)
+            ],
+            'archive': ZipOutput(batch_dir / "murkdown.zip"),
+            'finished': set(),
+            'errors': [],
+            'dedup': new_dedup_index(),
+            'duplicates': [],
+        }
+        st.session_state.batch = batch
+    
+    archive = batch['archive']
+    if archive.closed and not archive.path.exists():
+        # The spool reaped the session's outputs after its TTL
+        st.session_state.batch = None
+        st.warning("⌛ This ZIP has expired and was removed; MurDowd will convert the files again on the next run.")
+        return
+    for job_id in batch['jobs']:
+        if job_id in batch['finished']:
+            continue
+        job = job_manager.get(job_id)
+        if job is None:
+            batch['errors'].append(("(unknown file)", "Job expired before it was collected"))
+        elif not job.done:
+            continue
+        elif job.result.success:
+            output_file = Path(job.result.output_file)
+            match = None
+            if batch['dedup'] is not None:
+                name = Path(job.file_path).name
+                match = batch['dedup'].check(name, output_file.read_text(encoding='utf-8'), index_duplicates=False)
+            if match is not None:
+                batch['duplicates'].append(match)
+            else:
+                # Copy into the archive on disk and drop the loose file
+                archive.add_file(output_file)
+            output_file.unlink()
+        else:
+            batch['errors'].append((Path(job.file_path).name, job.result.error))
+        batch['finished'].add(job_id)
+    
+    total = len(batch['jobs'])
+    done = len(batch['finished'])
+    cols = st.columns([1, 2, 1])
+    with cols[1]:
+        if done < total:
+            st.info(f"🔄 Converting your files... {done} of {total} done", icon="ℹ️")
+            st.progress(done / total)
+            time.sleep(JOB_POLL_INTERVAL)
+            st.rerun()
+        
+        if not archive.closed:
+            if batch['errors']:
+                archive.add_text(
+                    "errors.txt",
+                    "".join(f"{name}: {error}\n" for name, error in batch['errors'])
+                )
+            if batch['duplicates']:
+                archive.add_text(
+                    "duplicates.txt",
+                    "".join(
+                        f"{match.key}: near-duplicate of {match.duplicate_of} ({match.similarity:.0%} similar)\n"
+                        for match in batch['duplicates']
+                    )
+                )
+            archive.close()
+        
+        converted = total - len(batch['errors']) - len(batch['duplicates'])
+        if converted:
+            st.success(f"😺 Purrfect! {converted} of {total} files converted!")
+            download_output(archive.path, "🐾 Download ZIP", "application/zip")
+        for match in batch['duplicates']:
+            st.info(f"🐈 Skipped {match.key}: {match.similarity:.0%} the same as {match.duplicate_of}")
+        for name, error in batch['errors']:
+            st.error(f"😿 {name}: {error}")
+
+def download_output(output_file: Path, label: str, mime: str):
+    """Offer a converted file for download, zipped or declined when too large to hold in memory"""
+    download_file = fit_for_download(output_file, DOWNLOAD_MEMORY_LIMIT)
+    if download_file is None:
+        st.warning(
+            f"🐘 {output_file.name} is too large to download from the browser "
+            f"(over {DOWNLOAD_MEMORY_LIMIT // (1024 * 1024)} MB even zipped); convert it with "
+            "the murkdown CLI or the HTTP service, which stream the result from disk."
+        )
+        return
+    if download_file != output_file:
+        label, mime = f"{label} (zipped)", "application/zip"
+    with open(download_file, 'rb') as f:
+        st.download_button(
+            label=label,
+            data=f,
+            file_name=download_file.name,
+            mime=mime,
+            use_container_width=True,
         )
-        for item in reversed(st.session_state.conversion_history):
-            st.markdown(f"- 📄 {Path(item['input']).name} → {Path(item['output']).name}")
-        st.markdown("</div>", unsafe_allow_html=True)
 
+@st.cache_data
 def get_base64_of_bin_file(file_path: str) -> str:
     with open(file_path, 'rb') as f:
         data = f.read()
     return base64.b64encode(data).decode()
 
-# Get cat image as base64
-cat_image = get_base64_of_bin_file('static/images/cat.png')
-
 def main():
     """Main application function"""
+    # Configure Streamlit page
+    st.set_page_config(
+        page_title="MurkDown",
+        page_icon="🐱",
+        layout="centered"
+    )
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+    
     # Initialize session state
     initialize_session_state()
     
     # Add conversion state if not exists
-    if 'is_converting' not in st.session_state:
-        st.session_state.is_converting = False
+    if 'conversion_job_id' not in st.session_state:
+        st.session_state.conversion_job_id = None
     if 'conversion_result' not in st.session_state:
         st.session_state.conversion_result = None
         
@@ -290,6 +549,7 @@ def main():
     )
     
     # Cat image with base64
+    cat_image = get_base64_of_bin_file(CAT_IMAGE_PATH)
     st.markdown(
         f"""
         <div style='text-align: center; margin: 2rem 0;'>
@@ -305,61 +565,67 @@ def main():
     with col2:
         # Добавляем якорь перед загрузчиком
         st.markdown('<div id="upload-section"></div>', unsafe_allow_html=True)
-        file_uploaded, temp_file = file_uploader_component(st.session_state.temp_dir)
+        temp_files, is_batch = file_uploader_component(get_shared_spool(), st.session_state.spool_session)
+    
+    # Several files (or an archive) come back as one ZIP
+    if temp_files and is_batch:
+        run_batch(temp_files)
+        return
     
     # Process file if uploaded
-    if file_uploaded and temp_file and not st.session_state.conversion_result:
-        if not st.session_state.is_converting:
-            st.session_state.is_converting = True
-            # Добавляем якорь в URL при перезагрузке
-            st.rerun()
+    temp_file = temp_files[0] if temp_files else None
+    if temp_file and not st.session_state.conversion_result:
+        job_manager = get_job_manager()
+        job = None
+        if st.session_state.conversion_job_id:
+            job = job_manager.get(st.session_state.conversion_job_id)
+        if job is None or job.file_path != str(temp_file):
+            previous = find_previous_conversion(temp_file)
+            if previous is not None:
+                st.session_state.conversion_result = previous
+                st.rerun()
+            job = job_manager.submit(
+                temp_file,
+                stream=True,
+                client_id=st.session_state.spool_session,
+                content_hash=spooled_hash(temp_file),
+                output_dir=st.session_state.output_dir,
+            )
+            st.session_state.conversion_job_id = job.job_id
         
         # Container for conversion process
         cols = st.columns([1, 2, 1])
         with cols[1]:
-            if st.session_state.is_converting:
-                st.info("🔄 Converting your file... Please wait...", icon="ℹ️")
-                try:
-                    result = st.session_state.converter.convert_file(temp_file)
-                    st.session_state.conversion_result = result
-                finally:
-                    st.session_state.is_converting = False
-                    st.rerun()
+            if not job.done:
+                # Poll without holding a converter: the job runs on a shared worker
+                show_job_status(job, job_manager)
+                time.sleep(JOB_POLL_INTERVAL)
+                st.rerun()
+            # Keep only metadata in session state; the markdown stays on disk
+            st.session_state.conversion_result = dataclasses.replace(job.result, content=None)
+            st.session_state.conversion_job_id = None
     
     # Show results if we have them
-    if st.session_state.conversion_result and not st.session_state.is_converting:
+    if st.session_state.conversion_result:
         result = st.session_state.conversion_result
         cols = st.columns([1, 2, 1])
         with cols[1]:
-            if result.success:
+            output_file = Path(result.output_file) if result.success else None
+            if output_file is not None and not output_file.exists():
+                # The spool reaped the session's outputs after its TTL
+                st.session_state.conversion_result = None
+                st.warning("⌛ This result has expired and was removed; MurDowd will convert the file again on the next run.")
+            elif result.success:
                 st.success("😺 Purrfect! Your file has been converted!")
                 
-                st.download_button(
-                    label="🐾 Download Markdown",
-                    data=result.content,
-                    file_name=Path(result.output_file).name,
-                    mime="text/markdown",
-                    use_container_width=True,
-                )
+                download_output(output_file, "🐾 Download Markdown", "text/markdown")
                 
-                # Show full content in a card
-                content = result.content.replace('<', '&lt;').replace('>', '&gt;')
-                st.markdown(
-                    f"""
-                    <div class="info-card">
-                        <h3>📄 Converted Content</h3>
-                        <div class="content-container">
-                            <pre><code style="display: inline-block; min-width: max-content;">{content}</code></pre>
-                        </div>
-                    </div>
-                    """,
-                    unsafe_allow_html=True
-                )
+                # Show one page of the content in a card
+                show_preview(output_file)
             else:
                 st.error(f"😿 Oops! Something went wrong: {result.error}")
     
-    # Cleanup temporary files when session ends
-    cleanup_temp_files(st.session_state.temp_dir)
+    show_conversion_history(get_shared_history())
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -2,8 +2,11 @@
 MarkItDown Web - Settings page
 """
 import streamlit as st
-from pathlib import Path
 from src.utils.converters import MarkdownConverter
+from src.utils.pool import get_shared_pool
+from src.utils.metrics import REGISTRY
+from src.utils.spool import OUTPUTS_DIR, get_shared_spool
+from src.utils.history import get_shared_history
 
 # Configure page
 st.set_page_config(
@@ -16,12 +19,9 @@ def main():
     """Settings page main function"""
     st.title("Settings")
     
-    # Initialize converter for format info
-    converter = MarkdownConverter()
-    
     # Display supported formats
     st.markdown("## Supported File Formats")
-    formats = converter.get_supported_formats()
+    formats = MarkdownConverter.get_supported_formats()
     
     # Group formats by type
     format_groups = {
@@ -45,20 +45,84 @@ def main():
     # System information
     st.markdown("## System Information")
     
+    # Display shared converter pool usage
+    st.markdown("### Converter Pool")
+    pool_stats = get_shared_pool().stats
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("In use", f"{pool_stats.in_use}/{pool_stats.size}")
+    col2.metric("Saturation", f"{pool_stats.saturation:.0%}")
+    col3.metric("Waiting", pool_stats.waiting)
+    col4.metric("Avg wait", f"{pool_stats.average_wait * 1000:.0f} ms")
+    st.caption(
+        f"Peak in use: {pool_stats.peak_in_use} · "
+        f"Checkouts: {pool_stats.checkouts} · "
+        f"Timeouts: {pool_stats.timeouts} · "
+        f"Worker restarts: {pool_stats.worker_restarts}"
+    )
+    
+    # Display upload spool usage
+    st.markdown("### Upload Spool")
+    spool = get_shared_spool()
+    spool_stats = spool.stats
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Sessions", spool_stats.sessions)
+    col2.metric("Files", spool_stats.files)
+    quota = f" / {spool_stats.quota_bytes / 1024 / 1024:.0f} MB" if spool_stats.quota_bytes else ""
+    col3.metric("Disk", f"{spool_stats.disk_bytes / 1024 / 1024:.1f} MB{quota}")
+    col4.metric("RAM", f"{spool_stats.ram_bytes / 1024 / 1024:.1f} MB")
+    st.caption(
+        f"Held by jobs: {spool_stats.held_files} · "
+        f"Sessions reaped: {spool_stats.reaped_sessions} · "
+        f"Uploads evicted: {spool_stats.evicted_files} · "
+        f"TTL: {spool.ttl / 60:.0f} min"
+    )
+    
+    # Display the persistent conversion history
+    st.markdown("### Conversion History")
+    history = get_shared_history()
+    col1, col2 = st.columns(2)
+    col1.metric("Recorded conversions", history.count())
+    col2.metric("Retention", f"{history.max_entries:,} entries" if history.max_entries else "Unlimited")
+    st.caption(f"Database: {history.db_path}")
+    
+    # Display per-format conversion metrics
+    st.markdown("### Conversion Metrics")
+    summary = REGISTRY.format_summary()
+    if summary:
+        st.dataframe(
+            [
+                {
+                    "Format": fmt,
+                    "Conversions": int(row.get("conversions", 0)),
+                    "Errors": int(row.get("errors", 0)),
+                    "Cache hits": int(row.get("cached", 0)),
+                    "Input (MB)": round(row.get("input_mb", 0.0), 2),
+                    "Mean (s)": round(row.get("mean_s", 0.0), 3),
+                    "p95 (s) ≤": row.get("p95_s", 0.0),
+                }
+                for fmt, row in sorted(summary.items())
+            ],
+            use_container_width=True,
+        )
+    else:
+        st.markdown("*No conversions yet*")
+    with st.expander("Prometheus export"):
+        st.code(REGISTRY.export_prometheus(), language="text")
+    
     # Display paths
     st.markdown("### Paths")
     col1, col2 = st.columns(2)
     
     with col1:
-        st.markdown("**Temporary Files**")
-        if 'temp_dir' in st.session_state:
-            st.code(str(st.session_state.temp_dir))
-        else:
-            st.markdown("*Not initialized*")
+        st.markdown("**Upload Spool**")
+        st.code(str(spool.root))
+        if spool.ram_root is not None:
+            st.code(str(spool.ram_root))
     
     with col2:
         st.markdown("**Output Directory**")
-        st.code(str(Path.cwd() / "data" / "outputs"))
+        st.code(str(spool.root / "<session>" / OUTPUTS_DIR))
+        st.caption("One per browser session; removed with the session's uploads after the TTL")
     
     # Version information
     st.markdown("## Version Information")
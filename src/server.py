@@ -0,0 +1,397 @@
+"""
+MurkDown - HTTP conversion service
+
+A small standalone HTTP API around MarkdownConverter:
+
+    POST /convert?filename=report.pdf   convert and return text/markdown
+    POST /jobs?filename=report.pdf      queue a conversion, returns 202 + job id
+    GET  /jobs/<id>                     job status as JSON
+    GET  /jobs/<id>/result              converted markdown once the job is done
+    GET  /health                        queue and pool metrics
+    GET  /metrics                       conversion metrics (Prometheus text format)
+
+Request bodies are streamed to a spool directory in chunks, conversions run
+on a bounded worker pool, and requests beyond the queue-depth limit are
+rejected with 429 instead of waiting without bound. Each job's input and
+output live in their own spool session, deleted once the result has been
+downloaded or the job is forgotten; the spool's quota bounds what is kept
+on disk meanwhile, and uploads that do not fit are rejected with 507.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import uuid
+from dataclasses import asdict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple, Union
+from urllib.parse import urlsplit, parse_qs
+
+from src.utils.converters import MAX_FILE_SIZE, SUPPORTED_FORMATS
+from src.utils.file_handlers import spool_stream, spooled_hash, HASH_CHUNK_SIZE
+from src.utils.jobs import DEFAULT_JOB_RETENTION, JobManager, Job, JobStatus, QueueFullError
+from src.utils.history import HistoryStore, get_shared_history
+from src.utils.pool import ConverterPool, get_shared_pool
+from src.utils.spool import DEFAULT_QUOTA, SpoolFullError, SpoolManager
+from src.utils.metrics import REGISTRY
+
+# Constants
+DEFAULT_MAX_PENDING = 32
+DEFAULT_SYNC_TIMEOUT = 300.0  # seconds before /convert falls back to a job
+RETRY_AFTER_SECONDS = 5
+
+class ConversionService:
+    """Conversion state shared by every request handler"""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        spool_dir: Optional[Union[str, Path]] = None,
+        sync_timeout: float = DEFAULT_SYNC_TIMEOUT,
+        retention: float = DEFAULT_JOB_RETENTION,
+        spool_quota_bytes: Optional[int] = DEFAULT_QUOTA,
+        pool: Optional[ConverterPool] = None,
+        history: Optional[HistoryStore] = None,
+    ):
+        """
+        Initialize the service
+
+        Args:
+            workers: Number of concurrent conversions (defaults to the pool size)
+            max_pending: Queue depth beyond which requests get 429
+            spool_dir: Directory for uploaded bodies and outputs (defaults to a temp dir)
+            sync_timeout: Seconds /convert waits before answering with a job
+            retention: Seconds a finished job and its files are kept if its
+                result is never downloaded
+            spool_quota_bytes: Disk budget of the spool (None for no limit)
+            pool: Converter pool (defaults to the shared pool)
+            history: Store finished jobs are recorded in (defaults to the shared history)
+        """
+        pool = pool if pool is not None else get_shared_pool()
+        self.spool = SpoolManager(
+            root=Path(spool_dir) if spool_dir else Path(tempfile.mkdtemp(prefix="murkdown-http-")),
+            # Sessions are normally removed with their job; the TTL only catches leftovers
+            ttl=2 * retention,
+            quota_bytes=spool_quota_bytes,
+        )
+        self.jobs = JobManager(
+            pool=pool,
+            max_workers=workers or pool.size,
+            max_pending=max_pending,
+            retention=retention,
+            keep_content=False,
+            spool=self.spool,
+            history=history if history is not None else get_shared_history(),
+        )
+        self.sync_timeout = sync_timeout
+        # Bodies being received count against the queue too, so admission is
+        # decided before a large upload is read
+        self._uploads = threading.BoundedSemaphore(max_pending)
+        self._sessions: Dict[str, str] = {}  # Job ID -> spool session of its files
+        self._sessions_lock = threading.Lock()
+
+    def admit(self) -> bool:
+        """Reserve an upload slot, or return False if the service is saturated"""
+        if self.jobs.pending_count() >= self.jobs.max_pending:
+            return False
+        return self._uploads.acquire(blocking=False)
+
+    def release(self) -> None:
+        """Release an upload slot reserved by admit"""
+        self._uploads.release()
+
+    def submit(self, stream, file_name: str, length: int, client_id: Optional[str] = None) -> Job:
+        """
+        Spool an upload into a new spool session and queue its conversion
+
+        Args:
+            stream: Request body
+            file_name: Name of the uploaded file
+            length: Content-Length of the body
+            client_id: Client the job is scheduled and recorded under
+
+        Returns:
+            The queued job
+
+        Raises:
+            SpoolFullError: If the upload does not fit in the spool quota
+            QueueFullError: If the queue is at capacity
+            OSError: If the body could not be read
+        """
+        session_id = uuid.uuid4().hex
+        try:
+            with self.spool.reserving(session_id, size=length) as upload_dir:
+                file_path = spool_stream(stream, file_name, upload_dir, length)
+            job = self.jobs.submit(
+                file_path,
+                stream=True,
+                client_id=client_id,
+                content_hash=spooled_hash(file_path),
+                output_dir=self.spool.output_dir(session_id),
+            )
+        except BaseException:
+            self.spool.remove_session(session_id)
+            raise
+        with self._sessions_lock:
+            self._sessions[job.job_id] = session_id
+        # Submitting pruned the jobs past their retention
+        self.reap()
+        return job
+
+    def discard(self, job_id: str) -> None:
+        """Delete the input and output files of a job"""
+        with self._sessions_lock:
+            session_id = self._sessions.pop(job_id, None)
+        if session_id is not None:
+            self.spool.remove_session(session_id)
+
+    def reap(self) -> None:
+        """Delete the files of jobs the job manager has forgotten"""
+        with self._sessions_lock:
+            job_ids = list(self._sessions)
+        for job_id in job_ids:
+            if self.jobs.get(job_id) is None:
+                self.discard(job_id)
+
+class ConversionRequestHandler(BaseHTTPRequestHandler):
+    """Request handler for the conversion API"""
+
+    server_version = "MurkDown/0.1"
+    protocol_version = "HTTP/1.1"
+    service: ConversionService
+
+    def do_GET(self):
+        """Route GET requests"""
+        parts = urlsplit(self.path).path.strip("/").split("/")
+        if parts == ["health"]:
+            self._send_json(HTTPStatus.OK, {
+                "status": "ok",
+                "jobs": self.service.jobs.stats(),
+                "pool": asdict(self.service.jobs.pool.stats),
+            })
+        elif parts == ["metrics"]:
+            body = REGISTRY.export_prometheus().encode("utf-8")
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif len(parts) == 2 and parts[0] == "jobs":
+            self._send_job_status(parts[1])
+        elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "result":
+            self._send_job_result(parts[1])
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, "Not found")
+
+    def do_POST(self):
+        """Route POST requests"""
+        url = urlsplit(self.path)
+        if url.path.rstrip("/") == "/convert":
+            self._handle_upload(url.query, wait=True)
+        elif url.path.rstrip("/") == "/jobs":
+            self._handle_upload(url.query, wait=False)
+        else:
+            self._send_error(HTTPStatus.NOT_FOUND, "Not found")
+
+    def _handle_upload(self, query: str, wait: bool) -> None:
+        """Spool the request body and submit it for conversion"""
+        file_name, error = self._check_upload(query)
+        if error is not None:
+            # The body was not read, so the connection cannot be reused
+            self.close_connection = True
+            self._send_error(*error)
+            return
+
+        if not self.service.admit():
+            self.close_connection = True
+            self._send_error(
+                HTTPStatus.TOO_MANY_REQUESTS,
+                "Conversion queue is full, retry later",
+                headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+            )
+            return
+
+        try:
+            length = int(self.headers["Content-Length"])
+            job = self.service.submit(self.rfile, file_name, length, client_id=self.client_address[0])
+        except QueueFullError as e:
+            self._send_error(
+                HTTPStatus.TOO_MANY_REQUESTS,
+                str(e),
+                headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+            )
+            return
+        except SpoolFullError as e:
+            # Rejected before the body was read
+            self.close_connection = True
+            self._send_error(
+                HTTPStatus.INSUFFICIENT_STORAGE,
+                str(e),
+                headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+            )
+            return
+        except OSError as e:
+            self.close_connection = True
+            self._send_error(HTTPStatus.BAD_REQUEST, f"Could not read request body: {e}")
+            return
+        finally:
+            self.service.release()
+
+        if wait:
+            self.service.jobs.wait(job.job_id, self.service.sync_timeout)
+            if job.done:
+                self._send_job_result(job.job_id)
+                return
+        self._send_json(
+            HTTPStatus.ACCEPTED,
+            self._job_payload(job),
+            headers={"Location": f"/jobs/{job.job_id}"},
+        )
+
+    def _check_upload(self, query: str) -> Tuple[Optional[str], Optional[Tuple[HTTPStatus, str]]]:
+        """
+        Validate an upload from its headers before reading the body
+
+        Returns:
+            Tuple of (file_name, error) where error is (status, message) or None
+        """
+        file_name = parse_qs(query).get("filename", [""])[0]
+        file_name = Path(file_name).name
+        if not file_name:
+            return None, (HTTPStatus.BAD_REQUEST, "Missing filename query parameter")
+        if Path(file_name).suffix.lower()[1:] not in SUPPORTED_FORMATS:
+            return None, (HTTPStatus.UNSUPPORTED_MEDIA_TYPE, f"Unsupported file format: {Path(file_name).suffix}")
+
+        length = self.headers.get("Content-Length")
+        if length is None or not length.isdigit():
+            return None, (HTTPStatus.LENGTH_REQUIRED, "Content-Length header is required")
+        if int(length) > MAX_FILE_SIZE:
+            return None, (HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"File size exceeds {MAX_FILE_SIZE/1024/1024}MB limit")
+        return file_name, None
+
+    def _send_job_status(self, job_id: str) -> None:
+        """Send the status of a job as JSON"""
+        job = self.service.jobs.get(job_id)
+        if job is None:
+            self._send_error(HTTPStatus.NOT_FOUND, f"Unknown job: {job_id}")
+            return
+        self._send_json(HTTPStatus.OK, self._job_payload(job))
+
+    def _send_job_result(self, job_id: str) -> None:
+        """
+        Stream the markdown produced by a finished job from disk
+
+        The job's files are deleted once the result has been sent, so it
+        can be downloaded once.
+        """
+        job = self.service.jobs.get(job_id)
+        if job is None:
+            self._send_error(HTTPStatus.NOT_FOUND, f"Unknown job: {job_id}")
+            return
+        if not job.done:
+            self._send_json(HTTPStatus.CONFLICT, self._job_payload(job))
+            return
+        if not job.result.success:
+            self.service.discard(job_id)
+            self._send_error(HTTPStatus.UNPROCESSABLE_ENTITY, job.result.error)
+            return
+
+        try:
+            f = open(job.result.output_file, "rb")
+        except OSError:
+            self._send_error(HTTPStatus.GONE, f"Result of job {job_id} was already downloaded or has expired")
+            return
+        with f:
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", "text/markdown; charset=utf-8")
+            self.send_header("Content-Length", str(os.fstat(f.fileno()).st_size))
+            self.send_header("Content-Disposition", f'attachment; filename="{Path(job.result.output_file).name}"')
+            self.end_headers()
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                self.wfile.write(chunk)
+        self.service.discard(job_id)
+
+    def _job_payload(self, job: Job) -> dict:
+        """JSON-serializable view of a job"""
+        payload = {
+            "job_id": job.job_id,
+            "status": job.status.value,
+            "estimated_cost": round(job.cost, 3),
+            "queue_wait": round(job.queue_wait, 3),
+            "run_time": round(job.run_time, 3),
+        }
+        if job.status == JobStatus.QUEUED:
+            payload["queue_position"] = self.service.jobs.queue_position(job.job_id)
+        if job.done:
+            payload["success"] = job.result.success
+            payload["error"] = job.result.error
+        return payload
+
+    def _send_json(self, status: HTTPStatus, payload: dict, headers: Optional[dict] = None) -> None:
+        """Send a JSON response"""
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: HTTPStatus, message: str, headers: Optional[dict] = None) -> None:
+        """Send a JSON error response"""
+        self._send_json(status, {"error": message}, headers)
+
+def make_server(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    service: Optional[ConversionService] = None,
+) -> ThreadingHTTPServer:
+    """
+    Create an HTTP server for the conversion API
+
+    Args:
+        host: Interface to bind
+        port: Port to bind (0 picks a free port)
+        service: Shared service state (defaults to a new ConversionService)
+
+    Returns:
+        A server ready for serve_forever()
+    """
+    handler = type(
+        "BoundConversionRequestHandler",
+        (ConversionRequestHandler,),
+        {"service": service or ConversionService()},
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Run the conversion service until interrupted"""
+    parser = argparse.ArgumentParser(prog="murkdown-server", description="MurkDown HTTP conversion service")
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="Port to bind (default: 8000)")
+    parser.add_argument("--workers", type=int, help="Concurrent conversions (default: CPU count)")
+    parser.add_argument("--max-pending", type=int, default=DEFAULT_MAX_PENDING, help="Queue depth before returning 429")
+    parser.add_argument("--spool-dir", type=Path, help="Directory for uploaded files and outputs")
+    args = parser.parse_args(argv)
+
+    service = ConversionService(workers=args.workers, max_pending=args.max_pending, spool_dir=args.spool_dir)
+    server = make_server(args.host, args.port, service)
+    print(f"MurkDown listening on http://{args.host}:{server.server_port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,21 @@ Utility functions for MarkItDown Web
 
 from .converters import MarkdownConverter, ConversionResult, SUPPORTED_FORMATS
 from .file_handlers import save_uploaded_file, cleanup_temp_files
+from .cache import ConversionCache, CacheStats
+from .metrics import MetricsRegistry, REGISTRY
+from .pool import ConverterPool, PoolStats, get_shared_pool
+from .isolation import IsolatedConverter
+from .jobs import JobManager, Job, JobStatus, QueueFullError
+from .streaming import StreamProgress, STREAMING_CONVERTERS
+from .sniff import sniff_file, check_format
+from .spool import SpoolManager, SpoolStats, SpoolFullError, get_shared_spool
+from .sync import DirectorySync, SyncReport
+from .archives import ZipOutput, extract_zip, fit_for_download, ArchiveError
+from .chunking import Chunk, MarkdownChunker, iter_chunks
+from .compaction import CompactionStats, MarkdownCompactor, compact_markdown
+from .dedup import NearDuplicateIndex, DuplicateMatch
+from .history import HistoryStore, HistoryEntry, get_shared_history
+from .scheduler import FairScheduler, estimate_cost
 
 __all__ = [
     'MarkdownConverter',
@@ -11,4 +26,43 @@ __all__ = [
     'SUPPORTED_FORMATS',
     'save_uploaded_file',
     'cleanup_temp_files',
+    'ConversionCache',
+    'CacheStats',
+    'MetricsRegistry',
+    'REGISTRY',
+    'ConverterPool',
+    'PoolStats',
+    'get_shared_pool',
+    'IsolatedConverter',
+    'JobManager',
+    'Job',
+    'JobStatus',
+    'QueueFullError',
+    'StreamProgress',
+    'STREAMING_CONVERTERS',
+    'sniff_file',
+    'check_format',
+    'SpoolManager',
+    'SpoolStats',
+    'SpoolFullError',
+    'get_shared_spool',
+    'DirectorySync',
+    'SyncReport',
+    'ZipOutput',
+    'extract_zip',
+    'fit_for_download',
+    'ArchiveError',
+    'Chunk',
+    'MarkdownChunker',
+    'iter_chunks',
+    'CompactionStats',
+    'MarkdownCompactor',
+    'compact_markdown',
+    'NearDuplicateIndex',
+    'DuplicateMatch',
+    'HistoryStore',
+    'HistoryEntry',
+    'get_shared_history',
+    'FairScheduler',
+    'estimate_cost',
 ] 
\ No newline at end of file
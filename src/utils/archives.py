@@ -0,0 +1,240 @@
+"""
+ZIP input extraction and incremental ZIP output
+
+Input archives are extracted member by member in fixed-size chunks, so
+memory use does not grow with the archive. Member names are confined to
+the destination directory and sizes are checked against limits while
+decompressing, which guards against path traversal and decompression
+bombs. Output archives are written to disk one converted file at a time
+as conversions finish, and served from disk.
+"""
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Optional, Union
+import os
+import shutil
+import tempfile
+import zipfile
+
+from .converters import SUPPORTED_FORMATS
+
+# Constants
+COPY_CHUNK_SIZE = 1024 * 1024  # 1MB
+MAX_ARCHIVE_FILES = 1000
+MAX_EXTRACTED_BYTES = 1024 * 1024 * 1024  # 1GB
+MAX_COMPRESSION_RATIO = 100  # Uncompressed / compressed size per member
+
+class ArchiveError(ValueError):
+    """Raised when an archive is invalid or exceeds the extraction limits"""
+
+def is_zip(file_path: Union[str, Path]) -> bool:
+    """Check whether a path names a ZIP archive by extension"""
+    return Path(file_path).suffix.lower() == '.zip'
+
+def zip_extracted_size(zip_path: Union[str, Path]) -> int:
+    """
+    Declared uncompressed size of the convertible members of an archive
+
+    Reads only the central directory; use it to reserve space up front.
+
+    Args:
+        zip_path: Path to the ZIP file
+
+    Returns:
+        Total bytes extract_zip would write if the headers are honest
+    """
+    with zipfile.ZipFile(zip_path) as archive:
+        return sum(
+            info.file_size for info in archive.infolist()
+            if not info.is_dir() and _member_path(info.filename) is not None
+        )
+
+def extract_zip(
+    zip_path: Union[str, Path],
+    dest_dir: Union[str, Path],
+    max_files: int = MAX_ARCHIVE_FILES,
+    max_bytes: int = MAX_EXTRACTED_BYTES,
+    max_ratio: float = MAX_COMPRESSION_RATIO,
+) -> List[Path]:
+    """
+    Extract the convertible files of an archive in a streaming fashion
+
+    Directories are recreated below dest_dir; members with unsafe names
+    (absolute paths, "..", drive letters), unsupported extensions or
+    symlinks are skipped. Limits are enforced on the bytes actually
+    decompressed, not just on what the headers claim.
+
+    Args:
+        zip_path: Path to the ZIP file
+        dest_dir: Directory to extract into
+        max_files: Maximum number of files to extract
+        max_bytes: Maximum total uncompressed bytes
+        max_ratio: Maximum compression ratio of any member
+
+    Returns:
+        Paths of the extracted files in archive order
+
+    Raises:
+        ArchiveError: If the archive is corrupt or exceeds a limit
+    """
+    dest_dir = Path(dest_dir)
+    extracted: List[Path] = []
+    total = 0
+    try:
+        with zipfile.ZipFile(zip_path) as archive:
+            for info in archive.infolist():
+                relative = _member_path(info.filename)
+                if info.is_dir() or relative is None or _is_symlink(info):
+                    continue
+                if len(extracted) >= max_files:
+                    raise ArchiveError(f"Archive has more than {max_files} files")
+                if total + info.file_size > max_bytes:
+                    raise ArchiveError(f"Archive expands beyond {max_bytes / 1024 / 1024:.0f}MB")
+
+                target = dest_dir.joinpath(*relative.parts)
+                target.parent.mkdir(parents=True, exist_ok=True)
+                limit = min(max_bytes - total, max(info.compress_size, 1) * max_ratio)
+                fd, part_path = tempfile.mkstemp(dir=target.parent, suffix=".part")
+                try:
+                    with archive.open(info) as source, os.fdopen(fd, "wb") as f:
+                        written = 0
+                        for chunk in iter(lambda: source.read(COPY_CHUNK_SIZE), b""):
+                            written += len(chunk)
+                            if written > limit:
+                                raise ArchiveError(f"'{info.filename}' decompresses beyond the allowed size")
+                            f.write(chunk)
+                    os.replace(part_path, target)
+                except BaseException:
+                    if os.path.exists(part_path):
+                        os.unlink(part_path)
+                    raise
+                total += written
+                extracted.append(target)
+    except zipfile.BadZipFile as e:
+        raise ArchiveError(f"Invalid ZIP archive: {e}") from e
+    return extracted
+
+def fit_for_download(file_path: Union[str, Path], limit: int) -> Optional[Path]:
+    """
+    File to offer for a download that is held in memory, within a size limit
+
+    A file over the limit is compressed into a ZIP beside it, built once and
+    reused on later calls; Markdown usually shrinks several times. ZIP files
+    are not compressed again.
+
+    Args:
+        file_path: File to download
+        limit: Largest size in bytes that may be loaded into memory
+
+    Returns:
+        file_path itself, the ZIP holding it, or None if neither fits the limit
+    """
+    path = Path(file_path)
+    if path.stat().st_size <= limit:
+        return path
+    if is_zip(path):
+        return None
+    zip_path = path.with_name(path.name + ".zip")
+    if not zip_path.exists():
+        with ZipOutput(zip_path) as archive:
+            archive.add_file(path)
+    return zip_path if zip_path.stat().st_size <= limit else None
+
+class ZipOutput:
+    """ZIP archive written incrementally on disk as converted files arrive"""
+
+    def __init__(self, zip_path: Union[str, Path]):
+        """
+        Start a new archive; it appears at zip_path when closed
+
+        Args:
+            zip_path: Final location of the archive
+        """
+        self.path = Path(zip_path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._part_path = self.path.with_name(self.path.name + ".part")
+        self._archive: Optional[zipfile.ZipFile] = zipfile.ZipFile(
+            self._part_path, "w", compression=zipfile.ZIP_DEFLATED
+        )
+        self._names: Dict[str, int] = {}
+        self.count = 0
+
+    @property
+    def closed(self) -> bool:
+        """Whether the archive has been finalized"""
+        return self._archive is None
+
+    def add_file(self, file_path: Union[str, Path], arcname: Optional[str] = None) -> str:
+        """
+        Copy a file into the archive in chunks
+
+        Args:
+            file_path: File to add
+            arcname: Name inside the archive (defaults to the file name);
+                duplicates get a numeric suffix
+
+        Returns:
+            The name used inside the archive
+        """
+        name = self._unique_name(arcname or Path(file_path).name)
+        info = zipfile.ZipInfo.from_file(file_path, name)
+        info.compress_type = zipfile.ZIP_DEFLATED
+        with open(file_path, "rb") as source, self._archive.open(info, "w", force_zip64=True) as target:
+            shutil.copyfileobj(source, target, COPY_CHUNK_SIZE)
+        self.count += 1
+        return name
+
+    def add_text(self, arcname: str, text: str) -> str:
+        """Add a small generated file (e.g. an error report)"""
+        name = self._unique_name(arcname)
+        self._archive.writestr(name, text)
+        self.count += 1
+        return name
+
+    def close(self) -> Path:
+        """Write the central directory and move the archive into place"""
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+            os.replace(self._part_path, self.path)
+        return self.path
+
+    def discard(self) -> None:
+        """Abandon an unfinished archive"""
+        if self._archive is not None:
+            self._archive.close()
+            self._archive = None
+            self._part_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "ZipOutput":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+    def _unique_name(self, name: str) -> str:
+        """Name not yet used in the archive (a.md, a-2.md, ...)"""
+        count = self._names.get(name, 0) + 1
+        self._names[name] = count
+        if count == 1:
+            return name
+        path = PurePosixPath(name)
+        return self._unique_name(str(path.with_name(f"{path.stem}-{count}{path.suffix}")))
+
+def _member_path(name: str) -> Optional[PurePosixPath]:
+    """Safe relative path of a convertible archive member, or None"""
+    path = PurePosixPath(name.replace("\\", "/"))
+    if path.is_absolute() or any(part in ("", "..") or ":" in part for part in path.parts):
+        return None
+    # Skip macOS resource forks and hidden files
+    if any(part.startswith(".") or part == "__MACOSX" for part in path.parts):
+        return None
+    if path.suffix.lower()[1:] not in SUPPORTED_FORMATS:
+        return None
+    return path
+
+def _is_symlink(info: zipfile.ZipInfo) -> bool:
+    """Whether a member was stored as a Unix symlink"""
+    return (info.external_attr >> 16) & 0o170000 == 0o120000
@@ -0,0 +1,181 @@
+"""
+Chunked, parallel transcription of audio files
+
+Recordings are split on silence into segments of bounded length, each
+segment is transcribed by an offline recognizer on a process pool, and
+the text is reassembled in order with timestamps. A long recording is
+therefore transcribed at roughly real time divided by the number of
+cores instead of in one monolithic pass.
+
+Recognizers are pluggable: RECOGNIZERS maps a backend name to a
+module-level function taking (wav_bytes, language) and returning text.
+The built-in backends use SpeechRecognition's offline engines.
+"""
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+from functools import lru_cache
+import io
+import json
+import os
+
+from .parallel import ordered_map, parallel_executor
+
+# Constants
+AUDIO_FORMATS = frozenset({'mp3', 'wav'})
+SAMPLE_RATE = 16000  # What offline recognizers expect
+MAX_SEGMENT_MS = 30 * 1000
+MIN_SILENCE_MS = 500
+SILENCE_BELOW_AVERAGE_DB = 16  # Quieter than the average loudness by this much is silence
+SEEK_STEP_MS = 50
+SEGMENT_PADDING_MS = 200
+
+Transcriber = Callable[[bytes, Optional[str]], str]
+
+@lru_cache(maxsize=1)
+def _recognizer():
+    """Per-process SpeechRecognition recognizer (it caches loaded models)"""
+    import speech_recognition as sr
+    return sr.Recognizer()
+
+def _recognize(wav: bytes, method: str, **kwargs) -> str:
+    """Run a SpeechRecognition engine on WAV bytes, returning '' for silence"""
+    import speech_recognition as sr
+
+    recognizer = _recognizer()
+    with sr.AudioFile(io.BytesIO(wav)) as source:
+        audio = recognizer.record(source)
+    try:
+        return getattr(recognizer, method)(audio, **kwargs)
+    except sr.UnknownValueError:
+        return ""
+
+def transcribe_sphinx(wav: bytes, language: Optional[str] = None) -> str:
+    """Transcribe with CMU Sphinx (needs pocketsphinx)"""
+    return _recognize(wav, 'recognize_sphinx', language=language or 'en-US')
+
+def transcribe_whisper(wav: bytes, language: Optional[str] = None) -> str:
+    """Transcribe with a local Whisper model (needs openai-whisper)"""
+    return _recognize(wav, 'recognize_whisper', model='base', language=language)
+
+def transcribe_vosk(wav: bytes, language: Optional[str] = None) -> str:
+    """Transcribe with Vosk (needs vosk and a model in ./model)"""
+    result = _recognize(wav, 'recognize_vosk')
+    return json.loads(result).get('text', '') if result else ''
+
+# Backend name -> transcriber; functions must be module-level to reach worker processes
+RECOGNIZERS: Dict[str, Transcriber] = {
+    'sphinx': transcribe_sphinx,
+    'whisper': transcribe_whisper,
+    'vosk': transcribe_vosk,
+}
+
+def register_recognizer(name: str, transcriber: Transcriber) -> None:
+    """
+    Make a recognizer backend available by name
+
+    Args:
+        name: Backend name used for MarkdownConverter(audio_backend=...)
+        transcriber: Module-level function taking (wav_bytes, language)
+    """
+    RECOGNIZERS[name] = transcriber
+
+def plan_segments(
+    ranges: List[Tuple[int, int]],
+    duration_ms: int,
+    max_segment_ms: int = MAX_SEGMENT_MS,
+    padding_ms: int = SEGMENT_PADDING_MS
+) -> List[Tuple[int, int]]:
+    """
+    Group speech ranges into segments no longer than max_segment_ms
+
+    Consecutive ranges are merged while they fit, so segments break at
+    pauses; a single range longer than the limit is cut into equal parts.
+
+    Args:
+        ranges: Non-silent (start_ms, end_ms) ranges in order
+        duration_ms: Length of the recording
+        max_segment_ms: Upper bound on segment length
+        padding_ms: Silence kept around each segment so words are not clipped
+
+    Returns:
+        (start_ms, end_ms) segments in order
+    """
+    segments: List[Tuple[int, int]] = []
+    current: Optional[List[int]] = None
+    for start, end in ranges:
+        if current is not None and end - current[0] <= max_segment_ms:
+            current[1] = end
+            continue
+        if current is not None:
+            segments.append((current[0], current[1]))
+        # Split overlong speech without a pause into equal parts
+        parts = max(1, -(-(end - start) // max_segment_ms))
+        step = (end - start) / parts
+        for part in range(parts - 1):
+            segments.append((int(start + part * step), int(start + (part + 1) * step)))
+        current = [int(start + (parts - 1) * step), end]
+    if current is not None:
+        segments.append((current[0], current[1]))
+    return [(max(0, start - padding_ms), min(duration_ms, end + padding_ms)) for start, end in segments]
+
+def format_timestamp(ms: int) -> str:
+    """Render milliseconds as HH:MM:SS"""
+    seconds = ms // 1000
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+def _transcribe_segment(transcriber: Transcriber, wav: bytes, language: Optional[str]) -> str:
+    """Transcribe one segment (runs in worker processes)"""
+    return transcriber(wav, language).strip()
+
+def iter_audio_transcript(
+    file_path: Union[str, Path],
+    audio_backend: str = 'sphinx',
+    audio_language: Optional[str] = None,
+    audio_workers: Optional[int] = None,
+    **options
+) -> Iterator[str]:
+    """
+    Yield a timestamped Markdown transcript of an audio file segment by segment
+
+    Args:
+        file_path: Path to the recording (any format ffmpeg can decode)
+        audio_backend: Name of a backend in RECOGNIZERS
+        audio_language: Language passed to the backend (None for its default)
+        audio_workers: Transcription processes (defaults to the CPU count)
+
+    Yields:
+        A heading, then one "**[start – end]** text" paragraph per
+        non-empty segment
+    """
+    from pydub import AudioSegment
+    from pydub.silence import detect_nonsilent
+
+    if audio_backend not in RECOGNIZERS:
+        raise ValueError(f"Unknown audio backend: {audio_backend}")
+    transcriber = RECOGNIZERS[audio_backend]
+
+    # Recognizers want 16kHz mono; converting first also shrinks the silence scan
+    audio = AudioSegment.from_file(str(file_path)).set_channels(1).set_frame_rate(SAMPLE_RATE)
+    ranges = detect_nonsilent(
+        audio,
+        min_silence_len=MIN_SILENCE_MS,
+        silence_thresh=audio.dBFS - SILENCE_BELOW_AVERAGE_DB,
+        seek_step=SEEK_STEP_MS,
+    )
+    segments = plan_segments(ranges, len(audio))
+
+    yield "### Audio Transcript:\n\n"
+
+    def segment_args():
+        for start, end in segments:
+            buffer = io.BytesIO()
+            audio[start:end].export(buffer, format='wav')
+            yield transcriber, buffer.getvalue(), audio_language
+
+    workers = audio_workers or os.cpu_count() or 1
+    with parallel_executor(workers) as executor:
+        # Two segments per worker in flight bounds the exported WAV data held at once
+        texts = ordered_map(executor, _transcribe_segment, segment_args(), 2 * workers)
+        for (start, end), text in zip(segments, texts):
+            if text:
+                yield f"**[{format_timestamp(start)} – {format_timestamp(end)}]** {text}\n\n"
@@ -0,0 +1,248 @@
+"""
+Conversion cache utilities for MarkItDown Web
+"""
+from pathlib import Path
+from typing import Optional, Dict, Any, Union
+from dataclasses import dataclass, asdict
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+# Constants
+DEFAULT_CACHE_DIR = Path(tempfile.gettempdir()) / "murkdown-cache"
+DEFAULT_MEMORY_ITEMS = 128
+DEFAULT_MEMORY_BYTES = 256 * 1024 * 1024  # 256MB
+DEFAULT_DISK_BYTES = 2 * 1024 * 1024 * 1024  # 2GB
+
+@dataclass
+class CachedConversion:
+    """Data class for a cached conversion output"""
+    content: str
+    title: Optional[str] = None
+
+@dataclass
+class CacheStats:
+    """Data class for cache hit/miss counters"""
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    memory_items: int = 0
+    memory_bytes: int = 0
+    disk_items: int = 0
+    disk_bytes: int = 0
+    evictions: int = 0
+
+    @property
+    def hits(self) -> int:
+        """Total number of hits across both tiers"""
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+class ConversionCache:
+    """Two-tier (memory LRU + disk) cache of conversion outputs keyed by content hash"""
+
+    def __init__(
+        self,
+        max_items: int = DEFAULT_MEMORY_ITEMS,
+        max_memory_bytes: int = DEFAULT_MEMORY_BYTES,
+        cache_dir: Optional[Union[str, Path]] = None,
+        max_disk_bytes: int = DEFAULT_DISK_BYTES,
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            max_items: Maximum number of entries kept in memory
+            max_memory_bytes: Maximum total content size kept in memory (UTF-8 bytes)
+            cache_dir: Directory for the disk tier, or None to disable it
+            max_disk_bytes: Maximum total size of the disk tier
+        """
+        self.max_items = max_items
+        self.max_memory_bytes = max_memory_bytes
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, CachedConversion]" = OrderedDict()
+        # UTF-8 size of each memory entry, so eviction does not encode again
+        self._memory_sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+        if self.cache_dir:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            for entry in self.cache_dir.glob("*/*.json"):
+                self._stats.disk_items += 1
+                self._stats.disk_bytes += entry.stat().st_size
+
+    @staticmethod
+    def make_key(content_hash: str, options: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build a cache key from a content hash and converter options
+
+        Args:
+            content_hash: Hash of the input file bytes
+            options: Options that influence the conversion output
+
+        Returns:
+            Hex digest identifying the conversion
+        """
+        encoded_options = json.dumps(options or {}, sort_keys=True, default=str)
+        digest = hashlib.blake2b(digest_size=32)
+        digest.update(content_hash.encode())
+        digest.update(b"\0")
+        digest.update(encoded_options.encode())
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[CachedConversion]:
+        """
+        Look up a conversion, promoting disk hits into memory
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached conversion or None on a miss
+        """
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                self._stats.memory_hits += 1
+                return entry
+
+        entry = self._read_disk(key)
+        with self._lock:
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            self._stats.disk_hits += 1
+            self._store_memory(key, entry)
+        return entry
+
+    def put(self, key: str, entry: CachedConversion) -> None:
+        """
+        Store a conversion in both tiers
+
+        Args:
+            key: Cache key from make_key
+            entry: Conversion output to store
+        """
+        with self._lock:
+            self._store_memory(key, entry)
+        self._write_disk(key, entry)
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_sizes.clear()
+            self._stats.memory_items = 0
+            self._stats.memory_bytes = 0
+            if self.cache_dir:
+                for path in self.cache_dir.glob("*/*.json"):
+                    path.unlink(missing_ok=True)
+                self._stats.disk_items = 0
+                self._stats.disk_bytes = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        """Snapshot of the cache counters"""
+        with self._lock:
+            return CacheStats(**asdict(self._stats))
+
+    def _store_memory(self, key: str, entry: CachedConversion) -> None:
+        """Insert into the memory tier and evict least recently used entries (lock held)"""
+        if self._memory.pop(key, None) is not None:
+            self._stats.memory_bytes -= self._memory_sizes.pop(key)
+
+        size = len(entry.content.encode('utf-8'))
+        if size > self.max_memory_bytes:
+            self._stats.memory_items = len(self._memory)
+            return
+
+        self._memory[key] = entry
+        self._memory_sizes[key] = size
+        self._stats.memory_bytes += size
+        while self._memory and (
+            len(self._memory) > self.max_items
+            or self._stats.memory_bytes > self.max_memory_bytes
+        ):
+            evicted_key, _ = self._memory.popitem(last=False)
+            self._stats.memory_bytes -= self._memory_sizes.pop(evicted_key)
+            self._stats.evictions += 1
+        self._stats.memory_items = len(self._memory)
+
+    def _disk_path(self, key: str) -> Path:
+        """Location of a key in the disk tier"""
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _read_disk(self, key: str) -> Optional[CachedConversion]:
+        """Read an entry from the disk tier"""
+        if not self.cache_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            # Refresh mtime so eviction is least recently used
+            os.utime(path)
+        except (OSError, ValueError):
+            return None
+        return CachedConversion(content=data["content"], title=data.get("title"))
+
+    def _write_disk(self, key: str, entry: CachedConversion) -> None:
+        """Write an entry to the disk tier and enforce the size budget"""
+        if not self.cache_dir:
+            return
+        path = self._disk_path(key)
+        payload = json.dumps(asdict(entry)).encode("utf-8")
+        if len(payload) > self.max_disk_bytes:
+            return
+
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            previous_size = path.stat().st_size if path.exists() else None
+            tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error writing cache entry: {e}")
+            return
+
+        with self._lock:
+            if previous_size is None:
+                self._stats.disk_items += 1
+            else:
+                self._stats.disk_bytes -= previous_size
+            self._stats.disk_bytes += len(payload)
+            if self._stats.disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        """Delete least recently used disk entries until under budget (lock held)"""
+        entries = []
+        for path in self.cache_dir.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        total = sum(size for _, size, _ in entries)
+        remaining = len(entries)
+        for _, size, path in entries:
+            if total <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            remaining -= 1
+            self._stats.evictions += 1
+        self._stats.disk_bytes = total
+        self._stats.disk_items = remaining
@@ -0,0 +1,410 @@
+"""
+Heading-aware, token-budgeted chunking of Markdown for LLM ingestion
+
+MarkdownChunker consumes Markdown in arbitrary pieces as a conversion
+produces them and emits chunks as soon as they are complete, so a long
+document never has to be held in memory as a whole. Text is split into
+blocks (paragraphs, tables, fenced code, headings); blocks are packed into
+chunks up to a token budget, a heading always starts a new chunk, and
+chunks cut by the budget repeat the tail of their predecessor as overlap.
+Each chunk records its character offsets in the full Markdown and the
+path of headings it sits under.
+
+Tokens are counted with tiktoken when it is installed (one batched call
+per fed piece); otherwise a regex approximation is used.
+"""
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, Union
+from dataclasses import dataclass, field
+from functools import lru_cache
+import json
+import re
+
+# Constants
+DEFAULT_MAX_TOKENS = 512
+DEFAULT_OVERLAP_TOKENS = 64
+DEFAULT_ENCODING = 'cl100k_base'
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.*?)\s*#*\s*$')
+FENCE_PATTERN = re.compile(r'^\s*(```|~~~)')
+SENTENCE_END_PATTERN = re.compile(r'(?<=[.!?])\s+')
+LINE_PATTERN = re.compile(r'\n')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+# Roughly one BPE token per short word piece or punctuation mark
+APPROX_TOKEN_PATTERN = re.compile(r'\w{1,4}|[^\w\s]')
+
+TokenCounter = Callable[[List[str]], List[int]]
+
+@dataclass
+class Chunk:
+    """Data class for one chunk of a document"""
+    index: int
+    text: str
+    tokens: int
+    start: int  # Character offset of the chunk in the full Markdown
+    end: int
+    section: List[str] = field(default_factory=list)  # Enclosing headings, outermost first
+    source: Optional[str] = None
+
+    def to_json(self) -> str:
+        """Serialize as one JSONL record"""
+        return json.dumps({
+            'id': f"{self.source}#{self.index}" if self.source else str(self.index),
+            'source': self.source,
+            'index': self.index,
+            'section': self.section,
+            'start': self.start,
+            'end': self.end,
+            'tokens': self.tokens,
+            'text': self.text,
+        }, ensure_ascii=False)
+
+@dataclass
+class _Block:
+    """A paragraph, table, code block or heading with its offsets"""
+    text: str
+    start: int
+    end: int
+    tokens: int = 0
+    heading: Optional[Tuple[int, str]] = None  # (level, title)
+    origin: Optional["_Block"] = None  # Block this piece was split from
+
+@lru_cache(maxsize=4)
+def get_token_counter(encoding: str = DEFAULT_ENCODING) -> TokenCounter:
+    """
+    Batched token counter for an encoding
+
+    Args:
+        encoding: tiktoken encoding name
+
+    Returns:
+        Function mapping a list of texts to their token counts; exact with
+        tiktoken installed, approximate otherwise
+    """
+    try:
+        import tiktoken
+        tokenizer = tiktoken.get_encoding(encoding)
+    except (ImportError, ValueError):
+        return approximate_token_counts
+
+    def count(texts: List[str]) -> List[int]:
+        if not texts:
+            return []
+        return [len(tokens) for tokens in tokenizer.encode_ordinary_batch(texts)]
+    return count
+
+def approximate_token_counts(texts: List[str]) -> List[int]:
+    """Estimate token counts without a tokenizer"""
+    return [len(APPROX_TOKEN_PATTERN.findall(text)) for text in texts]
+
+class MarkdownChunker:
+    """Incremental Markdown to chunk splitter"""
+
+    def __init__(
+        self,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        overlap_tokens: int = DEFAULT_OVERLAP_TOKENS,
+        counter: Optional[TokenCounter] = None,
+        source: Optional[str] = None,
+    ):
+        """
+        Initialize the chunker
+
+        Args:
+            max_tokens: Token budget per chunk
+            overlap_tokens: Tokens of trailing context repeated at the start
+                of a chunk that continues the same section
+            counter: Batched token counter (defaults to get_token_counter())
+            source: Source name stored in every chunk
+        """
+        if max_tokens <= 0:
+            raise ValueError("max_tokens must be positive")
+        if not 0 <= overlap_tokens < max_tokens:
+            raise ValueError("overlap_tokens must be between 0 and max_tokens")
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.counter = counter if counter is not None else get_token_counter()
+        self.source = source
+        self._offset = 0  # Characters consumed so far
+        self._partial = ''  # Incomplete last line
+        self._lines: List[str] = []  # Lines of the open block
+        self._block_start = 0
+        self._fence: Optional[str] = None
+        self._section: List[Tuple[int, str]] = []
+        self._current: List[_Block] = []
+        self._current_tokens = 0
+        self._current_section: List[str] = []
+        self._has_content = False  # Whether the open chunk has more than headings and overlap
+        self._index = 0
+
+    def feed(self, text: str) -> List[Chunk]:
+        """
+        Consume the next piece of Markdown
+
+        Args:
+            text: Any piece of the document (need not end on a line)
+
+        Returns:
+            Chunks completed by this piece
+        """
+        blocks: List[_Block] = []
+        data = self._partial + text
+        position = self._offset - len(self._partial)
+        lines = data.split('\n')
+        self._partial = lines.pop()
+        for line in lines:
+            self._take_line(line, position, blocks)
+            position += len(line) + 1
+        self._offset += len(text)
+        return self._pack(blocks)
+
+    def close(self) -> List[Chunk]:
+        """
+        Flush the rest of the document
+
+        Returns:
+            The remaining chunks
+        """
+        blocks: List[_Block] = []
+        if self._partial:
+            self._take_line(self._partial, self._offset - len(self._partial), blocks)
+            self._partial = ''
+        self._end_block(blocks)
+        chunks = self._pack(blocks)
+        if self._current:
+            chunks.append(self._emit())
+        return chunks
+
+    def _take_line(self, line: str, position: int, blocks: List[_Block]) -> None:
+        """Assign one complete line to the open block"""
+        if self._fence is not None:
+            self._lines.append(line)
+            if line.strip().startswith(self._fence):
+                self._fence = None
+                self._end_block(blocks)
+            return
+        fence = FENCE_PATTERN.match(line)
+        if fence:
+            self._end_block(blocks)
+            self._block_start = position
+            self._fence = fence.group(1)
+            self._lines.append(line)
+            return
+        # Blank lines (including PDF page-break form feeds) end a block
+        if not line.strip():
+            self._end_block(blocks)
+            return
+        heading = HEADING_PATTERN.match(line)
+        if heading:
+            self._end_block(blocks)
+            blocks.append(_Block(
+                text=line,
+                start=position,
+                end=position + len(line),
+                heading=(len(heading.group(1)), heading.group(2)),
+            ))
+            return
+        if not self._lines:
+            self._block_start = position
+        self._lines.append(line)
+
+    def _end_block(self, blocks: List[_Block]) -> None:
+        """Close the open block, if any"""
+        if self._lines:
+            text = '\n'.join(self._lines).rstrip()
+            blocks.append(_Block(text=text, start=self._block_start, end=self._block_start + len(text)))
+            self._lines = []
+
+    def _pack(self, blocks: List[_Block]) -> List[Chunk]:
+        """Count blocks in one batch and pack them into chunks"""
+        if not blocks:
+            return []
+        for block, tokens in zip(blocks, self.counter([block.text for block in blocks])):
+            block.tokens = tokens
+        chunks: List[Chunk] = []
+        for block in blocks:
+            if block.heading is not None:
+                if self._has_content:
+                    chunks.append(self._emit())
+                level, title = block.heading
+                self._section = [entry for entry in self._section if entry[0] < level] + [(level, title)]
+                # Headings with nothing under them yet stay with what follows
+                self._current_section = [title for _, title in self._section]
+            pending = [block]
+            while pending:
+                piece = pending.pop(0)
+                if self._current_tokens + piece.tokens <= self.max_tokens:
+                    self._append(piece)
+                elif self._has_content:
+                    chunks.append(self._emit(overlap=True))
+                    pending.insert(0, piece)
+                else:
+                    # Only headings or overlap so far: fill the room that is left
+                    parts = self._fit(piece, max(1, self.max_tokens - self._current_tokens))
+                    self._append(parts[0])
+                    pending[:0] = parts[1:]
+        return chunks
+
+    def _append(self, block: _Block) -> None:
+        """Add a block to the open chunk"""
+        if not self._current:
+            self._current_section = [title for _, title in self._section]
+        if self._current and block.origin is not None and self._current[-1].origin is block.origin:
+            # Consecutive pieces of one paragraph keep their original spacing
+            previous = self._current.pop()
+            self._current_tokens -= previous.tokens
+            block = _merge([previous, block])
+        self._current.append(block)
+        self._current_tokens += block.tokens
+        self._has_content = self._has_content or block.heading is None
+
+    def _fit(self, block: _Block, budget: int) -> List[_Block]:
+        """Split a block larger than budget tokens at lines, sentences, then words"""
+        if block.tokens <= budget:
+            return [block]
+        for pattern in (LINE_PATTERN, SENTENCE_END_PATTERN, WHITESPACE_PATTERN):
+            pieces = _split_block(block, pattern)
+            if len(pieces) > 1:
+                break
+        else:
+            # One unbreakable run of characters: cut it by length
+            step = max(1, len(block.text) * budget // max(block.tokens, 1))
+            pieces = [
+                _Block(
+                    text=block.text[i:i + step],
+                    start=block.start + i,
+                    end=block.start + min(i + step, len(block.text)),
+                    origin=block.origin or block,
+                )
+                for i in range(0, len(block.text), step)
+            ]
+        for piece, tokens in zip(pieces, self.counter([piece.text for piece in pieces])):
+            piece.tokens = tokens
+
+        # Pieces are packed (and re-joined) by the caller; only oversized ones need more splitting
+        result: List[_Block] = []
+        for piece in pieces:
+            if piece.tokens > budget and len(piece.text) < len(block.text):
+                result.extend(self._fit(piece, budget))
+            else:
+                result.append(piece)
+        return result
+
+    def _emit(self, overlap: bool = False) -> Chunk:
+        """Turn the open chunk into a Chunk, keeping an overlap tail if asked"""
+        blocks = self._current
+        chunk = Chunk(
+            index=self._index,
+            text='\n\n'.join(block.text for block in blocks),
+            tokens=self._current_tokens,
+            start=blocks[0].start,
+            end=blocks[-1].end,
+            section=self._current_section,
+            source=self.source,
+        )
+        self._index += 1
+        tail = self._overlap_tail(blocks) if overlap and self.overlap_tokens else []
+        self._current = tail
+        self._current_tokens = sum(block.tokens for block in tail)
+        self._has_content = False
+        return chunk
+
+    def _overlap_tail(self, blocks: List[_Block]) -> List[_Block]:
+        """Trailing blocks, sentences or words of a chunk that fit the overlap budget"""
+        tail: List[_Block] = []
+        tokens = 0
+        for block in reversed(blocks):
+            if block.heading is not None:
+                break
+            if tokens + block.tokens <= self.overlap_tokens:
+                tail.insert(0, block)
+                tokens += block.tokens
+                continue
+            # Repeat the closing sentences (or words) of a block too long to repeat whole
+            pieces = _split_block(block, SENTENCE_END_PATTERN)
+            if len(pieces) == 1:
+                pieces = _split_block(block, WHITESPACE_PATTERN)
+            taken: List[_Block] = []
+            for piece, count in zip(reversed(pieces), reversed(self.counter([p.text for p in pieces]))):
+                if tokens + count > self.overlap_tokens:
+                    break
+                piece.tokens = count
+                taken.insert(0, piece)
+                tokens += count
+            if taken:
+                tail.insert(0, _merge(taken))
+            break
+        return tail
+
+def _split_block(block: _Block, pattern: "re.Pattern") -> List[_Block]:
+    """Split a block at a separator pattern, keeping offsets"""
+    origin = block.origin or block
+    pieces = []
+    position = 0
+    for match in pattern.finditer(block.text):
+        if match.start() > position:
+            pieces.append(_Block(
+                text=block.text[position:match.start()],
+                start=block.start + position,
+                end=block.start + match.start(),
+                origin=origin,
+            ))
+        position = match.end()
+    if position < len(block.text):
+        pieces.append(_Block(text=block.text[position:], start=block.start + position, end=block.end, origin=origin))
+    return pieces
+
+def _merge(group: List[_Block]) -> _Block:
+    """Rejoin consecutive pieces of one block, with the original text between them"""
+    origin = group[0].origin
+    start, end = group[0].start, group[-1].end
+    return _Block(
+        text=origin.text[start - origin.start:end - origin.start],
+        start=start,
+        end=end,
+        tokens=sum(piece.tokens for piece in group),
+        origin=origin,
+    )
+
+def iter_chunks(
+    pieces: Iterable[str],
+    max_tokens: int = DEFAULT_MAX_TOKENS,
+    overlap_tokens: int = DEFAULT_OVERLAP_TOKENS,
+    encoding: str = DEFAULT_ENCODING,
+    source: Optional[str] = None,
+) -> Iterator[Chunk]:
+    """
+    Chunk a stream of Markdown pieces
+
+    Args:
+        pieces: Markdown in document order (e.g. MarkdownConverter.iter_markdown)
+        max_tokens: Token budget per chunk
+        overlap_tokens: Tokens repeated between chunks of the same section
+        encoding: tiktoken encoding used for counting
+        source: Source name stored in every chunk
+
+    Yields:
+        Chunks as soon as they are complete
+    """
+    chunker = MarkdownChunker(max_tokens, overlap_tokens, get_token_counter(encoding), source)
+    for piece in pieces:
+        yield from chunker.feed(piece)
+    yield from chunker.close()
+
+def write_jsonl(chunks: Iterable[Chunk], output_file: Union[str, Path]) -> int:
+    """
+    Write chunks as JSON lines, flushing each one
+
+    Args:
+        chunks: Chunks to write
+        output_file: Destination .jsonl file
+
+    Returns:
+        Number of chunks written
+    """
+    count = 0
+    with open(output_file, 'w', encoding='utf-8') as f:
+        for chunk in chunks:
+            f.write(chunk.to_json() + '\n')
+            f.flush()
+            count += 1
+    return count
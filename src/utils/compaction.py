@@ -0,0 +1,331 @@
+"""
+Single-pass Markdown compaction
+
+MarkItDown output carries a lot that costs tokens and storage without
+carrying meaning: trailing and repeated whitespace, table cells padded to
+a common width, running headers, footers and page numbers repeated on
+every PDF page, boilerplate lines repeated many times throughout a
+document, and headings left with nothing under them. MarkdownCompactor removes these in
+one scan over the lines as the Markdown is produced, so it also works on
+streamed conversions; memory is bounded by a few lines per page edge plus
+one hash per distinct long line. Fenced code is passed through untouched.
+"""
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from collections import deque
+from dataclasses import dataclass
+import re
+
+from .chunking import FENCE_PATTERN, HEADING_PATTERN, TokenCounter, approximate_token_counts
+
+# Constants
+PAGE_BREAK = '\f'
+FURNITURE_EDGE_LINES = 3  # Non-blank lines at the top and bottom of a page checked for headers/footers
+FURNITURE_MAX_CHARS = 100  # Longer lines are content, not page furniture
+FURNITURE_MIN_PAGES = 3  # Edge lines are furniture once they appear on this many pages; earlier copies stay
+BOILERPLATE_MIN_CHARS = 32  # Shorter repeated lines ("Yes.", "Total") are kept
+BOILERPLATE_MIN_REPEATS = 4  # Long lines are boilerplate once they appear this many times; earlier copies stay
+BOILERPLATE_MAX_TRACKED = 200000  # Distinct lines remembered for deduplication
+INVISIBLE_CHARS = {0x200b: None, 0x200c: None, 0x200d: None, 0xfeff: None, 0x00ad: None, 0x00a0: ' '}
+INNER_WHITESPACE_PATTERN = re.compile(r'[ \t\v]{2,}|\t')
+LEADING_WHITESPACE_PATTERN = re.compile(r'^[ \t]*')
+TABLE_ROW_PATTERN = re.compile(r'^\s*\|')
+TABLE_CELL_SPLIT_PATTERN = re.compile(r'(?<!\\)\|')
+TABLE_DELIMITER_PATTERN = re.compile(r'^(:?)-+(:?)$')
+PAGE_NUMBER_AFFIX_PATTERN = re.compile(
+    r'^(?:page\s*)?(\d+)(?:\s*(?:of|/)\s*\d+)?\W*|\W*(?:page\s*)?(\d+)(?:\s*(?:of|/)\s*\d+)?$', re.IGNORECASE
+)
+PAGE_NUMBER_PATTERN = re.compile(
+    r'^[-–—\s]*(?:page\s*)?(\d{1,4})(?:\s*(?:of|/)\s*\d{1,4})?[-–—\s]*$', re.IGNORECASE
+)
+
+# Line kinds
+_BLANK, _TEXT, _TABLE, _HEADING, _CODE = range(5)
+
+@dataclass
+class CompactionStats:
+    """Data class for what compaction removed"""
+    input_bytes: int = 0
+    output_bytes: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    pages: int = 0
+    furniture_lines: int = 0
+    duplicate_lines: int = 0
+    empty_sections: int = 0
+
+    @property
+    def bytes_saved(self) -> int:
+        """Bytes removed"""
+        return self.input_bytes - self.output_bytes
+
+    @property
+    def tokens_saved(self) -> int:
+        """Estimated tokens removed"""
+        return self.input_tokens - self.output_tokens
+
+    @property
+    def ratio(self) -> float:
+        """Output size as a fraction of the input size"""
+        return self.output_bytes / self.input_bytes if self.input_bytes else 1.0
+
+class MarkdownCompactor:
+    """Incremental, single-pass Markdown compactor"""
+
+    def __init__(self, counter: Optional[TokenCounter] = None):
+        """
+        Initialize the compactor
+
+        Args:
+            counter: Batch token counter for the savings estimate (see
+                chunking.get_token_counter; defaults to the regex approximation)
+        """
+        self._counter = counter or approximate_token_counts
+        self.stats = CompactionStats()
+        self._partial = ''
+        self._fence: Optional[str] = None
+        self._paged = False
+        # Page edges: top lines are checked as they arrive, bottom lines wait in _tail
+        self._top_left = FURNITURE_EDGE_LINES
+        self._tail: Deque[Tuple[int, str]] = deque()
+        self._tail_lines = 0
+        # Edge line keys: the text without a page number, and the number's offset from the page index
+        self._page_keys: Set[Tuple[str, Optional[int]]] = set()
+        self._edge_pages: Dict[Tuple[str, Optional[int]], int] = {}
+        self._seen: Dict[int, int] = {}
+        # Headings wait here until content shows their section is not empty
+        self._headings: List[Tuple[int, str, bool]] = []
+        self._blank = False
+        self._started = False
+        self._out: List[str] = []
+
+    def feed(self, text: str) -> str:
+        """
+        Compact the next piece of Markdown
+
+        Pieces may split lines anywhere; a few lines at each page edge are
+        held back until the page ends.
+
+        Args:
+            text: Next piece of the document
+
+        Returns:
+            Compacted Markdown that is final so far (possibly empty)
+        """
+        lines = (self._partial + text).split('\n')
+        self._partial = lines.pop()
+        for line in lines:
+            self._take_line(line)
+        return self._flush(text)
+
+    def close(self) -> str:
+        """
+        Compact what is still held back at the end of the document
+
+        Returns:
+            The remaining compacted Markdown
+        """
+        if self._partial:
+            self._take_line(self._partial)
+            self._partial = ''
+        self._end_page(final=True)
+        # Headings that never got content
+        self.stats.empty_sections += len(self._headings)
+        self._headings = []
+        return self._flush('')
+
+    def _take_line(self, line: str) -> None:
+        """Split a line at page breaks and route the parts"""
+        if PAGE_BREAK in line and self._fence is None:
+            parts = line.split(PAGE_BREAK)
+            self._add_line(parts[0])
+            for part in parts[1:]:
+                self._end_page()
+                self._add_line(part)
+        else:
+            self._add_line(line)
+
+    def _add_line(self, line: str) -> None:
+        """Normalize a line and pass it through the page-edge window"""
+        kind, line = self._normalize(line)
+        if kind != _BLANK and self._top_left > 0:
+            self._top_left -= 1
+            if kind == _TEXT and self._is_furniture(line):
+                return
+        self._tail.append((kind, line))
+        if kind != _BLANK:
+            self._tail_lines += 1
+        # Lines pushed out of the window are not at the bottom edge
+        while self._tail_lines > FURNITURE_EDGE_LINES:
+            kind, line = self._tail.popleft()
+            if kind != _BLANK:
+                self._tail_lines -= 1
+            self._emit(kind, line)
+
+    def _end_page(self, final: bool = False) -> None:
+        """Check the bottom edge of the page that just ended"""
+        if not final:
+            self._paged = True
+        while self._tail:
+            kind, line = self._tail.popleft()
+            if kind == _TEXT and self._paged and self._is_furniture(line):
+                continue
+            self._emit(kind, line)
+        self._tail_lines = 0
+        # Count edge lines once per page, after the page has been checked
+        for key in self._page_keys:
+            self._edge_pages[key] = self._edge_pages.get(key, 0) + 1
+        self._page_keys.clear()
+        self._top_left = FURNITURE_EDGE_LINES
+        if not final:
+            self.stats.pages += 1
+            self._blank = True
+
+    def _normalize(self, line: str) -> Tuple[int, str]:
+        """Classify a line and strip what does not change its meaning"""
+        # Fenced code is kept byte for byte
+        if self._fence is not None:
+            if line.lstrip().startswith(self._fence):
+                self._fence = None
+            return _CODE, line
+        match = FENCE_PATTERN.match(line)
+        if match:
+            self._fence = match.group(1)
+            return _CODE, line
+
+        # The checks in front of each rewrite skip it for the common clean line
+        if not line.isascii():
+            line = line.translate(INVISIBLE_CHARS)
+        line = line.rstrip()
+        if not line:
+            return _BLANK, ''
+        if line[0] == '|' or TABLE_ROW_PATTERN.match(line):
+            return _TABLE, _compact_table_row(line)
+        indent = LEADING_WHITESPACE_PATTERN.match(line).end()
+        body = line[indent:] if indent else line
+        if '  ' in body or '\t' in body or '\v' in body:
+            body = INNER_WHITESPACE_PATTERN.sub(' ', body)
+        line = line[:indent] + body if indent else body
+        if body.startswith('#') and HEADING_PATTERN.match(body):
+            return _HEADING, line
+        return _TEXT, line
+
+    def _is_furniture(self, line: str) -> bool:
+        """Whether a line at a page edge is a running header, footer or page number"""
+        stripped = line.strip()
+        if len(stripped) > FURNITURE_MAX_CHARS:
+            return False
+        # Lines repeat as they are, or with a page number (alone or at one
+        # end) that moves with the page: "Page 7" on the seventh page
+        # repeats "Page 3" on the third, while "Step 2" does not repeat "Step 1"
+        text = stripped.lower()
+        keys = [(text, None)]
+        number = PAGE_NUMBER_PATTERN.match(stripped)
+        if number is not None:
+            text = ''
+        else:
+            number = PAGE_NUMBER_AFFIX_PATTERN.search(text)
+            if number is not None:
+                text = text[:number.start()] + text[number.end():]
+        if number is not None:
+            value = int(next(group for group in number.groups() if group))
+            keys.append((text, value - self.stats.pages))
+        self._page_keys.update(keys)
+        if any(self._edge_pages.get(key, 0) >= FURNITURE_MIN_PAGES - 1 for key in keys):
+            self.stats.furniture_lines += 1
+            return True
+        return False
+
+    def _emit(self, kind: int, line: str) -> None:
+        """Apply the section and boilerplate rules to a line leaving the edge window"""
+        if kind == _BLANK:
+            self._blank = True
+            return
+        if kind == _HEADING:
+            level = HEADING_PATTERN.match(line.lstrip()).end(1)
+            blank = self._blank
+            # A heading at the same or a higher level closes the sections waiting before it
+            while self._headings and self._headings[-1][0] >= level:
+                _, _, heading_blank = self._headings.pop()
+                blank = blank or heading_blank
+                self.stats.empty_sections += 1
+            self._headings.append((level, line, blank))
+            self._blank = False
+            return
+        if kind == _TEXT and len(line) >= BOILERPLATE_MIN_CHARS:
+            key = hash(line.strip())
+            seen = self._seen.get(key, 0)
+            if seen >= BOILERPLATE_MIN_REPEATS - 1:
+                self.stats.duplicate_lines += 1
+                return
+            if seen or len(self._seen) < BOILERPLATE_MAX_TRACKED:
+                self._seen[key] = seen + 1
+        blank = self._blank
+        for _, heading, heading_blank in self._headings:
+            self._write(heading, heading_blank)
+        self._headings = []
+        self._write(line, blank)
+        self._blank = False
+
+    def _write(self, line: str, blank: bool) -> None:
+        """Append a line, preceded by one blank line if the input had any"""
+        if blank and self._started:
+            self._out.append('\n')
+        self._out.append(line + '\n')
+        self._started = True
+
+    def _flush(self, text: str) -> str:
+        """Return the lines written since the last call and update the stats"""
+        output = ''.join(self._out)
+        self._out = []
+        input_tokens, output_tokens = self._counter([text, output])
+        self.stats.input_bytes += len(text.encode('utf-8'))
+        self.stats.output_bytes += len(output.encode('utf-8'))
+        self.stats.input_tokens += input_tokens
+        self.stats.output_tokens += output_tokens
+        return output
+
+def _compact_table_row(line: str) -> str:
+    """Rewrite a table row without cell padding, shortening delimiter rows"""
+    cells = TABLE_CELL_SPLIT_PATTERN.split(line.strip())
+    # The outer pipes leave empty cells at both ends
+    if cells[0] == '':
+        cells = cells[1:]
+    if cells and cells[-1] == '':
+        cells = cells[:-1]
+    cells = [INNER_WHITESPACE_PATTERN.sub(' ', cell.strip()) for cell in cells]
+    delimiters = [TABLE_DELIMITER_PATTERN.match(cell) for cell in cells]
+    if cells and all(delimiters):
+        cells = [f"{m.group(1)}---{m.group(2)}" for m in delimiters]
+    return '| ' + ' | '.join(cells) + ' |'
+
+def compact_markdown(text: str, counter: Optional[TokenCounter] = None) -> Tuple[str, CompactionStats]:
+    """
+    Compact a whole Markdown document
+
+    Args:
+        text: Markdown to compact
+        counter: Batch token counter for the savings estimate
+
+    Returns:
+        Tuple of (compacted markdown, stats)
+    """
+    compactor = MarkdownCompactor(counter)
+    output = compactor.feed(text) + compactor.close()
+    return output, compactor.stats
+
+def iter_compacted(pieces: Iterable[str], compactor: MarkdownCompactor) -> Iterator[str]:
+    """
+    Compact a stream of Markdown pieces
+
+    Args:
+        pieces: Markdown pieces in document order
+        compactor: Compactor whose stats are filled in as the pieces pass
+
+    Yields:
+        One compacted piece per input piece, then whatever close() releases
+    """
+    for text in pieces:
+        yield compactor.feed(text)
+    tail = compactor.close()
+    if tail:
+        yield tail
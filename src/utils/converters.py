@@ -2,12 +2,25 @@
 File conversion utilities for MarkItDown Web
 """
 from pathlib import Path
-from typing import Optional, Dict, Any, Union
-from dataclasses import dataclass
-from markitdown import MarkItDown
+from typing import Optional, Dict, Any, List, Union, Iterable, Iterator, BinaryIO, Callable
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import partial
+import os
+from .audio import AUDIO_FORMATS, iter_audio_transcript
+from .cache import ConversionCache, CachedConversion
+from .compaction import CompactionStats, MarkdownCompactor, compact_markdown, iter_compacted
+from .chunking import MarkdownChunker, get_token_counter, DEFAULT_MAX_TOKENS, DEFAULT_OVERLAP_TOKENS, DEFAULT_ENCODING
+from .file_handlers import compute_file_hash, compute_buffer_hash
+from .metrics import StageTimer, record_conversion
+from .sniff import sniff_file, sniff_stream, check_format, normalize_format, TEXT_FORMATS
+from .fast_paths import FAST_CONVERTERS, FAST_STREAMING_CONVERTERS
+from .ocr import IMAGE_FORMATS, iter_pdf_pages_ocr, ocr_image_file
+from .streaming import StreamProgress, STREAMING_CONVERTERS, STREAMING_COUNTERS, write_xlsx_sheets
 
 # Constants
 MAX_FILE_SIZE = 100 * 1024 * 1024  # 100MB
+STREAM_CACHE_LIMIT = 16 * 1024 * 1024  # Streamed outputs larger than this are not cached
 SUPPORTED_FORMATS = {
     'pdf': 'application/pdf',
     'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
@@ -31,13 +44,63 @@ class ConversionResult:
     error: Optional[str] = None
     original_file: Optional[str] = None
     output_file: Optional[str] = None
+    cached: bool = False
+    detected_format: Optional[str] = None
+    input_bytes: Optional[int] = None
+    output_bytes: Optional[int] = None
+    output_files: List[str] = field(default_factory=list)
+    limit_exceeded: Optional[str] = None  # 'timeout', 'memory' or 'crash' when a worker was killed
+    compaction: Optional[CompactionStats] = None  # Set when the output was compacted in this run
+    timings: Dict[str, float] = field(default_factory=dict)
 
 class MarkdownConverter:
     """Class for handling markdown conversions"""
     
-    def __init__(self):
-        """Initialize the converter"""
-        self._converter = MarkItDown()
+    def __init__(
+        self,
+        cache: Optional[ConversionCache] = None,
+        fast_paths: bool = False,
+        ocr: bool = False,
+        audio_backend: Optional[str] = None,
+        compact: bool = False
+    ):
+        """
+        Initialize the converter
+        
+        Args:
+            cache: Optional cache shared between converters
+            fast_paths: Convert plain text and HTML with the lightweight
+                converters in fast_paths instead of MarkItDown
+            ocr: Recognize text in images and in PDF pages without a text layer
+            audio_backend: Transcribe mp3/wav with this offline recognizer
+                (see audio.RECOGNIZERS) instead of MarkItDown
+            compact: Strip redundant whitespace, table padding, page furniture,
+                repeated boilerplate and empty sections (see compaction)
+        """
+        self._markitdown = None
+        self._cache = cache
+        self.fast_paths = fast_paths
+        self.ocr = ocr
+        self.audio_backend = audio_backend
+        self.compact = compact
+    
+    @property
+    def _converter(self):
+        """MarkItDown instance, imported and created on first conversion"""
+        if self._markitdown is None:
+            # markitdown pulls in every per-format library, so keep it off the import path
+            from markitdown import MarkItDown
+            self._markitdown = MarkItDown()
+        return self._markitdown
+    
+    @property
+    def cache(self) -> Optional[ConversionCache]:
+        """Conversion cache used by this converter, if any"""
+        return self._cache
+    
+    def warm_up(self) -> None:
+        """Load MarkItDown now instead of on the first conversion"""
+        self._converter
     
     def validate_file(self, file_path: Union[str, Path]) -> tuple[bool, Optional[str]]:
         """
@@ -63,56 +126,747 @@ class MarkdownConverter:
         if file_path.suffix.lower()[1:] not in SUPPORTED_FORMATS:
             return False, f"Unsupported file format: {file_path.suffix}"
         
+        # Check the content against the extension before any parsing
+        error = check_format(file_path.suffix[1:], sniff_file(file_path))
+        if error is not None:
+            return False, error
+        
         return True, None
     
-    def convert_file(self, file_path: Union[str, Path], **options) -> ConversionResult:
+    def convert_file(
+        self,
+        file_path: Union[str, Path],
+        output_dir: Optional[Union[str, Path]] = None,
+        **options
+    ) -> ConversionResult:
         """
         Convert file to markdown
         
         Args:
             file_path: Path to the input file
+            output_dir: Directory for the .md file (defaults to the input's directory)
             **options: Additional conversion options
             
         Returns:
             ConversionResult object
         """
         file_path = Path(file_path)
+        timer = StageTimer()
         
         # Validate file
-        is_valid, error = self.validate_file(file_path)
+        with timer.stage('validate'):
+            is_valid, error = self.validate_file(file_path)
         if not is_valid:
-            return ConversionResult(
+            return self._finish(ConversionResult(
                 success=False,
                 error=error,
                 original_file=str(file_path)
-            )
+            ), timer)
         
         try:
+            input_bytes = file_path.stat().st_size
+            
+            fmt = normalize_format(file_path.suffix[1:])
+            
+            # Look up previous conversions of the same bytes
+            cache_key, converted = None, None
+            if self._cache is not None:
+                with timer.stage('cache_lookup'):
+                    cache_key, converted = self._lookup_cache(file_path, self._key_options(fmt, options))
+            cached = converted is not None
+            compaction = None
+            
             # Convert file
-            result = self._converter.convert_local(str(file_path))
+            if converted is None:
+                with timer.stage('parse'):
+                    if self.fast_paths and fmt in FAST_CONVERTERS:
+                        content, title = FAST_CONVERTERS[fmt](file_path)
+                        converted = CachedConversion(content=content, title=title)
+                    elif self.ocr and fmt == 'pdf' or self.audio_backend and fmt in AUDIO_FORMATS:
+                        converted = CachedConversion(content=''.join(self._streamer(fmt)(file_path, **options)))
+                    else:
+                        result = self._converter.convert_local(
+                            str(file_path),
+                            file_extension=_route_extension(file_path.suffix[1:], sniff_file(file_path))
+                        )
+                        converted = CachedConversion(content=result.text_content, title=result.title)
+                if self.ocr and fmt in IMAGE_FORMATS:
+                    with timer.stage('ocr'):
+                        converted.content = _append_ocr_text(converted.content, ocr_image_file(file_path, **options))
+                if self.compact:
+                    with timer.stage('compact'):
+                        converted.content, compaction = compact_markdown(converted.content)
+                if cache_key is not None:
+                    with timer.stage('cache_store'):
+                        self._cache.put(cache_key, converted)
+            
+            with timer.stage('write'):
+                result = self._save_output(file_path, converted, output_dir)
+            result.cached = cached
+            result.input_bytes = input_bytes
+            result.compaction = compaction
+            
+        except Exception as e:
+            result = ConversionResult(
+                success=False,
+                error=str(e),
+                original_file=str(file_path)
+            )
+        return self._finish(result, timer)
+    
+    def iter_markdown(self, file_path: Union[str, Path], **options) -> Iterator[str]:
+        """
+        Yield the markdown of a file in pieces without writing it anywhere
+        
+        Formats with a streaming converter (see STREAMING_CONVERTERS) yield
+        one piece per page/batch; other formats yield the whole document once.
+        Pieces are compacted on the way when the converter compacts.
+        
+        Args:
+            file_path: Path to the input file
+            **options: Additional conversion options
+            
+        Yields:
+            Markdown pieces in document order
+            
+        Raises:
+            ValueError: If the file fails validation
+        """
+        file_path = Path(file_path)
+        is_valid, error = self.validate_file(file_path)
+        if not is_valid:
+            raise ValueError(error)
+        
+        fmt = normalize_format(file_path.suffix[1:])
+        streamer = self._streamer(fmt)
+        if streamer is None and self.fast_paths:
+            streamer = FAST_STREAMING_CONVERTERS.get(fmt)
+        if streamer is None:
+            pieces = iter([self._converter.convert_local(
+                str(file_path),
+                file_extension=_route_extension(file_path.suffix[1:], sniff_file(file_path))
+            ).text_content])
+        else:
+            pieces = streamer(file_path, **options)
+        if self.compact:
+            pieces = iter_compacted(pieces, MarkdownCompactor())
+        yield from pieces
+    
+    def convert_file_streaming(
+        self,
+        file_path: Union[str, Path],
+        output_dir: Optional[Union[str, Path]] = None,
+        on_progress: Optional[Callable[[StreamProgress], None]] = None,
+        **options
+    ) -> ConversionResult:
+        """
+        Convert file to markdown, writing the output incrementally
+        
+        Each page (or batch) is appended and flushed to the .md file as soon
+        as it is parsed, so memory stays flat and readers of the output file
+        see the first pages within seconds. The result carries no content;
+        read it from output_file. Formats without a streaming converter fall
+        back to convert_file.
+        
+        Args:
+            file_path: Path to the input file
+            output_dir: Directory for the .md file (defaults to the input's directory)
+            on_progress: Callback invoked after each piece is written
+            **options: Additional conversion options
+            
+        Returns:
+            ConversionResult object
+        """
+        file_path = Path(file_path)
+        fmt = normalize_format(file_path.suffix[1:])
+        streamer = self._streamer(fmt)
+        if streamer is None:
+            result = self.convert_file(file_path, output_dir=output_dir, **options)
+            if result.success and on_progress is not None:
+                on_progress(StreamProgress(index=0, total=1, output_file=result.output_file, text=result.content))
+            return result
+        
+        timer = StageTimer()
+        
+        # Validate file
+        with timer.stage('validate'):
+            is_valid, error = self.validate_file(file_path)
+        if not is_valid:
+            return self._finish(ConversionResult(
+                success=False,
+                error=error,
+                original_file=str(file_path)
+            ), timer)
+        
+        try:
+            input_bytes = file_path.stat().st_size
+            
+            # A cached conversion is written in one piece
+            cache_key, converted = None, None
+            if self._cache is not None:
+                with timer.stage('cache_lookup'):
+                    cache_key, converted = self._lookup_cache(file_path, self._key_options(fmt, options, streamed=True))
+            if converted is not None:
+                with timer.stage('write'):
+                    result = self._save_output(file_path, converted, output_dir)
+                result.cached = True
+                result.input_bytes = input_bytes
+                if on_progress is not None:
+                    on_progress(StreamProgress(index=0, total=1, output_file=result.output_file, text=converted.content))
+                result.content = None
+                return self._finish(result, timer)
             
-            # Create output filename
-            output_file = file_path.with_suffix('.md')
+            output_file = self._output_path(file_path, output_dir)
+            total = None
+            if fmt in STREAMING_COUNTERS:
+                with timer.stage('count'):
+                    total = STREAMING_COUNTERS[fmt](file_path, **options)
             
-            # Save result
-            output_file.write_text(result.text_content)
+            # Append each piece as soon as it is parsed
+            pieces = streamer(file_path, **options)
+            compactor = None
+            if self.compact:
+                compactor = MarkdownCompactor()
+                pieces = iter_compacted(pieces, compactor)
+            with open(output_file, 'w', encoding='utf-8') as f:
+                index = 0
+                while True:
+                    with timer.stage('parse'):
+                        text = next(pieces, None)
+                    if text is None:
+                        break
+                    with timer.stage('write'):
+                        f.write(text)
+                        f.flush()
+                    if on_progress is not None:
+                        on_progress(StreamProgress(index=index, total=total, output_file=str(output_file), text=text))
+                    index += 1
             
-            return ConversionResult(
+            output_bytes = output_file.stat().st_size
+            if cache_key is not None and output_bytes <= STREAM_CACHE_LIMIT:
+                with timer.stage('cache_store'):
+                    self._cache.put(cache_key, CachedConversion(content=output_file.read_text(encoding='utf-8')))
+            
+            result = ConversionResult(
                 success=True,
-                content=result.text_content,
-                title=result.title,
                 original_file=str(file_path),
-                output_file=str(output_file)
+                output_file=str(output_file),
+                input_bytes=input_bytes,
+                output_bytes=output_bytes,
+                compaction=compactor.stats if compactor is not None else None
             )
             
         except Exception as e:
-            return ConversionResult(
+            result = ConversionResult(
                 success=False,
                 error=str(e),
                 original_file=str(file_path)
             )
+        return self._finish(result, timer)
+    
+    def convert_sheets(
+        self,
+        file_path: Union[str, Path],
+        output_dir: Optional[Union[str, Path]] = None,
+        **options
+    ) -> ConversionResult:
+        """
+        Convert a workbook to one markdown file per worksheet
+        
+        Sheets are streamed row by row into "<stem>-sheets/<index>-<sheet>.md";
+        output_file is that directory and output_files lists the sheet files.
+        
+        Args:
+            file_path: Path to the .xlsx file
+            output_dir: Parent directory for the sheet directory (defaults to the input's directory)
+            **options: max_rows, max_cols and batch_rows
+            
+        Returns:
+            ConversionResult object
+        """
+        file_path = Path(file_path)
+        timer = StageTimer()
+        
+        with timer.stage('validate'):
+            is_valid, error = self.validate_file(file_path)
+            if is_valid and file_path.suffix.lower() != '.xlsx':
+                is_valid, error = False, f"Per-sheet output requires an .xlsx file, got {file_path.suffix}"
+        if not is_valid:
+            return self._finish(ConversionResult(
+                success=False,
+                error=error,
+                original_file=str(file_path)
+            ), timer)
+        
+        try:
+            sheet_dir = Path(output_dir) if output_dir is not None else file_path.parent
+            sheet_dir = sheet_dir / f"{file_path.stem}-sheets"
+            with timer.stage('parse'):
+                written = write_xlsx_sheets(file_path, sheet_dir, **options)
+            result = ConversionResult(
+                success=True,
+                original_file=str(file_path),
+                output_file=str(sheet_dir),
+                output_files=[str(p) for p in written],
+                input_bytes=file_path.stat().st_size,
+                output_bytes=sum(p.stat().st_size for p in written)
+            )
+        except Exception as e:
+            result = ConversionResult(
+                success=False,
+                error=str(e),
+                original_file=str(file_path)
+            )
+        return self._finish(result, timer)
+    
+    def convert_file_chunks(
+        self,
+        file_path: Union[str, Path],
+        output_dir: Optional[Union[str, Path]] = None,
+        max_tokens: int = DEFAULT_MAX_TOKENS,
+        overlap_tokens: int = DEFAULT_OVERLAP_TOKENS,
+        encoding: str = DEFAULT_ENCODING,
+        **options
+    ) -> ConversionResult:
+        """
+        Convert file to heading-aware, token-budgeted chunks in JSONL
+        
+        The markdown is chunked while it is produced (page by page for
+        streaming formats) and each chunk is written to "<stem>.jsonl" as
+        soon as it is complete; see chunking.Chunk for the record layout.
+        
+        Args:
+            file_path: Path to the input file
+            output_dir: Directory for the .jsonl file (defaults to the input's directory)
+            max_tokens: Token budget per chunk
+            overlap_tokens: Tokens repeated between consecutive chunks of a section
+            encoding: tiktoken encoding used to count tokens
+            **options: Additional conversion options
+            
+        Returns:
+            ConversionResult object; output_file is the .jsonl file
+        """
+        file_path = Path(file_path)
+        timer = StageTimer()
+        
+        with timer.stage('validate'):
+            is_valid, error = self.validate_file(file_path)
+        if not is_valid:
+            return self._finish(ConversionResult(
+                success=False,
+                error=error,
+                original_file=str(file_path)
+            ), timer)
+        
+        try:
+            chunker = MarkdownChunker(max_tokens, overlap_tokens, get_token_counter(encoding), source=file_path.name)
+            output_file = self._output_path(file_path, output_dir).with_suffix('.jsonl')
+            pieces = self.iter_markdown(file_path, **options)
+            with open(output_file, 'w', encoding='utf-8') as f:
+                while True:
+                    with timer.stage('parse'):
+                        text = next(pieces, None)
+                    with timer.stage('chunk'):
+                        chunks = chunker.feed(text) if text is not None else chunker.close()
+                    with timer.stage('write'):
+                        for chunk in chunks:
+                            f.write(chunk.to_json() + '\n')
+                        f.flush()
+                    if text is None:
+                        break
+            
+            result = ConversionResult(
+                success=True,
+                original_file=str(file_path),
+                output_file=str(output_file),
+                input_bytes=file_path.stat().st_size,
+                output_bytes=output_file.stat().st_size
+            )
+        except Exception as e:
+            result = ConversionResult(
+                success=False,
+                error=str(e),
+                original_file=str(file_path)
+            )
+        return self._finish(result, timer)
+    
+    def convert_stream(
+        self,
+        stream: BinaryIO,
+        file_name: str,
+        output_dir: Optional[Union[str, Path]] = None,
+        **options
+    ) -> ConversionResult:
+        """
+        Convert an in-memory file object to markdown without spooling it to disk
+        
+        Args:
+            stream: Binary file object (e.g. an upload or io.BytesIO)
+            file_name: Original file name, used to pick the format
+            output_dir: Directory for the .md file (not written if omitted)
+            **options: Additional conversion options
+            
+        Returns:
+            ConversionResult object
+        """
+        file_path = Path(file_name)
+        timer = StageTimer()
+        
+        # Validate stream
+        with timer.stage('validate'):
+            extension = file_path.suffix.lower()[1:]
+            input_bytes = _stream_size(stream)
+            detected = sniff_stream(stream) if extension in SUPPORTED_FORMATS else None
+        if extension not in SUPPORTED_FORMATS:
+            return self._finish(ConversionResult(
+                success=False,
+                error=f"Unsupported file format: {file_path.suffix}",
+                original_file=file_name
+            ), timer)
+        
+        error = check_format(extension, detected)
+        if error is not None:
+            return self._finish(ConversionResult(
+                success=False,
+                error=error,
+                original_file=file_name,
+                detected_format=detected
+            ), timer)
+        
+        if input_bytes > MAX_FILE_SIZE:
+            return self._finish(ConversionResult(
+                success=False,
+                error=f"File size exceeds {MAX_FILE_SIZE/1024/1024}MB limit",
+                original_file=file_name,
+                input_bytes=input_bytes
+            ), timer)
+        
+        try:
+            # Hash the buffer in place when the stream exposes one
+            cache_key = None
+            converted = None
+            if self._cache is not None and hasattr(stream, "getbuffer"):
+                with timer.stage('cache_lookup'):
+                    key_options = {**options, 'compact': True} if self.compact else options
+                    with stream.getbuffer() as view:
+                        cache_key = ConversionCache.make_key(compute_buffer_hash(view), key_options)
+                    converted = self._cache.get(cache_key)
+            cached = converted is not None
+            compaction = None
+            
+            # Convert stream
+            if converted is None:
+                stream.seek(0)
+                with timer.stage('parse'):
+                    result = self._converter.convert_stream(
+                        stream,
+                        file_extension=_route_extension(extension, detected)
+                    )
+                converted = CachedConversion(content=result.text_content, title=result.title)
+                if self.compact:
+                    with timer.stage('compact'):
+                        converted.content, compaction = compact_markdown(converted.content)
+                if cache_key is not None:
+                    with timer.stage('cache_store'):
+                        self._cache.put(cache_key, converted)
+            
+            if output_dir is not None:
+                with timer.stage('write'):
+                    result = self._save_output(file_path, converted, output_dir)
+            else:
+                result = ConversionResult(
+                    success=True,
+                    content=converted.content,
+                    title=converted.title,
+                    original_file=file_name,
+                    output_bytes=len(converted.content.encode('utf-8'))
+                )
+            result.cached = cached
+            result.input_bytes = input_bytes
+            result.compaction = compaction
+            
+        except Exception as e:
+            result = ConversionResult(
+                success=False,
+                error=str(e),
+                original_file=file_name
+            )
+        return self._finish(result, timer)
+    
+    def convert_many(
+        self,
+        file_paths: Iterable[Union[str, Path]],
+        workers: Optional[int] = None,
+        output_dir: Optional[Union[str, Path]] = None,
+        **options
+    ) -> Iterator[ConversionResult]:
+        """
+        Convert several files in parallel worker processes
+        
+        Results are yielded as each file completes, so their order does not
+        follow file_paths. A failure in one file never affects the others.
+        
+        Args:
+            file_paths: Paths to the input files
+            workers: Number of worker processes (defaults to the CPU count)
+            output_dir: Directory for the .md files (defaults to each input's directory)
+            **options: Additional conversion options
+            
+        Yields:
+            ConversionResult object for every input file
+        """
+        pool = ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count(),
+            initializer=_init_worker,
+            initargs=(self.fast_paths, self.ocr, self.audio_backend, self.compact),
+        )
+        futures = {}
+        try:
+            for file_path in map(Path, file_paths):
+                timer = StageTimer()
+                
+                # Reject invalid files and serve cache hits without a worker
+                with timer.stage('validate'):
+                    is_valid, error = self.validate_file(file_path)
+                if not is_valid:
+                    yield self._finish(ConversionResult(
+                        success=False,
+                        error=error,
+                        original_file=str(file_path)
+                    ), timer)
+                    continue
+                
+                try:
+                    cache_key, converted = None, None
+                    if self._cache is not None:
+                        with timer.stage('cache_lookup'):
+                            cache_key, converted = self._lookup_cache(
+                                file_path,
+                                self._key_options(normalize_format(file_path.suffix[1:]), options, streamed=True)
+                            )
+                    if converted is not None:
+                        with timer.stage('write'):
+                            result = self._save_output(file_path, converted, output_dir)
+                        result.cached = True
+                        result.input_bytes = file_path.stat().st_size
+                        yield self._finish(result, timer)
+                        continue
+                except Exception as e:
+                    yield self._finish(ConversionResult(
+                        success=False,
+                        error=str(e),
+                        original_file=str(file_path)
+                    ), timer)
+                    continue
+                
+                future = pool.submit(_convert_in_worker, str(file_path), output_dir, options)
+                futures[future] = (file_path, cache_key)
+            
+            for future in as_completed(list(futures)):
+                file_path, cache_key = futures.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # The worker died (e.g. BrokenProcessPool) rather than returning an error
+                    result = ConversionResult(
+                        success=False,
+                        error=f"Worker failed: {e}",
+                        original_file=str(file_path)
+                    )
+                if result.success and cache_key is not None:
+                    content = result.content
+                    if content is None and result.output_bytes <= STREAM_CACHE_LIMIT:
+                        # Streamed in the worker; only the output file has the markdown
+                        content = Path(result.output_file).read_text(encoding='utf-8')
+                    if content is not None:
+                        self._cache.put(cache_key, CachedConversion(content=content, title=result.title))
+                # Workers record into their own registry; count the result here too
+                record_conversion(result)
+                yield result
+        finally:
+            # Drop queued work if the caller stops iterating early
+            pool.shutdown(wait=True, cancel_futures=True)
+    
+    def _streamer(self, fmt: str) -> Optional[Callable[..., Iterator[str]]]:
+        """Streaming converter used for a format, if it has one"""
+        if self.ocr and fmt == 'pdf':
+            return iter_pdf_pages_ocr
+        if self.audio_backend and fmt in AUDIO_FORMATS:
+            return partial(iter_audio_transcript, audio_backend=self.audio_backend)
+        return STREAMING_CONVERTERS.get(fmt)
+    
+    def _key_options(self, fmt: str, options: Dict[str, Any], streamed: bool = False) -> Dict[str, Any]:
+        """
+        Options that make up the cache key for a conversion
+        
+        Fast-path, OCR, transcribed and streamed renderings can differ from
+        MarkItDown's (e.g. HTML or xlsx tables), so they are cached apart from
+        it; compacted output is cached apart from the full rendering.
+        
+        Args:
+            fmt: Canonical input format
+            options: Conversion options
+            streamed: Whether the conversion goes through convert_file_streaming
+            
+        Returns:
+            Options extended with the rendering that produced the output
+        """
+        if self.compact:
+            options = {**options, 'compact': True}
+        if self.fast_paths and fmt in FAST_CONVERTERS:
+            return {**options, 'fast': True}
+        if self.ocr and (fmt == 'pdf' or fmt in IMAGE_FORMATS):
+            return {**options, 'ocr': True}
+        if self.audio_backend and fmt in AUDIO_FORMATS:
+            return {**options, 'asr': self.audio_backend}
+        if streamed and fmt in STREAMING_CONVERTERS:
+            return {**options, 'streamed': True}
+        return options
+    
+    def _lookup_cache(
+        self,
+        file_path: Path,
+        options: Dict[str, Any]
+    ) -> tuple[Optional[str], Optional[CachedConversion]]:
+        """
+        Look up a file in the conversion cache
+        
+        Args:
+            file_path: Path to the input file
+            options: Conversion options that are part of the cache key
+            
+        Returns:
+            Tuple of (cache_key, cached_conversion); both None without a cache
+        """
+        if self._cache is None:
+            return None, None
+        cache_key = ConversionCache.make_key(compute_file_hash(file_path), options)
+        return cache_key, self._cache.get(cache_key)
+    
+    def _save_output(
+        self,
+        file_path: Path,
+        converted: CachedConversion,
+        output_dir: Optional[Union[str, Path]] = None
+    ) -> ConversionResult:
+        """
+        Write converted markdown to disk
+        
+        Args:
+            file_path: Path to the input file
+            converted: Conversion output
+            output_dir: Directory for the .md file (defaults to the input's directory)
+            
+        Returns:
+            ConversionResult object
+        """
+        # Create output filename
+        output_file = self._output_path(file_path, output_dir)
+        
+        # Save result
+        output_file.write_text(converted.content)
+        
+        return ConversionResult(
+            success=True,
+            content=converted.content,
+            title=converted.title,
+            original_file=str(file_path),
+            output_file=str(output_file),
+            output_bytes=output_file.stat().st_size
+        )
+    
+    def _output_path(self, file_path: Path, output_dir: Optional[Union[str, Path]] = None) -> Path:
+        """
+        Get the .md path for an input file, creating output_dir if needed
+        
+        Args:
+            file_path: Path to the input file
+            output_dir: Directory for the .md file (defaults to the input's directory)
+            
+        Returns:
+            Path of the markdown output
+        """
+        output_file = file_path.with_suffix('.md')
+        if output_dir is not None:
+            output_dir = Path(output_dir)
+            output_dir.mkdir(parents=True, exist_ok=True)
+            output_file = output_dir / output_file.name
+        return output_file
+    
+    def _finish(self, result: ConversionResult, timer: StageTimer) -> ConversionResult:
+        """
+        Attach stage timings to a result and record it in the metrics registry
+        
+        Args:
+            result: Conversion result
+            timer: Timer holding the stage durations
+            
+        Returns:
+            The same ConversionResult object
+        """
+        if result.detected_format is None and result.original_file:
+            # Sniffing is cached, so this does not reread the file
+            detected = sniff_file(result.original_file) if result.success else None
+            result.detected_format = detected or normalize_format(Path(result.original_file).suffix[1:]) or None
+        result.timings = timer.finish()
+        record_conversion(result)
+        return result
     
     @staticmethod
     def get_supported_formats() -> Dict[str, str]:
         """Get dictionary of supported file formats"""
-        return SUPPORTED_FORMATS.copy()
\ No newline at end of file
+        return SUPPORTED_FORMATS.copy()
+
+def _stream_size(stream: BinaryIO) -> int:
+    """Get the size of a seekable stream without reading it"""
+    if hasattr(stream, "getbuffer"):
+        with stream.getbuffer() as view:
+            return view.nbytes
+    position = stream.tell()
+    size = stream.seek(0, os.SEEK_END)
+    stream.seek(position)
+    return size
+
+# Converter owned by each convert_many worker process
+_worker_converter: Optional[MarkdownConverter] = None
+
+def _init_worker(
+    fast_paths: bool = False,
+    ocr: bool = False,
+    audio_backend: Optional[str] = None,
+    compact: bool = False
+) -> None:
+    """Create the per-process converter once per worker"""
+    global _worker_converter
+    _worker_converter = MarkdownConverter(
+        fast_paths=fast_paths, ocr=ocr, audio_backend=audio_backend, compact=compact
+    )
+
+def _convert_in_worker(
+    file_path: str,
+    output_dir: Optional[Union[str, Path]],
+    options: Dict[str, Any]
+) -> ConversionResult:
+    """Convert a single file inside a worker process"""
+    # Streaming keeps a worker's memory bounded by one page or row batch
+    return _worker_converter.convert_file_streaming(file_path, output_dir=output_dir, **options)
+
+def _append_ocr_text(content: Optional[str], text: str) -> str:
+    """Add recognized text below MarkItDown's image description"""
+    text = text.strip()
+    if not text:
+        return content or ""
+    section = f"## Text (OCR)\n\n{text}\n"
+    return f"{content.rstrip()}\n\n{section}" if content and content.strip() else section
+
+def _route_extension(claimed: str, detected: Optional[str]) -> str:
+    """
+    Extension that sends a validated file straight to the right MarkItDown converter
+    
+    Text and HTML keep the extension the user chose; everything else uses
+    the sniffed format so MarkItDown does not have to guess.
+    """
+    if detected is None or normalize_format(claimed) in TEXT_FORMATS:
+        return f".{claimed.lower()}"
+    return f".{detected}"
+
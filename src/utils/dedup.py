@@ -0,0 +1,303 @@
+"""
+Near-duplicate detection for batch conversions
+
+Each converted document is reduced to a MinHash signature of its word
+shingles, computed with vectorized NumPy hashing. Signatures go into a
+locality-sensitive hashing (LSH) index: the signature is cut into bands,
+and documents sharing any band land in the same bucket. Only documents
+in a shared bucket are compared, so a lookup costs a few dictionary
+probes instead of a pass over every indexed document, and the index
+scales to hundreds of thousands of documents. Candidates are confirmed
+by their estimated Jaccard similarity before they are reported.
+"""
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+from dataclasses import dataclass
+import os
+import re
+import tempfile
+import zlib
+
+# Constants
+DEFAULT_THRESHOLD = 0.8  # Estimated Jaccard similarity of near-duplicates
+DEFAULT_NUM_PERM = 128
+DEFAULT_SHINGLE_SIZE = 5  # Words per shingle
+DEFAULT_SEED = 1
+HASH_BLOCK_SIZE = 8192  # Shingles hashed per NumPy block, bounding the temporary matrix
+MAX_HASH = (1 << 32) - 1
+SHINGLE_MULTIPLIER = 0x100000001b3  # FNV-1a 64-bit prime
+MIX_MULTIPLIER = 0xff51afd7ed558ccd  # MurmurHash3 finalizer
+WORD_PATTERN = re.compile(r'\w+')
+
+@dataclass
+class DuplicateMatch:
+    """Data class for a document found to be a near-duplicate of an indexed one"""
+    key: str
+    duplicate_of: str
+    similarity: float
+
+def lsh_params(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    Pick the LSH band layout for a similarity threshold
+
+    Documents become candidates at roughly (1 / bands) ** (1 / rows)
+    similarity. The layout with the most rows whose candidate threshold is
+    still below the target keeps recall high; the false positives it
+    admits are removed by comparing signatures.
+
+    Args:
+        num_perm: Signature length
+        threshold: Target similarity
+
+    Returns:
+        Tuple of (bands, rows) with bands * rows == num_perm
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if (1 / bands) ** (1 / rows) < threshold:
+            best = (bands, rows)
+    return best
+
+class NearDuplicateIndex:
+    """MinHash LSH index of converted documents"""
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_THRESHOLD,
+        num_perm: int = DEFAULT_NUM_PERM,
+        shingle_size: int = DEFAULT_SHINGLE_SIZE,
+        seed: int = DEFAULT_SEED,
+    ):
+        """
+        Initialize an empty index
+
+        Args:
+            threshold: Estimated Jaccard similarity at which documents are near-duplicates
+            num_perm: MinHash signature length (more is more accurate and slower)
+            shingle_size: Words per shingle
+            seed: Seed of the hash permutations; indexes only match with equal seeds
+        """
+        import numpy as np
+
+        if not 0 < threshold <= 1:
+            raise ValueError(f"Threshold must be in (0, 1], got {threshold}")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.seed = seed
+        self.bands, self.rows = lsh_params(num_perm, threshold)
+        # RandomState's stream is stable across NumPy versions, so saved indexes stay valid
+        rng = np.random.RandomState(seed)
+        # Multiply-shift hashing: (a * x + b) mod 2**64 >> 32 with odd a needs no division
+        self._a = rng.randint(0, 1 << 64, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.randint(0, 1 << 64, size=num_perm, dtype=np.uint64)
+        self._keys: List[str] = []
+        self._numbers: Dict[str, int] = {}
+        self._signatures = np.empty((0, num_perm), dtype=np.uint32)
+        # Band bucket -> document number, or a list of them once the bucket is shared
+        self._buckets: List[Dict[bytes, Union[int, List[int]]]] = [{} for _ in range(self.bands)]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def signature(self, text: str):
+        """
+        MinHash signature of a document's word shingles
+
+        Args:
+            text: Document text (Markdown)
+
+        Returns:
+            uint32 array of length num_perm, or None if the text has no words
+        """
+        import numpy as np
+
+        shingles = self._shingle_hashes(text)
+        if shingles.size == 0:
+            return None
+        signature = np.full(self.num_perm, MAX_HASH, dtype=np.uint64)
+        for start in range(0, shingles.size, HASH_BLOCK_SIZE):
+            block = shingles[start:start + HASH_BLOCK_SIZE, None]
+            values = (block * self._a + self._b) >> np.uint64(32)
+            np.minimum(signature, values.min(axis=0), out=signature)
+        return signature.astype(np.uint32)
+
+    def query(self, signature, exclude: Optional[str] = None) -> Optional[Tuple[str, float]]:
+        """
+        Most similar indexed document at or above the threshold
+
+        Args:
+            signature: Signature from signature()
+            exclude: Key to ignore (the document itself, when it is reconverted)
+
+        Returns:
+            Tuple of (key, estimated similarity), or None
+        """
+        import numpy as np
+
+        candidates = set()
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(key)
+            if bucket is None:
+                continue
+            if isinstance(bucket, int):
+                candidates.add(bucket)
+            else:
+                candidates.update(bucket)
+        if exclude is not None:
+            candidates.discard(self._numbers.get(exclude))
+        if not candidates:
+            return None
+        numbers = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        similarities = (self._signatures[numbers] == signature).mean(axis=1)
+        best = int(similarities.argmax())
+        if similarities[best] < self.threshold:
+            return None
+        return self._keys[numbers[best]], float(similarities[best])
+
+    def add(self, key: str, signature) -> None:
+        """
+        Index a document
+
+        Re-adding a key replaces its signature; buckets of the old one may
+        still name it, which query() filters out by comparing signatures.
+
+        Args:
+            key: Identifier reported when a later document matches this one
+            signature: Signature from signature()
+        """
+        import numpy as np
+
+        if key in self._numbers:
+            number = self._numbers[key]
+            self._signatures[number] = signature
+            self._add_to_buckets(number, signature)
+            return
+        number = len(self._keys)
+        if number == self._signatures.shape[0]:
+            # Grow geometrically so adding n documents copies O(n) rows
+            grown = np.empty((max(1024, 2 * number), self.num_perm), dtype=np.uint32)
+            grown[:number] = self._signatures[:number]
+            self._signatures = grown
+        self._signatures[number] = signature
+        self._keys.append(key)
+        self._numbers[key] = number
+        self._add_to_buckets(number, signature)
+
+    def check(self, key: str, text: str, index_duplicates: bool = True) -> Optional[DuplicateMatch]:
+        """
+        Look a document up and index it
+
+        Args:
+            key: Identifier of the document (e.g. its path)
+            text: Document text
+            index_duplicates: Also index documents that matched, so later
+                copies can match them (turn off when duplicates are dropped)
+
+        Returns:
+            The match if the document is a near-duplicate, else None
+        """
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        match = self.query(signature, exclude=key)
+        if match is None or index_duplicates:
+            self.add(key, signature)
+        if match is None:
+            return None
+        return DuplicateMatch(key=key, duplicate_of=match[0], similarity=match[1])
+
+    def save(self, path: Union[str, Path]) -> None:
+        """
+        Write the index to an .npz file, so later batch runs can extend it
+
+        Only the keys and signatures are stored; buckets are rebuilt on load.
+        """
+        import numpy as np
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(
+                    f,
+                    params=np.array([self.num_perm, self.shingle_size, self.seed], dtype=np.int64),
+                    threshold=np.array(self.threshold),
+                    keys=np.array(self._keys, dtype=np.str_),
+                    signatures=self._signatures[:len(self._keys)],
+                )
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: Union[str, Path], threshold: Optional[float] = None) -> "NearDuplicateIndex":
+        """
+        Read an index written by save()
+
+        Args:
+            path: .npz file
+            threshold: Similarity threshold to use (defaults to the saved one)
+
+        Returns:
+            The index with every saved document added
+        """
+        import numpy as np
+
+        with np.load(path) as data:
+            num_perm, shingle_size, seed = (int(value) for value in data['params'])
+            index = cls(
+                threshold=float(data['threshold']) if threshold is None else threshold,
+                num_perm=num_perm,
+                shingle_size=shingle_size,
+                seed=seed,
+            )
+            for key, signature in zip(data['keys'].tolist(), data['signatures']):
+                index.add(key, signature)
+        return index
+
+    def _shingle_hashes(self, text: str):
+        """Distinct 32-bit hashes of the text's overlapping word n-grams"""
+        import numpy as np
+
+        words = WORD_PATTERN.findall(text.lower())
+        if not words:
+            return np.empty(0, dtype=np.uint64)
+        word_hashes = np.fromiter(
+            (zlib.crc32(word.encode('utf-8')) for word in words), dtype=np.uint64, count=len(words)
+        )
+        # Texts shorter than one shingle become a single shingle
+        size = min(self.shingle_size, len(words))
+        count = len(words) - size + 1
+        hashes = np.zeros(count, dtype=np.uint64)
+        for offset in range(size):
+            # Wraps modulo 2**64, like the scalar FNV hash it imitates
+            hashes = hashes * np.uint64(SHINGLE_MULTIPLIER) + word_hashes[offset:offset + count]
+        hashes ^= hashes >> np.uint64(33)
+        hashes *= np.uint64(MIX_MULTIPLIER)
+        hashes ^= hashes >> np.uint64(33)
+        return np.unique(hashes & np.uint64(MAX_HASH))
+
+    def _add_to_buckets(self, number: int, signature) -> None:
+        """File a document number under each band of its signature"""
+        for band, band_key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(band_key)
+            if bucket is None:
+                self._buckets[band][band_key] = number
+            elif isinstance(bucket, int):
+                if bucket != number:
+                    self._buckets[band][band_key] = [bucket, number]
+            elif number not in bucket:
+                bucket.append(number)
+
+    def _band_keys(self, signature) -> List[bytes]:
+        """Bucket key of each band of a signature"""
+        data = signature.tobytes()
+        width = self.rows * signature.itemsize
+        return [data[band * width:(band + 1) * width] for band in range(self.bands)]
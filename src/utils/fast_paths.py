@@ -0,0 +1,360 @@
+"""
+Lightweight converters for plain text and simple HTML
+
+These bypass MarkItDown entirely: text is decoded and normalized in a
+single streaming pass, and HTML is tokenized incrementally with the
+standard library parser and rendered straight to Markdown. Nothing beyond
+the standard library is imported, so bulk ingest of small text files
+avoids MarkItDown's per-call overhead.
+"""
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+from html.parser import HTMLParser
+import codecs
+import re
+
+# Constants
+READ_CHUNK_SIZE = 64 * 1024
+DETECT_BYTES = 64 * 1024  # Bytes examined to choose an encoding
+FALLBACK_ENCODING = 'cp1252'
+META_CHARSET_PATTERN = re.compile(rb'<meta[^>]+charset=["\']?([A-Za-z0-9_.:-]+)', re.IGNORECASE)
+CONTROL_CHARS_PATTERN = re.compile(r'[\x00-\x08\x0b\x0e-\x1f\x7f]')
+WHITESPACE_PATTERN = re.compile(r'\s+')
+
+def detect_encoding(head: bytes, html: bool = False) -> str:
+    """
+    Choose the encoding of a file from its first bytes
+
+    A byte order mark wins, then (for HTML) a <meta charset>, then UTF-8 if
+    the bytes decode cleanly, and cp1252 otherwise.
+
+    Args:
+        head: Leading bytes of the file (DETECT_BYTES is enough)
+        html: Whether to look for a <meta charset> declaration
+
+    Returns:
+        Python codec name
+    """
+    for bom, encoding in (
+        (codecs.BOM_UTF8, 'utf-8-sig'),
+        (codecs.BOM_UTF16_LE, 'utf-16'),
+        (codecs.BOM_UTF16_BE, 'utf-16'),
+    ):
+        if head.startswith(bom):
+            return encoding
+    if html:
+        match = META_CHARSET_PATTERN.search(head[:4096])
+        if match:
+            try:
+                return codecs.lookup(match.group(1).decode('ascii')).name
+            except LookupError:
+                pass
+    try:
+        # final=False tolerates a character cut off at the end of the window
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return FALLBACK_ENCODING
+
+def iter_decoded(file_path: Union[str, Path], html: bool = False) -> Iterator[str]:
+    """
+    Decode a file chunk by chunk with a detected encoding
+
+    Args:
+        file_path: Path to the file
+        html: Whether to honour a <meta charset> declaration
+
+    Yields:
+        Decoded text chunks
+    """
+    with open(file_path, 'rb') as f:
+        head = f.read(DETECT_BYTES)
+        decoder = codecs.getincrementaldecoder(detect_encoding(head, html))(errors='replace')
+        chunk = head
+        while chunk:
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+            chunk = f.read(READ_CHUNK_SIZE)
+        tail = decoder.decode(b'', final=True)
+        if tail:
+            yield tail
+
+def iter_text(file_path: Union[str, Path], **options) -> Iterator[str]:
+    """
+    Yield a plain text file as Markdown, normalized in one pass
+
+    Line endings become \\n and stray control characters are dropped;
+    the text is otherwise passed through unchanged.
+
+    Args:
+        file_path: Path to the text file
+
+    Yields:
+        Normalized text chunks
+    """
+    pending_cr = False
+    for text in iter_decoded(file_path):
+        if pending_cr:
+            text = '\r' + text
+        # A \r at the end of a chunk may be the first half of \r\n
+        pending_cr = text.endswith('\r')
+        if pending_cr:
+            text = text[:-1]
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
+        yield CONTROL_CHARS_PATTERN.sub('', text)
+    if pending_cr:
+        yield '\n'
+
+class HtmlToMarkdown(HTMLParser):
+    """Incremental HTML tokenizer that renders common elements as Markdown"""
+
+    BLOCK_TAGS = frozenset({
+        'p', 'div', 'section', 'article', 'header', 'footer', 'main', 'nav',
+        'aside', 'figure', 'figcaption', 'table', 'ul', 'ol', 'dl', 'form',
+    })
+    SKIP_TAGS = frozenset({'script', 'style', 'noscript', 'template', 'svg', 'head'})
+    EMPHASIS = {'strong': '**', 'b': '**', 'em': '*', 'i': '*', 'del': '~~', 's': '~~'}
+
+    def __init__(self):
+        """Initialize the renderer"""
+        super().__init__(convert_charrefs=True)
+        self.title: Optional[str] = None
+        self._out: List[str] = []
+        self._skip = 0
+        self._pre = 0
+        self._in_title = False
+        self._title_parts: List[str] = []
+        self._lists: List[List] = []  # [tag, next item number]
+        self._quote = 0
+        self._links: List[Optional[str]] = []
+        self._row: Optional[List[str]] = None
+        self._cell: Optional[List[str]] = None
+        self._rows_in_table = 0
+        self._at_line_start = True
+        self._blank_line = False
+        self._started = False
+
+    def pop_markdown(self) -> str:
+        """Return and clear the Markdown rendered so far"""
+        text = ''.join(self._out)
+        self._out.clear()
+        return text
+
+    def _emit(self, text: str) -> None:
+        """Append raw text to the output"""
+        self._out.append(text)
+        self._started = True
+        self._at_line_start = text.endswith('\n')
+
+    def _write(self, text: str) -> None:
+        """Append text to the current cell or the output"""
+        if not text:
+            return
+        if self._cell is not None:
+            self._cell.append(text)
+            return
+        if self._quote and self._at_line_start:
+            text = '> ' * self._quote + text
+        self._emit(text)
+        self._blank_line = False
+
+    def _block_break(self) -> None:
+        """End the current block with a single blank line"""
+        if self._cell is not None:
+            self._cell.append(' ')
+            return
+        if not self._started:
+            return
+        if not self._at_line_start:
+            self._emit('\n')
+        if not self._blank_line:
+            self._emit('> ' * self._quote + '\n' if self._quote else '\n')
+            self._blank_line = True
+
+    def handle_starttag(self, tag, attrs):
+        """Open an element"""
+        if tag in self.SKIP_TAGS:
+            self._skip += 1
+            return
+        if tag == 'title':
+            self._in_title = True
+            return
+        if self._skip:
+            return
+        attrs = dict(attrs)
+        if tag in ('h1', 'h2', 'h3', 'h4', 'h5', 'h6'):
+            self._block_break()
+            self._write('#' * int(tag[1]) + ' ')
+        elif tag in self.BLOCK_TAGS:
+            if tag in ('ul', 'ol'):
+                self._lists.append([tag, 1])
+            if tag == 'table':
+                self._rows_in_table = 0
+            if not self._lists or tag in ('ul', 'ol') and len(self._lists) == 1:
+                self._block_break()
+        elif tag == 'li':
+            if not self._at_line_start:
+                self._write('\n')
+            indent = '  ' * max(0, len(self._lists) - 1)
+            if self._lists and self._lists[-1][0] == 'ol':
+                self._write(f"{indent}{self._lists[-1][1]}. ")
+                self._lists[-1][1] += 1
+            else:
+                self._write(f"{indent}- ")
+        elif tag == 'br':
+            self._write('  \n' if self._cell is None else ' ')
+        elif tag == 'hr':
+            self._block_break()
+            self._write('---\n')
+        elif tag == 'blockquote':
+            self._block_break()
+            self._quote += 1
+        elif tag == 'pre':
+            self._block_break()
+            self._write('```\n')
+            self._pre += 1
+        elif tag == 'code' and not self._pre:
+            self._write('`')
+        elif tag in self.EMPHASIS:
+            self._write(self.EMPHASIS[tag])
+        elif tag == 'a':
+            href = attrs.get('href')
+            self._links.append(href)
+            if href:
+                self._write('[')
+        elif tag == 'img':
+            alt = (attrs.get('alt') or '').replace(']', '')
+            if attrs.get('src'):
+                self._write(f"![{alt}]({attrs['src']})")
+        elif tag == 'tr':
+            self._row = []
+        elif tag in ('td', 'th') and self._row is not None:
+            self._cell = []
+
+    def handle_endtag(self, tag):
+        """Close an element"""
+        if tag in self.SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+            return
+        if tag == 'title':
+            self._in_title = False
+            self.title = WHITESPACE_PATTERN.sub(' ', ''.join(self._title_parts)).strip() or None
+            return
+        if self._skip:
+            return
+        if tag in ('h1', 'h2', 'h3', 'h4', 'h5', 'h6'):
+            self._write('\n')
+            self._block_break()
+        elif tag in self.BLOCK_TAGS:
+            if tag in ('ul', 'ol') and self._lists:
+                self._lists.pop()
+            if not self._lists:
+                self._block_break()
+        elif tag == 'blockquote':
+            self._quote = max(0, self._quote - 1)
+            # The blank line inside the quote does not separate it from what follows
+            self._blank_line = False
+            self._block_break()
+        elif tag == 'pre':
+            self._pre = max(0, self._pre - 1)
+            if not self._at_line_start:
+                self._write('\n')
+            self._write('```\n')
+            self._block_break()
+        elif tag == 'code' and not self._pre:
+            self._write('`')
+        elif tag in self.EMPHASIS:
+            self._write(self.EMPHASIS[tag])
+        elif tag == 'a':
+            href = self._links.pop() if self._links else None
+            if href:
+                self._write(f"]({href})")
+        elif tag in ('td', 'th') and self._cell is not None:
+            text = WHITESPACE_PATTERN.sub(' ', ''.join(self._cell)).strip().replace('|', '\\|')
+            self._row.append(text)
+            self._cell = None
+        elif tag == 'tr' and self._row is not None:
+            row, self._row = self._row, None
+            if row:
+                self._write('| ' + ' | '.join(row) + ' |\n')
+                if self._rows_in_table == 0:
+                    self._write('| ' + ' | '.join(['---'] * len(row)) + ' |\n')
+                self._rows_in_table += 1
+
+    def handle_data(self, data):
+        """Render text content"""
+        if self._in_title:
+            self._title_parts.append(data)
+            return
+        if self._skip:
+            return
+        if self._pre:
+            self._write(data)
+            return
+        text = WHITESPACE_PATTERN.sub(' ', data)
+        if self._at_line_start and self._cell is None:
+            text = text.lstrip()
+        self._write(text)
+
+def iter_html(file_path: Union[str, Path], **options) -> Iterator[str]:
+    """
+    Yield the Markdown of an HTML file while it is being tokenized
+
+    Args:
+        file_path: Path to the HTML file
+
+    Yields:
+        Markdown chunks in document order
+    """
+    yield from _feed_html(HtmlToMarkdown(), file_path)
+
+def _feed_html(parser: HtmlToMarkdown, file_path: Union[str, Path]) -> Iterator[str]:
+    """Feed a file through a parser, yielding Markdown as it is rendered"""
+    for text in iter_decoded(file_path, html=True):
+        parser.feed(text)
+        markdown = parser.pop_markdown()
+        if markdown:
+            yield markdown
+    parser.close()
+    markdown = parser.pop_markdown()
+    if markdown:
+        yield markdown
+
+def convert_html(file_path: Union[str, Path]) -> Tuple[str, Optional[str]]:
+    """
+    Convert an HTML file to Markdown
+
+    Args:
+        file_path: Path to the HTML file
+
+    Returns:
+        Tuple of (markdown, title)
+    """
+    parser = HtmlToMarkdown()
+    markdown = ''.join(_feed_html(parser, file_path))
+    return markdown, parser.title
+
+def convert_text(file_path: Union[str, Path]) -> Tuple[str, Optional[str]]:
+    """
+    Convert a plain text file to Markdown
+
+    Args:
+        file_path: Path to the text file
+
+    Returns:
+        Tuple of (markdown, title); plain text has no title
+    """
+    return ''.join(iter_text(file_path)), None
+
+# Format -> function returning (markdown, title) without MarkItDown
+FAST_CONVERTERS: Dict[str, Callable[[Union[str, Path]], Tuple[str, Optional[str]]]] = {
+    'txt': convert_text,
+    'html': convert_html,
+}
+
+# Format -> function yielding Markdown pieces without MarkItDown
+FAST_STREAMING_CONVERTERS: Dict[str, Callable[..., Iterator[str]]] = {
+    'txt': iter_text,
+    'html': iter_html,
+}
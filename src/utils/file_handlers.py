@@ -2,14 +2,21 @@
 File handling utilities for MarkItDown Web
 """
 from pathlib import Path
-from typing import Union, BinaryIO, Optional
+from typing import Union, BinaryIO, Optional, Iterable
 import tempfile
+import hashlib
 import os
 import shutil
 
+HASH_CHUNK_SIZE = 1024 * 1024  # 1MB
+
 def save_uploaded_file(uploaded_file: BinaryIO, temp_dir: Union[str, Path]) -> Optional[Path]:
     """
-    Save an uploaded file to a temporary directory
+    Spool an uploaded file to a temporary directory
+    
+    The file is stored under its content hash and written in chunks straight
+    from the upload buffer. If the same bytes were already spooled, the
+    existing file is reused without writing anything.
     
     Args:
         uploaded_file: The uploaded file object
@@ -21,15 +28,155 @@ def save_uploaded_file(uploaded_file: BinaryIO, temp_dir: Union[str, Path]) -> O
     try:
         temp_dir = Path(temp_dir)
         temp_dir.mkdir(parents=True, exist_ok=True)
+        file_name = Path(uploaded_file.name).name
         
-        temp_path = temp_dir / uploaded_file.name
-        with open(temp_path, "wb") as f:
-            f.write(uploaded_file.getbuffer())
-        return temp_path
+        if hasattr(uploaded_file, "getbuffer"):
+            # In-memory uploads: hash and write slices of the buffer without copying it
+            with uploaded_file.getbuffer() as view:
+                temp_path = temp_dir / compute_buffer_hash(view) / file_name
+                if not is_spooled(temp_path, view.nbytes):
+                    _write_atomic(
+                        temp_path,
+                        (view[offset:offset + HASH_CHUNK_SIZE] for offset in range(0, view.nbytes, HASH_CHUNK_SIZE))
+                    )
+            return temp_path
+        
+        # Other file objects can only be read once: hash while writing
+        uploaded_file.seek(0)
+        return spool_stream(uploaded_file, file_name, temp_dir)
     except Exception as e:
         print(f"Error saving file: {e}")
         return None
 
+def spool_stream(
+    stream: BinaryIO,
+    file_name: str,
+    temp_dir: Union[str, Path],
+    length: Optional[int] = None
+) -> Path:
+    """
+    Spool a read-once stream (e.g. a request body) to disk in chunks
+    
+    The stream is hashed while it is written and the file is then moved to
+    <temp_dir>/<hash>/<file_name>, reusing an existing copy of the same bytes.
+    
+    Args:
+        stream: Binary stream to read from
+        file_name: Name for the spooled file
+        temp_dir: Directory to save the file in
+        length: Number of bytes to read, or None to read until EOF
+        
+    Returns:
+        Path to the spooled file
+        
+    Raises:
+        OSError: If the stream ends before length bytes were read
+    """
+    temp_dir = Path(temp_dir)
+    temp_dir.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.blake2b(digest_size=32)
+    remaining = length
+    
+    fd, part_path = tempfile.mkstemp(dir=temp_dir, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            while remaining is None or remaining > 0:
+                size = HASH_CHUNK_SIZE if remaining is None else min(HASH_CHUNK_SIZE, remaining)
+                chunk = stream.read(size)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                f.write(chunk)
+                if remaining is not None:
+                    remaining -= len(chunk)
+        if remaining:
+            raise OSError(f"Stream ended {remaining} bytes early")
+        
+        temp_path = temp_dir / digest.hexdigest() / Path(file_name).name
+        if is_spooled(temp_path, os.path.getsize(part_path)):
+            os.unlink(part_path)
+        else:
+            temp_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(part_path, temp_path)
+        return temp_path
+    except BaseException:
+        if os.path.exists(part_path):
+            os.unlink(part_path)
+        raise
+
+def is_spooled(file_path: Union[str, Path], size: int) -> bool:
+    """
+    Check whether a file has already been spooled completely
+    
+    Args:
+        file_path: Expected location of the spooled file
+        size: Expected size in bytes
+        
+    Returns:
+        True if the file exists with the expected size
+    """
+    try:
+        return Path(file_path).stat().st_size == size
+    except OSError:
+        return False
+
+def _write_atomic(file_path: Path, chunks: Iterable[bytes]) -> None:
+    """Write chunks to a temporary file and atomically move it into place"""
+    file_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, part_path = tempfile.mkstemp(dir=file_path.parent, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in chunks:
+                f.write(chunk)
+        os.replace(part_path, file_path)
+    except BaseException:
+        os.unlink(part_path)
+        raise
+
+def compute_buffer_hash(buffer) -> str:
+    """
+    Compute a content hash of an in-memory buffer without copying it
+    
+    Args:
+        buffer: Bytes-like object (bytes, bytearray or memoryview)
+        
+    Returns:
+        Hex digest of the buffer contents
+    """
+    return hashlib.blake2b(buffer, digest_size=32).hexdigest()
+
+def spooled_hash(file_path: Union[str, Path]) -> str:
+    """
+    Content hash of a file stored by save_uploaded_file or spool_stream
+    
+    Both store a file under a directory named after its hash, so the hash
+    is read from the path instead of hashing the file again. Only pass
+    paths those functions returned.
+    
+    Args:
+        file_path: Path returned by save_uploaded_file or spool_stream
+        
+    Returns:
+        Hex digest of the file contents
+    """
+    return Path(file_path).parent.name
+
+def compute_file_hash(file_path: Union[str, Path]) -> str:
+    """
+    Compute a content hash of a file without loading it into memory
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        Hex digest of the file contents
+    """
+    digest = hashlib.blake2b(digest_size=32)
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 def cleanup_temp_files(temp_dir: Union[str, Path]) -> None:
     """
     Remove temporary files from directory
@@ -0,0 +1,280 @@
+"""
+Persistent conversion history
+
+Every finished conversion is recorded in an SQLite database with its
+content hash, format, sizes, timings and output location. The database is
+shared by all sessions and threads in WAL mode, so readers paging through
+the history never block the job workers writing to it. Lookups by content
+hash and pages of a session's history are served from indexes, and the
+oldest rows are pruned once the table reaches its size limit.
+"""
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+from dataclasses import dataclass, field
+import json
+import sqlite3
+import tempfile
+import threading
+import time
+
+from .converters import ConversionResult
+from .file_handlers import compute_file_hash
+
+# Constants
+DEFAULT_HISTORY_DB = Path(tempfile.gettempdir()) / "murkdown-history.sqlite3"
+DEFAULT_MAX_ENTRIES = 100000
+DEFAULT_PAGE_SIZE = 20
+PRUNE_INTERVAL = 500  # Inserts between retention checks
+BUSY_TIMEOUT = 5.0  # Seconds a writer waits for the database lock
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversions (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    session_id TEXT,
+    file_name TEXT NOT NULL,
+    content_hash TEXT,
+    format TEXT,
+    success INTEGER NOT NULL,
+    error TEXT,
+    cached INTEGER NOT NULL DEFAULT 0,
+    input_bytes INTEGER,
+    output_bytes INTEGER,
+    seconds REAL,
+    timings TEXT,
+    output_file TEXT
+);
+CREATE INDEX IF NOT EXISTS conversions_by_hash ON conversions (content_hash, id) WHERE success = 1;
+CREATE INDEX IF NOT EXISTS conversions_by_session ON conversions (session_id, id);
+"""
+COLUMNS = (
+    "id, created_at, session_id, file_name, content_hash, format, success, error, "
+    "cached, input_bytes, output_bytes, seconds, timings, output_file"
+)
+
+@dataclass
+class HistoryEntry:
+    """Data class for one recorded conversion"""
+    id: int
+    created_at: float
+    session_id: Optional[str]
+    file_name: str
+    content_hash: Optional[str]
+    format: Optional[str]
+    success: bool
+    error: Optional[str] = None
+    cached: bool = False
+    input_bytes: Optional[int] = None
+    output_bytes: Optional[int] = None
+    seconds: Optional[float] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+    output_file: Optional[str] = None
+
+    @property
+    def output_available(self) -> bool:
+        """Whether the output file is still on disk"""
+        return self.output_file is not None and Path(self.output_file).is_file()
+
+    def to_result(self) -> ConversionResult:
+        """Rebuild the ConversionResult (without content) this entry recorded"""
+        return ConversionResult(
+            success=self.success,
+            error=self.error,
+            original_file=self.file_name,
+            output_file=self.output_file,
+            cached=self.cached,
+            detected_format=self.format,
+            input_bytes=self.input_bytes,
+            output_bytes=self.output_bytes,
+            timings=dict(self.timings),
+        )
+
+class HistoryStore:
+    """SQLite-backed record of finished conversions"""
+
+    def __init__(
+        self,
+        db_path: Union[str, Path] = DEFAULT_HISTORY_DB,
+        max_entries: Optional[int] = DEFAULT_MAX_ENTRIES,
+    ):
+        """
+        Open (and create if needed) the history database
+
+        Args:
+            db_path: SQLite database file
+            max_entries: Rows kept before the oldest are pruned (None for no limit)
+        """
+        self.db_path = Path(db_path)
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        self._inserts = 0
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connection() as connection:
+            connection.executescript(SCHEMA)
+
+    def record(
+        self,
+        result: ConversionResult,
+        session_id: Optional[str] = None,
+        content_hash: Optional[str] = None,
+    ) -> int:
+        """
+        Record a finished conversion
+
+        Args:
+            result: Result of the conversion
+            session_id: Session or client that asked for it
+            content_hash: Hash of the input (see file_handlers.compute_file_hash);
+                computed from the input file when omitted and it still exists
+
+        Returns:
+            ID of the new entry
+        """
+        if content_hash is None and result.original_file:
+            try:
+                content_hash = compute_file_hash(result.original_file)
+            except OSError:
+                pass
+        with self._connection() as connection:
+            cursor = connection.execute(
+                "INSERT INTO conversions (created_at, session_id, file_name, content_hash, format, success, "
+                "error, cached, input_bytes, output_bytes, seconds, timings, output_file) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    time.time(),
+                    session_id,
+                    Path(result.original_file or "").name,
+                    content_hash,
+                    result.detected_format,
+                    int(result.success),
+                    result.error,
+                    int(result.cached),
+                    result.input_bytes,
+                    result.output_bytes,
+                    result.timings.get('total'),
+                    json.dumps(result.timings) if result.timings else None,
+                    result.output_file,
+                ),
+            )
+            entry_id = cursor.lastrowid
+        with self._lock:
+            self._inserts += 1
+            prune = self._inserts % PRUNE_INTERVAL == 0
+        if prune and self.max_entries is not None:
+            self.prune(self.max_entries)
+        return entry_id
+
+    def find(self, content_hash: str) -> Optional[HistoryEntry]:
+        """
+        Most recent successful conversion of exactly these bytes
+
+        A single probe of the content-hash index, however long the history.
+
+        Args:
+            content_hash: Hash of the input file
+
+        Returns:
+            The entry, or None if the file was never converted successfully
+        """
+        row = self._connection().execute(
+            f"SELECT {COLUMNS} FROM conversions WHERE content_hash = ? AND success = 1 ORDER BY id DESC LIMIT 1",
+            (content_hash,),
+        ).fetchone()
+        return _entry(row) if row is not None else None
+
+    def page(
+        self,
+        session_id: Optional[str] = None,
+        page: int = 0,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> List[HistoryEntry]:
+        """
+        One page of the history, newest first
+
+        Args:
+            session_id: Only entries of this session (None for all sessions)
+            page: Zero-based page number
+            page_size: Entries per page
+
+        Returns:
+            Up to page_size entries
+        """
+        where, params = ("WHERE session_id = ?", [session_id]) if session_id is not None else ("", [])
+        rows = self._connection().execute(
+            f"SELECT {COLUMNS} FROM conversions {where} ORDER BY id DESC LIMIT ? OFFSET ?",
+            (*params, page_size, page * page_size),
+        ).fetchall()
+        return [_entry(row) for row in rows]
+
+    def count(self, session_id: Optional[str] = None) -> int:
+        """Number of entries, optionally of one session"""
+        if session_id is None:
+            return self._connection().execute("SELECT COUNT(*) FROM conversions").fetchone()[0]
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM conversions WHERE session_id = ?", (session_id,)
+        ).fetchone()[0]
+
+    def prune(self, max_entries: int) -> int:
+        """
+        Delete the oldest entries beyond max_entries
+
+        Returns:
+            Number of entries deleted
+        """
+        with self._connection() as connection:
+            cursor = connection.execute(
+                "DELETE FROM conversions WHERE id <= "
+                "(SELECT id FROM conversions ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                (max_entries,),
+            )
+            return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the connections of every thread"""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        """This thread's connection, opened on first use"""
+        connection = getattr(self._local, 'connection', None)
+        if connection is None:
+            # Only the owning thread uses it; close() may run on another
+            connection = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+            # Readers and the writer do not block each other in WAL mode
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            with self._lock:
+                self._connections.append(connection)
+        return connection
+
+def _entry(row: tuple) -> HistoryEntry:
+    """Build an entry from a row selected with COLUMNS"""
+    values: Dict[str, Any] = dict(zip((name.strip() for name in COLUMNS.split(",")), row))
+    values['success'] = bool(values['success'])
+    values['cached'] = bool(values['cached'])
+    values['timings'] = json.loads(values['timings']) if values['timings'] else {}
+    return HistoryEntry(**values)
+
+_shared_history: Optional[HistoryStore] = None
+_shared_history_lock = threading.Lock()
+
+def get_shared_history() -> HistoryStore:
+    """
+    Get the process-wide history store, creating it on first use
+
+    The database lives in the system temp directory with the default
+    retention.
+
+    Returns:
+        The shared HistoryStore
+    """
+    global _shared_history
+    with _shared_history_lock:
+        if _shared_history is None:
+            _shared_history = HistoryStore()
+        return _shared_history
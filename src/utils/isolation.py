@@ -0,0 +1,377 @@
+"""
+Conversions in isolated worker processes
+
+MarkItDown runs third-party parsers that can hang or balloon on a bad
+file. IsolatedConverter runs each conversion in a long-lived child
+process, enforces a wall-clock timeout and a resident-memory ceiling from
+the parent, and kills and replaces the child when either is exceeded, so
+one pathological document cannot take the calling process down with it.
+"""
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+from multiprocessing import get_context
+import mmap
+import os
+import signal
+import time
+
+from .converters import MarkdownConverter, ConversionResult, STREAM_CACHE_LIMIT
+from .cache import ConversionCache, CachedConversion
+from .metrics import StageTimer, record_conversion
+from .streaming import StreamProgress
+from .sniff import normalize_format
+
+# Constants
+DEFAULT_TIMEOUT = 300.0  # seconds
+DEFAULT_MAX_RSS = 2 * 1024 * 1024 * 1024  # 2GB
+DEFAULT_MAX_TASKS = 200  # Conversions before a worker is replaced
+POLL_INTERVAL = 0.1  # seconds between liveness and memory checks
+
+# Values of ConversionResult.limit_exceeded
+LIMIT_TIMEOUT = 'timeout'
+LIMIT_MEMORY = 'memory'
+LIMIT_CRASH = 'crash'
+
+def process_rss(pid: int) -> Optional[int]:
+    """
+    Resident set size of a process in bytes
+
+    Reads /proc on Linux and falls back to psutil when it is installed.
+
+    Args:
+        pid: Process id
+
+    Returns:
+        RSS in bytes, or None if it cannot be measured
+    """
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * mmap.PAGESIZE
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss
+    except Exception:
+        return None
+
+class IsolatedConverter:
+    """MarkdownConverter front end that converts in a supervised child process"""
+
+    def __init__(
+        self,
+        cache: Optional[ConversionCache] = None,
+        fast_paths: bool = False,
+        ocr: bool = False,
+        audio_backend: Optional[str] = None,
+        compact: bool = False,
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+        max_rss_bytes: Optional[int] = DEFAULT_MAX_RSS,
+        max_tasks: Optional[int] = DEFAULT_MAX_TASKS,
+    ):
+        """
+        Initialize the converter; the child process starts on first use
+
+        Args:
+            cache: Cache consulted in this process, so hits never reach the child
+            fast_paths: Use the lightweight text/HTML converters in the child
+            ocr: Recognize text in images and scanned PDF pages in the child
+            audio_backend: Offline recognizer for transcribing audio in the child
+            compact: Compact the markdown in the child (see compaction)
+            timeout: Wall-clock seconds per conversion (None for no limit)
+            max_rss_bytes: Resident memory ceiling of the child (None for no limit)
+            max_tasks: Conversions before the child is replaced (None for never)
+        """
+        # Used for validation, cache handling and metrics in this process
+        self._local = MarkdownConverter(
+            cache=cache, fast_paths=fast_paths, ocr=ocr, audio_backend=audio_backend, compact=compact
+        )
+        self.timeout = timeout
+        self.max_rss_bytes = max_rss_bytes
+        self.max_tasks = max_tasks
+        # Children replaced after hitting a limit or crashing
+        self.restarts = 0
+        self._process = None
+        self._conn = None
+        self._tasks = 0
+
+    @property
+    def cache(self) -> Optional[ConversionCache]:
+        """Conversion cache used by this converter, if any"""
+        return self._local.cache
+
+    @property
+    def fast_paths(self) -> bool:
+        """Whether the child uses the lightweight text/HTML converters"""
+        return self._local.fast_paths
+
+    @property
+    def ocr(self) -> bool:
+        """Whether the child recognizes text in images and scanned pages"""
+        return self._local.ocr
+
+    @property
+    def audio_backend(self) -> Optional[str]:
+        """Offline recognizer the child transcribes audio with, if any"""
+        return self._local.audio_backend
+
+    @property
+    def compact(self) -> bool:
+        """Whether the child compacts the markdown"""
+        return self._local.compact
+
+    def warm_up(self) -> None:
+        """Start the child process and load MarkItDown in it now"""
+        self._ensure_worker()
+
+    def validate_file(self, file_path: Union[str, Path]) -> Tuple[bool, Optional[str]]:
+        """Validate file before conversion (see MarkdownConverter.validate_file)"""
+        return self._local.validate_file(file_path)
+
+    def convert_file(
+        self,
+        file_path: Union[str, Path],
+        output_dir: Optional[Union[str, Path]] = None,
+        **options
+    ) -> ConversionResult:
+        """
+        Convert file to markdown in the child process
+
+        Args:
+            file_path: Path to the input file
+            output_dir: Directory for the .md file (defaults to the input's directory)
+            **options: Additional conversion options
+
+        Returns:
+            ConversionResult object; limit_exceeded is set if the child was killed
+        """
+        return self._run('convert_file', Path(file_path), output_dir, None, options)
+
+    def convert_file_streaming(
+        self,
+        file_path: Union[str, Path],
+        output_dir: Optional[Union[str, Path]] = None,
+        on_progress: Optional[Callable[[StreamProgress], None]] = None,
+        **options
+    ) -> ConversionResult:
+        """
+        Convert file to markdown incrementally in the child process
+
+        Progress reported by the child is relayed to on_progress here.
+
+        Args:
+            file_path: Path to the input file
+            output_dir: Directory for the .md file (defaults to the input's directory)
+            on_progress: Callback invoked after each piece is written
+            **options: Additional conversion options
+
+        Returns:
+            ConversionResult object; limit_exceeded is set if the child was killed
+        """
+        return self._run('convert_file_streaming', Path(file_path), output_dir, on_progress, options)
+
+    def close(self) -> None:
+        """Stop the child process"""
+        if self._process is None:
+            return
+        try:
+            self._conn.send(None)
+            self._process.join(timeout=1)
+        except (OSError, ValueError):
+            pass
+        self._kill()
+
+    def _run(
+        self,
+        method: str,
+        file_path: Path,
+        output_dir: Optional[Union[str, Path]],
+        on_progress: Optional[Callable[[StreamProgress], None]],
+        options: Dict[str, Any]
+    ) -> ConversionResult:
+        """Validate and serve cache hits locally, convert misses in the child"""
+        local = self._local
+        timer = StageTimer()
+        streamed = method == 'convert_file_streaming'
+
+        with timer.stage('validate'):
+            is_valid, error = local.validate_file(file_path)
+        if not is_valid:
+            return local._finish(ConversionResult(
+                success=False,
+                error=error,
+                original_file=str(file_path)
+            ), timer)
+
+        try:
+            cache_key, converted = None, None
+            if local.cache is not None:
+                with timer.stage('cache_lookup'):
+                    key_options = local._key_options(normalize_format(file_path.suffix[1:]), options, streamed)
+                    cache_key, converted = local._lookup_cache(file_path, key_options)
+            if converted is not None:
+                with timer.stage('write'):
+                    result = local._save_output(file_path, converted, output_dir)
+                result.cached = True
+                result.input_bytes = file_path.stat().st_size
+                if on_progress is not None:
+                    on_progress(StreamProgress(index=0, total=1, output_file=result.output_file, text=converted.content))
+                if streamed:
+                    result.content = None
+                return local._finish(result, timer)
+        except Exception as e:
+            return local._finish(ConversionResult(
+                success=False,
+                error=str(e),
+                original_file=str(file_path)
+            ), timer)
+
+        result, limit = self._call(method, file_path, output_dir, on_progress, options)
+        if limit is not None:
+            self.restarts += 1
+            return local._finish(ConversionResult(
+                success=False,
+                error=self._limit_message(limit),
+                original_file=str(file_path),
+                limit_exceeded=limit
+            ), timer)
+
+        if result.success and cache_key is not None:
+            content = result.content
+            if content is None and result.output_bytes <= STREAM_CACHE_LIMIT:
+                content = Path(result.output_file).read_text(encoding='utf-8')
+            if content is not None:
+                local.cache.put(cache_key, CachedConversion(content=content, title=result.title))
+        # The child records into its own registry; count the result here too
+        record_conversion(result)
+        return result
+
+    def _call(
+        self,
+        method: str,
+        file_path: Path,
+        output_dir: Optional[Union[str, Path]],
+        on_progress: Optional[Callable[[StreamProgress], None]],
+        options: Dict[str, Any]
+    ) -> Tuple[Optional[ConversionResult], Optional[str]]:
+        """
+        Run one conversion in the child while enforcing the limits
+
+        Returns:
+            Tuple of (result, limit) where limit names the limit that was hit
+        """
+        self._ensure_worker()
+        deadline = time.monotonic() + self.timeout if self.timeout else None
+        try:
+            self._conn.send((method, str(file_path), output_dir, options))
+        except (OSError, ValueError):
+            self._kill()
+            return None, LIMIT_CRASH
+
+        while True:
+            wait = POLL_INTERVAL
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+                if wait <= 0:
+                    self._kill()
+                    return None, LIMIT_TIMEOUT
+            if self._conn.poll(wait):
+                try:
+                    kind, payload = self._conn.recv()
+                except (EOFError, OSError):
+                    self._kill()
+                    return None, LIMIT_CRASH
+                if kind == 'progress':
+                    if on_progress is not None:
+                        on_progress(payload)
+                    continue
+                self._tasks += 1
+                if self.max_tasks and self._tasks >= self.max_tasks:
+                    # Recycle before slow leaks in the parsers add up
+                    self.close()
+                return payload, None
+            if not self._process.is_alive():
+                # e.g. killed by the kernel's OOM killer
+                self._kill()
+                return None, LIMIT_CRASH
+            if self.max_rss_bytes:
+                rss = process_rss(self._process.pid)
+                if rss is not None and rss > self.max_rss_bytes:
+                    self._kill()
+                    return None, LIMIT_MEMORY
+
+    def _limit_message(self, limit: str) -> str:
+        """Describe a limit that stopped a conversion"""
+        if limit == LIMIT_TIMEOUT:
+            return f"Conversion exceeded the {self.timeout:g}s time limit and was stopped"
+        if limit == LIMIT_MEMORY:
+            return f"Conversion exceeded the {self.max_rss_bytes / 1024 / 1024:.0f}MB memory limit and was stopped"
+        return "Conversion worker exited unexpectedly"
+
+    def _ensure_worker(self) -> None:
+        """Start the child process if it is not running"""
+        if self._process is not None and self._process.is_alive():
+            return
+        if self._process is not None:
+            self._kill()
+        # Spawn, not fork: the parent is multi-threaded (Streamlit, job workers)
+        context = get_context('spawn')
+        parent_conn, child_conn = context.Pipe()
+        self._process = context.Process(
+            target=_worker_main,
+            args=(child_conn, self.fast_paths, self.ocr, self.audio_backend, self.compact),
+            name="murkdown-converter",
+            daemon=True,
+        )
+        self._process.start()
+        child_conn.close()
+        self._conn = parent_conn
+        self._tasks = 0
+
+    def _kill(self) -> None:
+        """Kill the child (and anything it started) and forget it"""
+        process, self._process = self._process, None
+        if process is None:
+            return
+        if process.is_alive():
+            try:
+                # The child leads its own process group; take helpers down with it
+                os.killpg(process.pid, signal.SIGKILL)
+            except (AttributeError, OSError):
+                process.kill()
+        process.join(timeout=5)
+        self._conn.close()
+        self._conn = None
+
+def _worker_main(conn, fast_paths: bool, ocr: bool, audio_backend: Optional[str], compact: bool) -> None:
+    """Child process loop: convert requests from the pipe until told to stop"""
+    if hasattr(os, 'setpgrp'):
+        os.setpgrp()
+    converter = MarkdownConverter(fast_paths=fast_paths, ocr=ocr, audio_backend=audio_backend, compact=compact)
+    try:
+        converter.warm_up()
+    except Exception:
+        # Reported by the first conversion that needs MarkItDown
+        pass
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            break
+        if message is None:
+            break
+        method, file_path, output_dir, options = message
+        try:
+            if method == 'convert_file_streaming':
+                result = converter.convert_file_streaming(
+                    file_path,
+                    output_dir=output_dir,
+                    on_progress=lambda progress: conn.send(('progress', progress)),
+                    **options
+                )
+            else:
+                result = converter.convert_file(file_path, output_dir=output_dir, **options)
+        except Exception as e:
+            result = ConversionResult(success=False, error=str(e), original_file=file_path)
+        conn.send(('result', result))
@@ -0,0 +1,290 @@
+"""
+Background conversion jobs for MarkItDown Web
+"""
+from pathlib import Path
+from typing import Optional, Dict, Any, Union, List
+from dataclasses import dataclass, field
+from enum import Enum
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+from .converters import ConversionResult
+from .history import HistoryStore
+from .metrics import REGISTRY
+from .pool import ConverterPool
+from .scheduler import DEFAULT_MAX_WAIT, FairScheduler, estimate_cost
+from .spool import SpoolManager
+from .streaming import StreamProgress
+
+# Constants
+DEFAULT_MAX_WORKERS = min(4, os.cpu_count() or 1)
+DEFAULT_JOB_RETENTION = 60 * 60  # Keep finished jobs for an hour
+
+class JobStatus(str, Enum):
+    """Lifecycle states of a conversion job"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+
+class QueueFullError(RuntimeError):
+    """Raised when a job is submitted while the queue is at capacity"""
+
+@dataclass
+class Job:
+    """Data class for a conversion job"""
+    job_id: str
+    file_path: str
+    options: Dict[str, Any] = field(default_factory=dict)
+    stream: bool = False
+    client_id: Optional[str] = None
+    content_hash: Optional[str] = None
+    cost: float = 0.0  # Estimated seconds of worker time, see scheduler.estimate_cost
+    status: JobStatus = JobStatus.QUEUED
+    result: Optional[ConversionResult] = None
+    progress: Optional[float] = None
+    pieces_done: int = 0
+    output_file: Optional[str] = None
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        """Whether the job has finished (successfully or not)"""
+        return self.status == JobStatus.DONE
+
+    @property
+    def queue_wait(self) -> float:
+        """Seconds spent waiting for a worker"""
+        end = self.started_at if self.started_at is not None else time.time()
+        return end - self.submitted_at
+
+    @property
+    def run_time(self) -> float:
+        """Seconds spent converting so far"""
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.time()
+        return end - self.started_at
+
+class JobManager:
+    """Runs conversions on a shared pool of background worker threads"""
+
+    def __init__(
+        self,
+        pool: Optional[ConverterPool] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_pending: Optional[int] = None,
+        retention: float = DEFAULT_JOB_RETENTION,
+        keep_content: bool = True,
+        spool: Optional[SpoolManager] = None,
+        history: Optional[HistoryStore] = None,
+        max_wait: Optional[float] = DEFAULT_MAX_WAIT,
+    ):
+        """
+        Initialize the job manager
+
+        Args:
+            pool: Converter pool the workers check converters out of
+                (defaults to a private pool with one converter per worker)
+            max_workers: Number of worker threads
+            max_pending: Maximum number of queued jobs, or None for no limit
+            retention: Seconds to keep finished jobs before forgetting them
+            keep_content: Keep the markdown in job results; when False only
+                the output file on disk holds it
+            spool: Spool the input files live in; each is held there from
+                submission until its job finishes, so it is never reaped early
+            history: Store every finished job is recorded in
+            max_wait: Seconds a queued job may be overtaken by cheaper jobs
+                before it runs next (None to let cheaper jobs always go first)
+        """
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.retention = retention
+        self.keep_content = keep_content
+        self.spool = spool
+        self.history = history
+        self.pool = pool if pool is not None else ConverterPool(size=max_workers, warm=False)
+        # Cheapest first within a client, fair shares across clients
+        self._scheduler = FairScheduler(max_wait=max_wait)
+        self._jobs: Dict[str, Job] = {}
+        self._finished = threading.Condition()
+        self._lock = threading.Lock()
+        self._workers: List[threading.Thread] = []
+
+        for index in range(max_workers):
+            worker = threading.Thread(
+                target=self._run_worker,
+                name=f"murkdown-job-{index}",
+                daemon=True,
+            )
+            worker.start()
+            self._workers.append(worker)
+
+    def submit(
+        self,
+        file_path: Union[str, Path],
+        stream: bool = False,
+        client_id: Optional[str] = None,
+        content_hash: Optional[str] = None,
+        **options
+    ) -> Job:
+        """
+        Queue a file for conversion
+
+        Args:
+            file_path: Path to the input file
+            stream: Use convert_file_streaming, so progress and the partial
+                output file are visible while the job runs
+            client_id: Session or client submitting the job; workers are shared
+                fairly between clients, and the job is recorded in the history under it
+            content_hash: Hash of the input if it is already known (see
+                file_handlers.spooled_hash), so the history does not hash it again
+            **options: Conversion options passed to the converter
+
+        Returns:
+            The queued Job
+
+        Raises:
+            QueueFullError: If max_pending jobs are already queued
+        """
+        job = Job(
+            job_id=uuid.uuid4().hex,
+            file_path=str(file_path),
+            options=options,
+            stream=stream,
+            client_id=client_id,
+            content_hash=content_hash,
+            cost=estimate_cost(file_path),
+        )
+        with self._lock:
+            self._prune()
+            if self.max_pending is not None and self._pending_count() >= self.max_pending:
+                raise QueueFullError(f"Conversion queue is full ({self.max_pending} jobs pending)")
+            self._jobs[job.job_id] = job
+        if self.spool is not None:
+            self.spool.hold(job.file_path)
+        self._scheduler.put(job, job.cost, client_id)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by ID, or None if it is unknown or expired"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def wait(self, job_id: str, timeout: Optional[float] = None) -> Optional[Job]:
+        """
+        Block until a job finishes
+
+        Args:
+            job_id: ID of the job
+            timeout: Maximum seconds to wait, or None to wait forever
+
+        Returns:
+            The job (check job.done), or None if it is unknown
+        """
+        job = self.get(job_id)
+        if job is None:
+            return None
+        with self._finished:
+            self._finished.wait_for(lambda: job.done, timeout)
+        return job
+
+    def queue_position(self, job_id: str) -> int:
+        """Number of queued jobs that will run before a job (0 once it is running)"""
+        job = self.get(job_id)
+        if job is None or job.status != JobStatus.QUEUED:
+            return 0
+        for position, other in enumerate(self._scheduler.order()):
+            if other is job:
+                return position
+        return 0
+
+    def pending_count(self) -> int:
+        """Number of jobs waiting for a worker"""
+        with self._lock:
+            return self._pending_count()
+
+    def stats(self) -> Dict[str, int]:
+        """Counts of jobs by status, worker capacity and jobs run early by the starvation guard"""
+        with self._lock:
+            counts = {status.value: 0 for status in JobStatus}
+            for job in self._jobs.values():
+                counts[job.status.value] += 1
+        counts["workers"] = self.max_workers
+        counts["expedited"] = self._scheduler.expedited
+        return counts
+
+    def shutdown(self) -> None:
+        """Stop the workers after the jobs already queued"""
+        self._scheduler.close()
+        for worker in self._workers:
+            worker.join()
+
+    def _pending_count(self) -> int:
+        """Number of jobs waiting for a worker (lock held)"""
+        return sum(1 for job in self._jobs.values() if job.status == JobStatus.QUEUED)
+
+    def _prune(self) -> None:
+        """Forget finished jobs past their retention (lock held)"""
+        cutoff = time.time() - self.retention
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.done and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    @staticmethod
+    def _record_progress(job: Job, progress: StreamProgress) -> None:
+        """Update a job from a streaming conversion callback"""
+        job.output_file = progress.output_file
+        job.pieces_done = progress.index + 1
+        if progress.total:
+            job.progress = min(1.0, job.pieces_done / progress.total)
+
+    def _run_worker(self) -> None:
+        """Worker loop: convert queued jobs until shutdown"""
+        while True:
+            job = self._scheduler.get()
+            if job is None:
+                return
+            job.started_at = time.time()
+            job.status = JobStatus.RUNNING
+            REGISTRY.observe('murkdown_queue_wait_seconds', 'Seconds jobs waited for a worker', job.queue_wait)
+            try:
+                with self.pool.lease() as converter:
+                    if job.stream:
+                        job.result = converter.convert_file_streaming(
+                            job.file_path,
+                            on_progress=lambda progress: self._record_progress(job, progress),
+                            **job.options
+                        )
+                    else:
+                        job.result = converter.convert_file(job.file_path, **job.options)
+            except Exception as e:
+                job.result = ConversionResult(
+                    success=False,
+                    error=str(e),
+                    original_file=job.file_path
+                )
+            if self.history is not None:
+                try:
+                    # Before the release, so the input can still be hashed
+                    self.history.record(job.result, session_id=job.client_id, content_hash=job.content_hash)
+                except sqlite3.Error:
+                    pass
+            if self.spool is not None:
+                self.spool.release(job.file_path)
+            if not self.keep_content:
+                job.result.content = None
+            if job.result.success:
+                job.output_file = job.result.output_file
+                job.progress = 1.0
+            job.finished_at = time.time()
+            with self._finished:
+                job.status = JobStatus.DONE
+                self._finished.notify_all()
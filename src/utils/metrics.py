@@ -0,0 +1,249 @@
+"""
+Conversion metrics for MarkItDown Web
+"""
+from typing import Optional, Dict, Tuple, List, Iterator
+from dataclasses import dataclass, field
+from contextlib import contextmanager
+import bisect
+import threading
+import time
+
+# Constants
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+class StageTimer:
+    """Collects wall-clock durations of named conversion stages"""
+
+    def __init__(self):
+        """Start the timer"""
+        self.started = time.perf_counter()
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Time the body of a with block as a stage
+
+        Args:
+            name: Stage name; repeated stages accumulate
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - started
+
+    def finish(self) -> Dict[str, float]:
+        """Record the total time and return all timings"""
+        self.timings['total'] = time.perf_counter() - self.started
+        return self.timings
+
+@dataclass
+class HistogramValue:
+    """Data class for one labelled histogram series"""
+    buckets: List[int]
+    sum: float = 0.0
+    count: int = 0
+
+    def quantile(self, q: float, bounds: Tuple[float, ...]) -> float:
+        """Estimate a quantile as the upper bound of the bucket holding it"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        for bound, cumulative in zip(bounds, self.buckets):
+            if cumulative >= target:
+                return bound
+        return float('inf')
+
+@dataclass
+class Metric:
+    """Data class for a counter or histogram family"""
+    name: str
+    help: str
+    kind: str
+    buckets: Tuple[float, ...] = ()
+    series: Dict[Labels, object] = field(default_factory=dict)
+
+class MetricsRegistry:
+    """Thread-safe registry of counters and latency histograms"""
+
+    def __init__(self):
+        """Initialize an empty registry"""
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, help: str, value: float = 1.0, **labels: str) -> None:
+        """
+        Increment a counter
+
+        Args:
+            name: Metric name
+            help: Description shown in the Prometheus export
+            value: Amount to add
+            **labels: Label values identifying the series
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            metric = self._metrics.setdefault(name, Metric(name, help, 'counter'))
+            metric.series[key] = metric.series.get(key, 0.0) + value
+
+    def observe(
+        self,
+        name: str,
+        help: str,
+        value: float,
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+        **labels: str
+    ) -> None:
+        """
+        Record an observation in a histogram
+
+        Args:
+            name: Metric name
+            help: Description shown in the Prometheus export
+            value: Observed value (seconds for latencies)
+            buckets: Upper bounds of the histogram buckets
+            **labels: Label values identifying the series
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            metric = self._metrics.setdefault(name, Metric(name, help, 'histogram', buckets))
+            series = metric.series.get(key)
+            if series is None:
+                series = metric.series[key] = HistogramValue(buckets=[0] * len(metric.buckets))
+            # Buckets are cumulative: every bucket at or above the value counts it
+            for index in range(bisect.bisect_left(metric.buckets, value), len(metric.buckets)):
+                series.buckets[index] += 1
+            series.sum += value
+            series.count += 1
+
+    def get(self, name: str) -> Optional[Metric]:
+        """Get a metric family by name"""
+        with self._lock:
+            return self._metrics.get(name)
+
+    def reset(self) -> None:
+        """Drop every metric"""
+        with self._lock:
+            self._metrics.clear()
+
+    def export_prometheus(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format
+
+        Returns:
+            Exposition text ending with a newline
+        """
+        lines = []
+        with self._lock:
+            for metric in sorted(self._metrics.values(), key=lambda m: m.name):
+                lines.append(f"# HELP {metric.name} {metric.help}")
+                lines.append(f"# TYPE {metric.name} {metric.kind}")
+                for labels, value in sorted(metric.series.items()):
+                    if metric.kind == 'counter':
+                        lines.append(f"{metric.name}{_format_labels(labels)} {_format_value(value)}")
+                        continue
+                    for bound, cumulative in zip(metric.buckets, value.buckets):
+                        bucket_labels = labels + (('le', _format_value(bound)),)
+                        lines.append(f"{metric.name}_bucket{_format_labels(bucket_labels)} {cumulative}")
+                    lines.append(f"{metric.name}_bucket{_format_labels(labels + (('le', '+Inf'),))} {value.count}")
+                    lines.append(f"{metric.name}_sum{_format_labels(labels)} {_format_value(value.sum)}")
+                    lines.append(f"{metric.name}_count{_format_labels(labels)} {value.count}")
+        return "\n".join(lines) + "\n"
+
+    def format_summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize conversions per format for display
+
+        Returns:
+            Mapping of format to count, errors, bytes and latency estimates
+        """
+        summary: Dict[str, Dict[str, float]] = {}
+        conversions = self.get('murkdown_conversions_total')
+        latency = self.get('murkdown_conversion_seconds')
+        input_bytes = self.get('murkdown_input_bytes_total')
+        with self._lock:
+            for labels, value in (conversions.series.items() if conversions else ()):
+                label_map = dict(labels)
+                row = summary.setdefault(label_map['format'], {'conversions': 0, 'errors': 0, 'cached': 0})
+                row['conversions'] += value
+                if label_map.get('status') == 'error':
+                    row['errors'] += value
+                if label_map.get('cached') == 'true':
+                    row['cached'] += value
+            for labels, value in (latency.series.items() if latency else ()):
+                row = summary.setdefault(dict(labels)['format'], {})
+                row['mean_s'] = value.sum / value.count if value.count else 0.0
+                row['p95_s'] = value.quantile(0.95, latency.buckets)
+            for labels, value in (input_bytes.series.items() if input_bytes else ()):
+                summary.setdefault(dict(labels)['format'], {})['input_mb'] = value / (1024 * 1024)
+        return summary
+
+def _format_labels(labels: Labels) -> str:
+    """Render label pairs as {k="v",...}"""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label_value(value)}"' for key, value in labels) + "}"
+
+def _escape_label_value(value: str) -> str:
+    """Escape backslashes, quotes and newlines in a label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_value(value: float) -> str:
+    """Render a sample value without a trailing .0 for integers"""
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+# Process-wide registry used by MarkdownConverter
+REGISTRY = MetricsRegistry()
+
+def record_conversion(result, registry: MetricsRegistry = REGISTRY) -> None:
+    """
+    Record a finished conversion in a metrics registry
+
+    Args:
+        result: ConversionResult carrying timings and byte counts
+        registry: Registry to record into (defaults to the process-wide one)
+    """
+    fmt = result.detected_format or 'unknown'
+    registry.inc(
+        'murkdown_conversions_total',
+        'Conversions by format and outcome',
+        format=fmt,
+        status='success' if result.success else 'error',
+        cached='true' if result.cached else 'false',
+    )
+    if result.input_bytes:
+        registry.inc('murkdown_input_bytes_total', 'Bytes read from input files', result.input_bytes, format=fmt)
+    if result.output_bytes:
+        registry.inc('murkdown_output_bytes_total', 'Bytes of markdown written', result.output_bytes, format=fmt)
+    if result.compaction is not None:
+        registry.inc(
+            'murkdown_compaction_saved_bytes_total',
+            'Bytes removed by markdown compaction',
+            result.compaction.bytes_saved,
+            format=fmt,
+        )
+        registry.inc(
+            'murkdown_compaction_saved_tokens_total',
+            'Estimated tokens removed by markdown compaction',
+            result.compaction.tokens_saved,
+            format=fmt,
+        )
+    if 'total' in result.timings:
+        registry.observe(
+            'murkdown_conversion_seconds',
+            'End-to-end conversion latency',
+            result.timings['total'],
+            format=fmt,
+        )
+    for stage, seconds in result.timings.items():
+        if stage != 'total':
+            registry.observe(
+                'murkdown_stage_seconds',
+                'Latency of each conversion stage',
+                seconds,
+                format=fmt,
+                stage=stage,
+            )
@@ -0,0 +1,226 @@
+"""
+OCR stage for images and scanned PDFs
+
+Pages that already carry a text layer keep it; pages without one are
+rasterized, preprocessed (grayscale, downscale, deskew) and recognized
+with Tesseract across a process pool. Results are merged back in page
+order, so a mixed PDF reads like a regular conversion with the scanned
+pages filled in.
+
+Pillow, numpy and pytesseract (plus the tesseract binary) are needed;
+pypdfium2 is used to render pages when installed, otherwise the largest
+embedded image of each scanned page is extracted with PyPDF2.
+"""
+from pathlib import Path
+from typing import Deque, Iterator, Optional, Union
+from collections import deque
+from concurrent.futures import Future
+from functools import lru_cache
+import io
+import os
+
+from .parallel import parallel_executor
+from .streaming import iter_pdf_pages
+
+# Constants
+DEFAULT_OCR_LANG = 'eng'
+MIN_TEXT_CHARS = 32  # Pages with fewer non-whitespace characters get OCR
+RENDER_DPI = 300
+MAX_OCR_SIDE = 4000  # Larger images are downscaled before recognition
+MAX_SKEW_DEGREES = 5.0
+SKEW_STEP_DEGREES = 0.5
+MIN_SKEW_DEGREES = 0.25  # Smaller corrections are not worth the resampling
+SKEW_THUMBNAIL_SIDE = 800
+IMAGE_FORMATS = frozenset({'png', 'jpg'})
+
+@lru_cache(maxsize=1)
+def ocr_available() -> bool:
+    """Whether pytesseract, Pillow and the tesseract binary are all usable"""
+    try:
+        import pytesseract
+        import PIL  # noqa: F401
+        import numpy  # noqa: F401
+        pytesseract.get_tesseract_version()
+        return True
+    except Exception:
+        return False
+
+def has_text_layer(text: str, min_chars: int = MIN_TEXT_CHARS) -> bool:
+    """Check whether extracted page text is substantial enough to skip OCR"""
+    return sum(1 for c in text if not c.isspace()) >= min_chars
+
+def estimate_skew(image) -> float:
+    """
+    Estimate the rotation of a grayscale page from its projection profile
+
+    Text lines produce sharp peaks in the row sums of dark pixels when the
+    page is level; the angle that maximizes their variance is the skew.
+
+    Args:
+        image: Grayscale PIL image
+
+    Returns:
+        Angle in degrees to rotate by to level the text
+    """
+    import numpy as np
+    from PIL import Image
+
+    thumb = image.copy()
+    thumb.thumbnail((SKEW_THUMBNAIL_SIDE, SKEW_THUMBNAIL_SIDE))
+    ink = Image.fromarray(((np.asarray(thumb) < 128) * 255).astype(np.uint8))
+
+    best_angle, best_score = 0.0, -1.0
+    for angle in np.arange(-MAX_SKEW_DEGREES, MAX_SKEW_DEGREES + SKEW_STEP_DEGREES / 2, SKEW_STEP_DEGREES):
+        profile = np.asarray(ink.rotate(float(angle), fillcolor=0), dtype=np.float32).sum(axis=1)
+        score = float(profile.var())
+        if score > best_score:
+            best_angle, best_score = float(angle), score
+    return best_angle
+
+def preprocess(image):
+    """
+    Prepare an image for recognition: grayscale, downscale, deskew
+
+    Args:
+        image: PIL image
+
+    Returns:
+        Processed grayscale PIL image
+    """
+    from PIL import Image
+
+    image = image.convert('L')
+    if max(image.size) > MAX_OCR_SIDE:
+        image.thumbnail((MAX_OCR_SIDE, MAX_OCR_SIDE), Image.LANCZOS)
+    angle = estimate_skew(image)
+    if abs(angle) >= MIN_SKEW_DEGREES:
+        image = image.rotate(angle, resample=Image.BICUBIC, expand=True, fillcolor=255)
+    return image
+
+def ocr_image_bytes(data: bytes, lang: str = DEFAULT_OCR_LANG) -> str:
+    """
+    Recognize the text of an encoded image (runs in OCR worker processes)
+
+    Args:
+        data: Image file contents (PNG, JPEG, ...)
+        lang: Tesseract language code(s), e.g. "eng+deu"
+
+    Returns:
+        Recognized text
+    """
+    import pytesseract
+    from PIL import Image
+
+    with Image.open(io.BytesIO(data)) as image:
+        return pytesseract.image_to_string(preprocess(image), lang=lang)
+
+def ocr_image_file(file_path: Union[str, Path], ocr_lang: str = DEFAULT_OCR_LANG, **options) -> str:
+    """
+    Recognize the text of an image file
+
+    Args:
+        file_path: Path to the image
+        ocr_lang: Tesseract language code(s)
+
+    Returns:
+        Recognized text
+    """
+    return ocr_image_bytes(Path(file_path).read_bytes(), ocr_lang)
+
+class _PageRasterizer:
+    """Produces an encoded image of a PDF page, rendering or extracting it"""
+
+    def __init__(self, file_path: Union[str, Path]):
+        """Open the PDF with pypdfium2 if installed, otherwise PyPDF2"""
+        self._pdfium = None
+        self._reader = None
+        try:
+            import pypdfium2
+            self._pdfium = pypdfium2.PdfDocument(str(file_path))
+        except ImportError:
+            from PyPDF2 import PdfReader
+            self._reader = PdfReader(str(file_path))
+
+    def page_image(self, index: int) -> Optional[bytes]:
+        """
+        Encoded image of one page
+
+        Args:
+            index: 0-based page number
+
+        Returns:
+            Image file contents, or None if the page has no usable image
+        """
+        if self._pdfium is not None:
+            page = self._pdfium[index]
+            try:
+                image = page.render(scale=RENDER_DPI / 72).to_pil()
+            finally:
+                page.close()
+            buffer = io.BytesIO()
+            # Fast compression: the bytes only travel to an OCR worker
+            image.save(buffer, format='PNG', compress_level=1)
+            return buffer.getvalue()
+
+        # Scanned pages are usually one full-page image; take the largest
+        images = list(self._reader.pages[index].images)
+        if not images:
+            return None
+        return max(images, key=lambda image: len(image.data)).data
+
+    def close(self) -> None:
+        """Release the document"""
+        if self._pdfium is not None:
+            self._pdfium.close()
+
+def iter_pdf_pages_ocr(
+    file_path: Union[str, Path],
+    ocr_lang: str = DEFAULT_OCR_LANG,
+    ocr_workers: Optional[int] = None,
+    **options
+) -> Iterator[str]:
+    """
+    Yield the text of a PDF page by page, OCRing pages without a text layer
+
+    Scanned pages are recognized in parallel while later pages are read;
+    at most two pages per worker are in flight, so memory stays bounded.
+
+    Args:
+        file_path: Path to the PDF
+        ocr_lang: Tesseract language code(s)
+        ocr_workers: OCR processes (defaults to the CPU count)
+
+    Yields:
+        Text of each page in order, terminated by a form feed
+    """
+    workers = ocr_workers or os.cpu_count() or 1
+    pending: Deque[Union[str, Future]] = deque()
+    rasterizer = None
+    executor = None
+    try:
+        for index, text in enumerate(iter_pdf_pages(file_path)):
+            if has_text_layer(text):
+                pending.append(text)
+            else:
+                if rasterizer is None:
+                    rasterizer = _PageRasterizer(file_path)
+                    executor = parallel_executor(workers)
+                data = rasterizer.page_image(index)
+                pending.append(executor.submit(ocr_image_bytes, data, ocr_lang) if data else text)
+
+            # Emit finished pages in order; block only when the window is full
+            while pending and (not isinstance(pending[0], Future) or pending[0].done() or len(pending) > 2 * workers):
+                yield _page_text(pending.popleft())
+        while pending:
+            yield _page_text(pending.popleft())
+    finally:
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        if rasterizer is not None:
+            rasterizer.close()
+
+def _page_text(item: Union[str, Future]) -> str:
+    """Text of a finished page, with OCR output terminated like pdfminer's"""
+    if isinstance(item, str):
+        return item
+    return item.result().strip() + "\n\f"
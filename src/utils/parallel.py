@@ -0,0 +1,57 @@
+"""
+Executor selection for CPU-parallel conversion stages
+"""
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Iterable, Iterator, Optional, Tuple
+import multiprocessing
+import os
+
+def parallel_executor(workers: Optional[int] = None) -> Executor:
+    """
+    Process pool for a parallel stage, or threads inside a daemonic process
+
+    Daemonic processes (such as isolated conversion workers) may not have
+    children. The stages that use this (OCR, speech recognition) spend most
+    of their time in native code or subprocesses, so threads still run them
+    in parallel there.
+
+    Args:
+        workers: Number of workers (defaults to the CPU count)
+
+    Returns:
+        An executor to use as a context manager
+    """
+    workers = workers or os.cpu_count() or 1
+    if multiprocessing.current_process().daemon:
+        return ThreadPoolExecutor(max_workers=workers)
+    return ProcessPoolExecutor(max_workers=workers)
+
+def ordered_map(
+    executor: Executor,
+    fn: Callable[..., Any],
+    items: Iterable[Tuple[Any, ...]],
+    window: int,
+) -> Iterator[Any]:
+    """
+    Like executor.map, but submits lazily with at most window tasks in flight
+
+    Keeps memory bounded when each task carries a large payload (audio
+    segments, page images) while still yielding results in input order.
+
+    Args:
+        executor: Executor to run the tasks on
+        fn: Function to call
+        items: Argument tuples, consumed as slots free up
+        window: Maximum number of submitted but unconsumed tasks
+
+    Yields:
+        Results of fn in the order of items
+    """
+    pending: Deque[Future] = deque()
+    for args in items:
+        pending.append(executor.submit(fn, *args))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
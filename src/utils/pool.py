@@ -0,0 +1,210 @@
+"""
+Shared converter pool for MarkItDown Web
+"""
+from typing import Optional, List, Iterator, Union
+from dataclasses import dataclass
+from contextlib import contextmanager
+import os
+import threading
+import time
+
+from .converters import MarkdownConverter
+from .cache import ConversionCache, DEFAULT_CACHE_DIR
+from .isolation import IsolatedConverter, DEFAULT_TIMEOUT, DEFAULT_MAX_RSS
+from .ocr import ocr_available
+
+# Constants
+DEFAULT_POOL_SIZE = os.cpu_count() or 1
+
+class PoolTimeoutError(RuntimeError):
+    """Raised when no converter becomes available in time"""
+
+@dataclass
+class PoolStats:
+    """Data class for converter pool metrics"""
+    size: int
+    in_use: int
+    waiting: int
+    peak_in_use: int
+    checkouts: int
+    timeouts: int
+    total_wait: float
+    worker_restarts: int = 0
+
+    @property
+    def available(self) -> int:
+        """Converters ready to be checked out"""
+        return self.size - self.in_use
+
+    @property
+    def saturation(self) -> float:
+        """Fraction of the pool currently checked out"""
+        return self.in_use / self.size if self.size else 0.0
+
+    @property
+    def average_wait(self) -> float:
+        """Mean seconds a checkout waited for a converter"""
+        return self.total_wait / self.checkouts if self.checkouts else 0.0
+
+class ConverterPool:
+    """Thread-safe pool of pre-initialized converters"""
+
+    def __init__(
+        self,
+        size: int = DEFAULT_POOL_SIZE,
+        cache: Optional[ConversionCache] = None,
+        warm: bool = True,
+        isolate: bool = False,
+        timeout: Optional[float] = DEFAULT_TIMEOUT,
+        max_rss_bytes: Optional[int] = DEFAULT_MAX_RSS,
+        ocr: bool = False,
+        audio_backend: Optional[str] = None,
+        compact: bool = False,
+    ):
+        """
+        Initialize the pool
+
+        Args:
+            size: Number of converters in the pool
+            cache: Conversion cache shared by every converter
+            warm: Load MarkItDown in every converter up front
+            isolate: Run conversions in supervised child processes
+            timeout: Per-conversion wall-clock limit when isolated
+            max_rss_bytes: Per-worker memory ceiling when isolated
+            ocr: Recognize text in images and scanned PDF pages
+            audio_backend: Offline recognizer for transcribing audio (None for MarkItDown)
+            compact: Compact the markdown (see compaction)
+        """
+        self.size = size
+        self.cache = cache
+        self.isolate = isolate
+        self._converters: List[Union[MarkdownConverter, IsolatedConverter]] = []
+        self._idle: List[Union[MarkdownConverter, IsolatedConverter]] = []
+        self._condition = threading.Condition()
+        self._in_use = 0
+        self._waiting = 0
+        self._peak_in_use = 0
+        self._checkouts = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+
+        for _ in range(size):
+            if isolate:
+                converter = IsolatedConverter(
+                    cache=cache,
+                    ocr=ocr,
+                    audio_backend=audio_backend,
+                    compact=compact,
+                    timeout=timeout,
+                    max_rss_bytes=max_rss_bytes,
+                )
+            else:
+                converter = MarkdownConverter(cache=cache, ocr=ocr, audio_backend=audio_backend, compact=compact)
+            if warm:
+                converter.warm_up()
+            self._converters.append(converter)
+            self._idle.append(converter)
+
+    def checkout(self, timeout: Optional[float] = None) -> MarkdownConverter:
+        """
+        Take a converter out of the pool, waiting if all are in use
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait forever
+
+        Returns:
+            A converter that must be returned with checkin
+
+        Raises:
+            PoolTimeoutError: If no converter became available in time
+        """
+        started = time.perf_counter()
+        with self._condition:
+            self._waiting += 1
+            try:
+                if not self._condition.wait_for(lambda: self._idle, timeout):
+                    self._timeouts += 1
+                    raise PoolTimeoutError(f"No converter available after {timeout}s")
+            finally:
+                self._waiting -= 1
+            converter = self._idle.pop()
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+            self._checkouts += 1
+            self._total_wait += time.perf_counter() - started
+            return converter
+
+    def checkin(self, converter: MarkdownConverter) -> None:
+        """
+        Return a converter to the pool
+
+        Args:
+            converter: Converter obtained from checkout
+        """
+        with self._condition:
+            self._idle.append(converter)
+            self._in_use -= 1
+            self._condition.notify()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None) -> Iterator[MarkdownConverter]:
+        """
+        Check out a converter for the duration of a with block
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait forever
+
+        Yields:
+            A converter from the pool
+        """
+        converter = self.checkout(timeout)
+        try:
+            yield converter
+        finally:
+            self.checkin(converter)
+
+    @property
+    def stats(self) -> PoolStats:
+        """Snapshot of the pool metrics"""
+        with self._condition:
+            return PoolStats(
+                size=self.size,
+                in_use=self._in_use,
+                waiting=self._waiting,
+                peak_in_use=self._peak_in_use,
+                checkouts=self._checkouts,
+                timeouts=self._timeouts,
+                total_wait=self._total_wait,
+                worker_restarts=sum(getattr(c, 'restarts', 0) for c in self._converters),
+            )
+
+    def close(self) -> None:
+        """Stop the worker processes of an isolated pool"""
+        for converter in self._converters:
+            if isinstance(converter, IsolatedConverter):
+                converter.close()
+
+_shared_pool: Optional[ConverterPool] = None
+_shared_pool_lock = threading.Lock()
+
+def get_shared_pool() -> ConverterPool:
+    """
+    Get the process-wide converter pool, creating it on first use
+
+    The pool is sized to the host's CPU count, its converters share a
+    cache in the system temp directory, and every conversion runs in a
+    supervised worker process with the default time and memory limits.
+    OCR is enabled when Tesseract is installed.
+
+    Returns:
+        The shared ConverterPool
+    """
+    global _shared_pool
+    with _shared_pool_lock:
+        if _shared_pool is None:
+            _shared_pool = ConverterPool(
+                cache=ConversionCache(cache_dir=DEFAULT_CACHE_DIR),
+                isolate=True,
+                ocr=ocr_available(),
+            )
+        return _shared_pool
@@ -0,0 +1,140 @@
+"""
+Windowed preview utilities for large Markdown outputs
+"""
+from pathlib import Path
+from typing import List, Union, Tuple
+from dataclasses import dataclass
+from array import array
+from functools import lru_cache
+import re
+
+# Constants
+DEFAULT_LINES_PER_PAGE = 200
+MAX_WINDOW_BYTES = 256 * 1024  # Never send more than this to the browser at once
+HEADING_PATTERN = re.compile(rb"^(#{1,6})[ \t]+(.+?)[ \t#]*$")
+FENCE_PATTERN = re.compile(rb"^[ ]{0,3}(```|~~~)")
+
+@dataclass
+class Heading:
+    """Data class for an outline entry"""
+    level: int
+    title: str
+    line: int
+
+class MarkdownPreview:
+    """Random access to a Markdown file on disk by page, line range or byte range"""
+
+    def __init__(self, file_path: Union[str, Path], lines_per_page: int = DEFAULT_LINES_PER_PAGE):
+        """
+        Index a Markdown file in a single streaming pass
+
+        Args:
+            file_path: Path to the Markdown file
+            lines_per_page: Number of lines shown per page
+        """
+        self.file_path = Path(file_path)
+        self.lines_per_page = lines_per_page
+        self.size = 0
+        self.outline: List[Heading] = []
+        # Byte offset of the start of every line, plus the end of the file
+        self._offsets = array('Q', [0])
+
+        in_fence = False
+        with open(self.file_path, 'rb') as f:
+            for number, line in enumerate(f):
+                self.size += len(line)
+                self._offsets.append(self.size)
+                if FENCE_PATTERN.match(line):
+                    in_fence = not in_fence
+                    continue
+                if not in_fence and line.startswith(b'#'):
+                    match = HEADING_PATTERN.match(line.rstrip(b'\r\n'))
+                    if match:
+                        self.outline.append(Heading(
+                            level=len(match.group(1)),
+                            title=match.group(2).decode('utf-8', errors='replace'),
+                            line=number,
+                        ))
+
+    @property
+    def line_count(self) -> int:
+        """Number of lines in the file"""
+        return len(self._offsets) - 1
+
+    @property
+    def page_count(self) -> int:
+        """Number of pages in the file (at least one)"""
+        return max(1, -(-self.line_count // self.lines_per_page))
+
+    def page_of_line(self, line: int) -> int:
+        """0-based page containing a 0-based line"""
+        return min(line // self.lines_per_page, self.page_count - 1)
+
+    def read_lines(self, start: int, end: int) -> Tuple[str, bool]:
+        """
+        Read a range of lines
+
+        Args:
+            start: First line (0-based, inclusive)
+            end: Last line (0-based, exclusive)
+
+        Returns:
+            Tuple of (text, truncated) where truncated is True if the window
+            exceeded MAX_WINDOW_BYTES and was cut short
+        """
+        start = max(0, min(start, self.line_count))
+        end = max(start, min(end, self.line_count))
+        return self.read_bytes(self._offsets[start], self._offsets[end])
+
+    def read_page(self, page: int) -> Tuple[str, bool]:
+        """
+        Read one page of lines
+
+        Args:
+            page: 0-based page number
+
+        Returns:
+            Tuple of (text, truncated) as for read_lines
+        """
+        start = page * self.lines_per_page
+        return self.read_lines(start, start + self.lines_per_page)
+
+    def read_bytes(self, start: int, end: int) -> Tuple[str, bool]:
+        """
+        Read a byte range, decoding partial characters at the edges as U+FFFD
+
+        Args:
+            start: First byte (inclusive)
+            end: Last byte (exclusive)
+
+        Returns:
+            Tuple of (text, truncated) as for read_lines
+        """
+        start = max(0, min(start, self.size))
+        end = max(start, min(end, self.size))
+        truncated = end - start > MAX_WINDOW_BYTES
+        with open(self.file_path, 'rb') as f:
+            f.seek(start)
+            data = f.read(min(end - start, MAX_WINDOW_BYTES))
+        return data.decode('utf-8', errors='replace'), truncated
+
+@lru_cache(maxsize=32)
+def _load_preview(file_path: str, mtime_ns: int, size: int, lines_per_page: int) -> MarkdownPreview:
+    """Build a preview; mtime and size are part of the cache key"""
+    return MarkdownPreview(file_path, lines_per_page)
+
+def open_preview(file_path: Union[str, Path], lines_per_page: int = DEFAULT_LINES_PER_PAGE) -> MarkdownPreview:
+    """
+    Get a (cached) preview index for a Markdown file
+
+    The index is rebuilt only when the file changes.
+
+    Args:
+        file_path: Path to the Markdown file
+        lines_per_page: Number of lines shown per page
+
+    Returns:
+        MarkdownPreview for the file
+    """
+    stat = Path(file_path).stat()
+    return _load_preview(str(file_path), stat.st_mtime_ns, stat.st_size, lines_per_page)
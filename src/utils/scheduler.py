@@ -0,0 +1,221 @@
+"""
+Cost-aware fair scheduling of conversion jobs
+
+A first-come, first-served queue in front of a fixed set of workers lets
+one large PDF or recording hold up every small file submitted after it.
+FairScheduler orders queued jobs by their estimated cost instead: each
+client (a web session or HTTP client) has its own queue, cheapest job
+first, and clients are served by start-time fair queueing, so a client
+that just used a lot of worker time waits while others catch up. Small
+jobs therefore overtake big ones, and no client can monopolize the
+workers by submitting many files. A job that has waited longer than the
+starvation limit is dispatched next regardless of its cost.
+"""
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
+from collections import deque
+from dataclasses import dataclass, field
+import heapq
+import itertools
+import threading
+import time
+
+from .converters import SUPPORTED_FORMATS
+
+# Constants
+DEFAULT_MAX_WAIT = 120.0  # Seconds a job may wait before it is dispatched regardless of cost
+DEFAULT_FORMAT_COST = (0.2, 1.0)  # For formats without an entry below
+# (base seconds, seconds per MB) of a conversion, by the MIME type SUPPORTED_FORMATS
+# maps each extension to; rough relative figures, only the ordering they produce matters
+CONVERSION_COSTS: Dict[str, Tuple[float, float]] = {
+    'application/pdf': (0.2, 1.5),
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': (0.1, 0.3),
+    'application/vnd.openxmlformats-officedocument.presentationml.presentation': (0.2, 0.5),
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': (0.1, 1.0),
+    'text/plain': (0.01, 0.02),
+    'text/html': (0.02, 0.1),
+    'image/png': (0.2, 0.5),
+    'image/jpeg': (0.2, 0.5),
+    'audio/mpeg': (1.0, 10.0),  # Transcription; compressed audio runs minutes per MB
+    'audio/wav': (1.0, 1.0),
+}
+ANONYMOUS_CLIENT = ''
+
+def estimate_cost(file_path: Union[str, Path]) -> float:
+    """
+    Estimate the worker time a conversion takes from its format and size
+
+    Args:
+        file_path: Input file; a missing file counts as empty
+
+    Returns:
+        Estimated cost in seconds
+    """
+    path = Path(file_path)
+    mime_type = SUPPORTED_FORMATS.get(path.suffix.lower()[1:])
+    base, per_mb = CONVERSION_COSTS.get(mime_type, DEFAULT_FORMAT_COST)
+    try:
+        size = path.stat().st_size
+    except OSError:
+        size = 0
+    return base + per_mb * size / (1024 * 1024)
+
+@dataclass(order=True)
+class _Entry:
+    """A queued item, ordered by cost and then arrival"""
+    cost: float
+    seq: int
+    item: Any = field(compare=False)
+    client: str = field(compare=False)
+    enqueued_at: float = field(compare=False)
+    taken: bool = field(default=False, compare=False)
+
+class FairScheduler:
+    """Thread-safe queue dispatching cheap jobs first and sharing workers fairly across clients"""
+
+    def __init__(self, max_wait: Optional[float] = DEFAULT_MAX_WAIT):
+        """
+        Initialize an empty scheduler
+
+        Args:
+            max_wait: Seconds after which a queued job is dispatched next
+                regardless of cost, or None to never override the order
+        """
+        self.max_wait = max_wait
+        self.expedited = 0  # Jobs dispatched by the starvation guard
+        self._cond = threading.Condition()
+        self._queues: Dict[str, List[_Entry]] = {}
+        # Virtual worker time each client has been served
+        self._served: Dict[str, float] = {}
+        self._virtual = 0.0
+        self._arrivals: Deque[_Entry] = deque()
+        self._size = 0
+        self._closed = False
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        with self._cond:
+            return self._size
+
+    def put(self, item: Any, cost: float, client: Optional[str] = None) -> None:
+        """
+        Queue an item
+
+        Args:
+            item: Item to hand to a worker (e.g. a Job)
+            cost: Estimated cost (see estimate_cost)
+            client: Session or client the item belongs to; items without one share a queue
+
+        Raises:
+            RuntimeError: If the scheduler was closed
+        """
+        client = client if client is not None else ANONYMOUS_CLIENT
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Scheduler is closed")
+            entry = _Entry(cost, next(self._seq), item, client, time.monotonic())
+            heap = self._queues.get(client)
+            if heap is None:
+                heap = self._queues[client] = []
+                # A client returning from idle starts level with the others, not on banked credit
+                self._served[client] = max(self._served.get(client, 0.0), self._virtual)
+            heapq.heappush(heap, entry)
+            self._arrivals.append(entry)
+            self._size += 1
+            self._cond.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """
+        Take the next item to run, blocking until one is queued
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait forever
+
+        Returns:
+            The item, or None on timeout or once the scheduler is closed and empty
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._size or self._closed, timeout) or not self._size:
+                return None
+            entry = self._overdue(time.monotonic())
+            if entry is not None:
+                self.expedited += 1
+            else:
+                entry = min(
+                    (heap[0] for heap in self._queues.values()),
+                    key=lambda head: (self._served[head.client] + head.cost, head.seq),
+                )
+            self._take(entry)
+            return entry.item
+
+    def order(self) -> List[Any]:
+        """
+        Queued items in the order they would be dispatched if nothing else arrived
+
+        Returns:
+            The items, next first
+        """
+        with self._cond:
+            now = time.monotonic()
+            overdue = [
+                entry for entry in self._arrivals
+                if not entry.taken and self._is_overdue(entry, now)
+            ]
+            expedited = {entry.seq for entry in overdue}
+            queues = {
+                client: deque(entry for entry in sorted(heap) if entry.seq not in expedited)
+                for client, heap in self._queues.items()
+            }
+            served = {client: self._served[client] for client in queues}
+            order = [entry.item for entry in overdue]
+            queues = {client: queue for client, queue in queues.items() if queue}
+            while queues:
+                client = min(queues, key=lambda c: (served[c] + queues[c][0].cost, queues[c][0].seq))
+                entry = queues[client].popleft()
+                served[client] += entry.cost
+                order.append(entry.item)
+                if not queues[client]:
+                    del queues[client]
+            return order
+
+    def close(self) -> None:
+        """Refuse new items; get() returns None once the queued ones are taken"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def _is_overdue(self, entry: _Entry, now: float) -> bool:
+        """Whether an entry has waited past the starvation limit"""
+        return self.max_wait is not None and now - entry.enqueued_at >= self.max_wait
+
+    def _overdue(self, now: float) -> Optional[_Entry]:
+        """Oldest entry past the starvation limit, if any (lock held)"""
+        while self._arrivals and self._arrivals[0].taken:
+            self._arrivals.popleft()
+        if self._arrivals and self._is_overdue(self._arrivals[0], now):
+            return self._arrivals[0]
+        return None
+
+    def _take(self, entry: _Entry) -> None:
+        """Remove an entry and charge its client for it (lock held)"""
+        heap = self._queues[entry.client]
+        if heap[0] is entry:
+            heapq.heappop(heap)
+        else:
+            # Only expedited entries leave from the middle of a heap
+            heap.remove(entry)
+            heapq.heapify(heap)
+        entry.taken = True
+        self._size -= 1
+        start = self._served[entry.client]
+        self._virtual = max(self._virtual, start)
+        self._served[entry.client] = start + entry.cost
+        if not heap:
+            del self._queues[entry.client]
+            # Idle clients at or behind the virtual time would be reset to it anyway
+            idle = [
+                client for client, served in self._served.items()
+                if client not in self._queues and served <= self._virtual
+            ]
+            for client in idle:
+                del self._served[client]
@@ -0,0 +1,220 @@
+"""
+Content sniffing for uploaded files
+
+Identifies a file's real format from its first few KB so misnamed or
+corrupt files are rejected before MarkItDown spends time parsing them.
+Built-in signatures cover every supported format; python-magic, when
+installed, is consulted for anything they do not recognize.
+"""
+from pathlib import Path
+from typing import BinaryIO, Optional, Union
+from functools import lru_cache
+import codecs
+import zipfile
+
+# Constants
+SNIFF_BYTES = 8 * 1024
+HTML_MARKER_WINDOW = 1024  # HTML markers are looked for this far in
+PDF_LEADING_BYTES = b' \t\r\n\f'  # Whitespace some writers put before %PDF
+TEXT_PRINTABLE_RATIO = 0.95
+HTML_MARKERS = (b'<!doctype html', b'<html', b'<head', b'<body')
+
+# Formats that describe the same kind of content
+FORMAT_ALIASES = {'jpeg': 'jpg'}
+TEXT_FORMATS = frozenset({'txt', 'html'})
+
+# Parts that identify an Office Open XML package
+OOXML_PARTS = (
+    ('word/document.xml', 'docx'),
+    ('ppt/presentation.xml', 'pptx'),
+    ('xl/workbook.xml', 'xlsx'),
+)
+
+# MIME types reported by libmagic -> format
+MIME_FORMATS = {
+    'application/pdf': 'pdf',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': 'docx',
+    'application/vnd.openxmlformats-officedocument.presentationml.presentation': 'pptx',
+    'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet': 'xlsx',
+    'text/plain': 'txt',
+    'text/html': 'html',
+    'image/png': 'png',
+    'image/jpeg': 'jpg',
+    'audio/mpeg': 'mp3',
+    'audio/wav': 'wav',
+    'audio/x-wav': 'wav',
+    'audio/vnd.wave': 'wav',
+}
+
+def normalize_format(fmt: Optional[str]) -> Optional[str]:
+    """Map a format or extension (without the dot) to its canonical name"""
+    if fmt is None:
+        return None
+    fmt = fmt.lower()
+    return FORMAT_ALIASES.get(fmt, fmt)
+
+def sniff_bytes(header: bytes) -> Optional[str]:
+    """
+    Identify a format from the leading bytes of a file
+
+    Args:
+        header: The first bytes of the file (SNIFF_BYTES is plenty)
+
+    Returns:
+        Canonical format name, 'zip' for a non-Office ZIP archive, or None
+    """
+    if not header:
+        return 'txt'
+    if _strip_bom(header).lstrip(PDF_LEADING_BYTES).startswith(b'%PDF-'):
+        return 'pdf'
+    if header.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'png'
+    if header.startswith(b'\xff\xd8\xff'):
+        return 'jpg'
+    if header.startswith(b'RIFF') and header[8:12] == b'WAVE':
+        return 'wav'
+    if header.startswith(b'ID3') or (len(header) > 1 and header[0] == 0xFF and header[1] & 0xE0 == 0xE0):
+        return 'mp3'
+    if header.startswith(b'PK\x03\x04'):
+        # Local file headers carry part names; good enough without the central directory
+        for part, fmt in OOXML_PARTS:
+            if part.encode() in header:
+                return fmt
+        return 'zip'
+    if _looks_like_text(header):
+        start = header[:HTML_MARKER_WINDOW].lower()
+        return 'html' if any(marker in start for marker in HTML_MARKERS) else 'txt'
+    return None
+
+def _strip_bom(header: bytes) -> bytes:
+    """Drop a leading UTF-8 byte order mark"""
+    return header[len(codecs.BOM_UTF8):] if header.startswith(codecs.BOM_UTF8) else header
+
+def _looks_like_text(header: bytes) -> bool:
+    """Check whether bytes are UTF-8/UTF-16 text or mostly printable 8-bit text"""
+    if header.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return True
+    if b'\x00' in header:
+        return False
+    try:
+        # final=False tolerates a character cut off at the end of the window
+        codecs.getincrementaldecoder('utf-8')().decode(header, final=False)
+        return True
+    except UnicodeDecodeError:
+        pass
+    printable = sum(1 for b in header if b >= 0x20 or b in b'\t\n\r\f')
+    return printable / len(header) >= TEXT_PRINTABLE_RATIO
+
+def _sniff_package(file: Union[Path, BinaryIO]) -> str:
+    """Identify an Office document from its ZIP central directory"""
+    try:
+        with zipfile.ZipFile(file) as archive:
+            names = set(archive.namelist())
+    except zipfile.BadZipFile:
+        return 'zip'
+    for part, fmt in OOXML_PARTS:
+        if part in names:
+            return fmt
+    return 'zip'
+
+@lru_cache(maxsize=1)
+def _magic():
+    """The python-magic module, or None when it (or libmagic) is unavailable"""
+    try:
+        import magic
+        magic.from_buffer(b'', mime=True)
+        return magic
+    except Exception:
+        return None
+
+def sniff_with_magic(header: bytes) -> Optional[str]:
+    """
+    Identify a format with libmagic
+
+    Args:
+        header: The first bytes of the file
+
+    Returns:
+        Canonical format name, or None if python-magic is not installed or
+        reports a type no converter handles
+    """
+    magic = _magic()
+    if magic is None:
+        return None
+    return MIME_FORMATS.get(magic.from_buffer(header, mime=True))
+
+def sniff_header(header: bytes) -> Optional[str]:
+    """Identify a format from leading bytes, falling back to libmagic"""
+    return sniff_bytes(header) or sniff_with_magic(header)
+
+@lru_cache(maxsize=256)
+def _sniff_cached(file_path: str, mtime_ns: int, size: int) -> Optional[str]:
+    """Sniff a file; mtime and size are part of the cache key"""
+    with open(file_path, 'rb') as f:
+        header = f.read(SNIFF_BYTES)
+    fmt = sniff_header(header)
+    if fmt in ('zip', 'docx', 'pptx', 'xlsx'):
+        # Part order inside the archive is not fixed; confirm from the central directory
+        fmt = _sniff_package(Path(file_path))
+    return fmt
+
+def sniff_file(file_path: Union[str, Path]) -> Optional[str]:
+    """
+    Identify the real format of a file from its content
+
+    Results are cached until the file changes.
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        Canonical format name, 'zip', or None if unrecognized or unreadable
+    """
+    try:
+        stat = Path(file_path).stat()
+        return _sniff_cached(str(file_path), stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        return None
+
+def sniff_stream(stream: BinaryIO) -> Optional[str]:
+    """
+    Identify the real format of a seekable binary stream
+
+    The stream position is restored afterwards.
+
+    Args:
+        stream: Seekable binary file object
+
+    Returns:
+        Canonical format name, 'zip', or None if unrecognized
+    """
+    position = stream.tell()
+    try:
+        fmt = sniff_header(stream.read(SNIFF_BYTES))
+        if fmt in ('zip', 'docx', 'pptx', 'xlsx'):
+            stream.seek(position)
+            fmt = _sniff_package(stream)
+        return fmt
+    finally:
+        stream.seek(position)
+
+def check_format(claimed: str, detected: Optional[str]) -> Optional[str]:
+    """
+    Check sniffed content against the format claimed by the file name
+
+    Plain text and HTML are interchangeable, since either converter handles
+    both; every other format must match exactly.
+
+    Args:
+        claimed: Format from the file extension (without the dot)
+        detected: Format returned by sniff_file or sniff_header
+
+    Returns:
+        Error message, or None if the content matches
+    """
+    claimed = normalize_format(claimed)
+    if detected == claimed or (detected in TEXT_FORMATS and claimed in TEXT_FORMATS):
+        return None
+    if detected is None:
+        return f"Could not recognize the file content as {claimed.upper()}"
+    return f"File content is {detected.upper()}, not {claimed.upper()} as its extension says"
@@ -0,0 +1,416 @@
+"""
+Spool directory lifecycle for uploaded files
+
+Each browser session gets a directory under one spool root. Sessions
+renew a lease (the directory's mtime) on every script run; directories
+whose lease has lapsed are reaped, so files of abandoned sessions do not
+pile up, while live sessions keep their uploads across reruns. Files held
+by a job are never removed. A global quota bounds the spool's disk usage
+by evicting the least recently used uploads, and small uploads can be
+kept on a RAM-backed filesystem (e.g. /dev/shm) instead of disk.
+
+Usage is tracked by a running counter per spool root: it is seeded once
+from a walk of the root, uploads reserve their size against it before
+they are written, and eviction and session removal subtract what they
+delete. Each reap recounts the root so converted outputs and uploads that
+turned out to be duplicates are accounted for.
+"""
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+from contextlib import contextmanager
+from dataclasses import dataclass
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+
+# Constants
+DEFAULT_SPOOL_DIR = Path(tempfile.gettempdir()) / "murkdown-spool"
+DEFAULT_TTL = 2 * 60 * 60  # Seconds an idle session's files are kept
+DEFAULT_QUOTA = 2 * 1024 * 1024 * 1024  # 2GB across all sessions
+DEFAULT_RAM_FILE_LIMIT = 8 * 1024 * 1024  # Larger uploads always go to disk
+DEFAULT_RAM_QUOTA = 256 * 1024 * 1024
+REAP_INTERVAL = 60.0  # Minimum seconds between automatic reaps
+UPLOADS_DIR = "uploads"
+OUTPUTS_DIR = "outputs"
+SESSION_ID_PATTERN = re.compile(r'^[A-Za-z0-9_-]{1,64}$')
+
+class SpoolFullError(OSError):
+    """Raised when a file does not fit in the spool even after eviction"""
+
+@dataclass
+class SpoolStats:
+    """Data class for spool usage"""
+    sessions: int
+    files: int
+    disk_bytes: int
+    ram_bytes: int
+    quota_bytes: Optional[int]
+    held_files: int
+    reaped_sessions: int
+    evicted_files: int
+
+class SpoolManager:
+    """Per-session spool directories with TTL reaping and a disk quota"""
+
+    def __init__(
+        self,
+        root: Union[str, Path] = DEFAULT_SPOOL_DIR,
+        ttl: float = DEFAULT_TTL,
+        quota_bytes: Optional[int] = DEFAULT_QUOTA,
+        ram_root: Optional[Union[str, Path]] = None,
+        ram_file_limit: int = DEFAULT_RAM_FILE_LIMIT,
+        ram_quota_bytes: int = DEFAULT_RAM_QUOTA,
+    ):
+        """
+        Initialize the spool
+
+        Args:
+            root: Directory holding one subdirectory per session
+            ttl: Seconds after its last touch that a session is reaped
+            quota_bytes: Disk budget for all spooled files (None for no limit)
+            ram_root: Directory on a RAM-backed filesystem for small uploads
+                (None to keep everything on disk)
+            ram_file_limit: Largest upload kept in the RAM spool
+            ram_quota_bytes: Budget of the RAM spool
+        """
+        self.root = Path(root)
+        self.ram_root = Path(ram_root) / self.root.name if ram_root is not None else None
+        self.ttl = ttl
+        self.quota_bytes = quota_bytes
+        self.ram_file_limit = ram_file_limit
+        self.ram_quota_bytes = ram_quota_bytes
+        self._lock = threading.RLock()
+        self._held: Dict[Path, int] = {}
+        # Bytes used per spool root, including reservations; seeded on first use
+        self._used: Dict[Path, int] = {}
+        # Reserved bytes of uploads still being written, kept across recounts
+        self._pending: Dict[Path, int] = {}
+        self._last_reap = 0.0
+        self._reaped_sessions = 0
+        self._evicted_files = 0
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def touch(self, session_id: str) -> Path:
+        """
+        Renew a session's lease, creating its directory if needed
+
+        Call this on every request (script run) of the session. Lapsed
+        sessions are reaped at most once per REAP_INTERVAL along the way.
+
+        Args:
+            session_id: Session identifier (letters, digits, '-' and '_')
+
+        Returns:
+            The session's directory on disk
+        """
+        session_dir = self._session_path(self.root, session_id)
+        now = time.time()
+        for directory in (session_dir, self._ram_session_path(session_id)):
+            if directory is not None and directory.exists():
+                os.utime(directory, (now, now))
+        session_dir.mkdir(parents=True, exist_ok=True)
+        if now - self._last_reap >= REAP_INTERVAL:
+            self.reap(now)
+        return session_dir
+
+    def upload_dir(self, session_id: str, size: Optional[int] = None) -> Path:
+        """
+        Directory to spool an upload of a session into
+
+        Reserves room for the file first, evicting old uploads if the
+        quota requires it. Small files go to the RAM spool when configured.
+        The reservation counts as used space until the next reap recounts
+        the spool; use reserving() to release it if the save fails.
+
+        Args:
+            session_id: Session identifier
+            size: Size of the upload in bytes, if known
+
+        Returns:
+            Directory to pass to save_uploaded_file
+
+        Raises:
+            SpoolFullError: If the file cannot fit within the quota
+        """
+        return self._place(session_id, size)[0]
+
+    @contextmanager
+    def reserving(self, session_id: str, size: Optional[int] = None) -> Iterator[Path]:
+        """
+        Reserve room for an upload for the duration of a with block
+
+        The block writes the upload into the yielded directory. If it
+        raises, the reservation is released; otherwise the reserved bytes
+        stay counted as the file's.
+
+        Args:
+            session_id: Session identifier
+            size: Size of the upload in bytes, if known
+
+        Yields:
+            Directory to pass to save_uploaded_file or spool_stream
+
+        Raises:
+            SpoolFullError: If the file cannot fit within the quota
+        """
+        directory, spool_root = self._place(session_id, size)
+        if spool_root is None or not size:
+            yield directory
+            return
+        with self._lock:
+            self._pending[spool_root] = self._pending.get(spool_root, 0) + size
+        try:
+            yield directory
+        except BaseException:
+            with self._lock:
+                self._used[spool_root] = max(0, self._used[spool_root] - size)
+            raise
+        finally:
+            with self._lock:
+                self._pending[spool_root] -= size
+
+    def output_dir(self, session_id: str) -> Path:
+        """Directory for a session's converted files (reaped with the session)"""
+        directory = self.touch(session_id) / OUTPUTS_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory
+
+    def hold(self, file_path: Union[str, Path]) -> None:
+        """Protect a file from reaping and eviction until it is released"""
+        path = Path(file_path).resolve()
+        with self._lock:
+            self._held[path] = self._held.get(path, 0) + 1
+
+    def release(self, file_path: Union[str, Path]) -> None:
+        """Drop a hold taken with hold()"""
+        path = Path(file_path).resolve()
+        with self._lock:
+            count = self._held.get(path, 0) - 1
+            if count > 0:
+                self._held[path] = count
+            else:
+                self._held.pop(path, None)
+
+    @contextmanager
+    def holding(self, file_path: Union[str, Path]) -> Iterator[None]:
+        """Hold a file for the duration of a with block"""
+        self.hold(file_path)
+        try:
+            yield
+        finally:
+            self.release(file_path)
+
+    def reap(self, now: Optional[float] = None) -> int:
+        """
+        Remove the directories of sessions whose lease has lapsed
+
+        A session holding a file for a running job is kept. The usage
+        counters are recounted from disk afterwards.
+
+        Args:
+            now: Current time (defaults to time.time())
+
+        Returns:
+            Number of sessions removed
+        """
+        now = time.time() if now is None else now
+        reaped = 0
+        with self._lock:
+            self._last_reap = now
+            for spool_root in (self.root, self.ram_root):
+                if spool_root is None or not spool_root.exists():
+                    continue
+                for session_dir in spool_root.iterdir():
+                    try:
+                        expired = session_dir.is_dir() and now - session_dir.stat().st_mtime > self.ttl
+                    except OSError:
+                        continue
+                    if expired and not self._holds_under(session_dir):
+                        shutil.rmtree(session_dir, ignore_errors=True)
+                        reaped += spool_root == self.root
+                # Recount, keeping the reservations of uploads still being written
+                if spool_root in self._used:
+                    self._used[spool_root] = _usage(spool_root)[1] + self._pending.get(spool_root, 0)
+            self._reaped_sessions += reaped
+        return reaped
+
+    def remove_session(self, session_id: str) -> None:
+        """Delete a session's files now (e.g. when it ends cleanly)"""
+        for spool_root in (self.root, self.ram_root):
+            if spool_root is None:
+                continue
+            directory = self._session_path(spool_root, session_id)
+            with self._lock:
+                if self._holds_under(directory):
+                    continue
+                removed = _usage(directory)[1]
+                shutil.rmtree(directory, ignore_errors=True)
+                if spool_root in self._used:
+                    self._used[spool_root] = max(0, self._used[spool_root] - removed)
+
+    @property
+    def stats(self) -> SpoolStats:
+        """Snapshot of the spool usage"""
+        files, disk_bytes = _usage(self.root)
+        ram_files, ram_bytes = _usage(self.ram_root) if self.ram_root is not None else (0, 0)
+        sessions = sum(1 for p in self.root.iterdir() if p.is_dir())
+        with self._lock:
+            return SpoolStats(
+                sessions=sessions,
+                files=files + ram_files,
+                disk_bytes=disk_bytes,
+                ram_bytes=ram_bytes,
+                quota_bytes=self.quota_bytes,
+                held_files=len(self._held),
+                reaped_sessions=self._reaped_sessions,
+                evicted_files=self._evicted_files,
+            )
+
+    def owns(self, file_path: Union[str, Path]) -> bool:
+        """Whether a path lies inside this spool (on disk or in the RAM spool)"""
+        path = Path(file_path).resolve()
+        return any(
+            spool_root is not None and spool_root.resolve() in path.parents
+            for spool_root in (self.root, self.ram_root)
+        )
+
+    def _place(self, session_id: str, size: Optional[int]) -> Tuple[Path, Optional[Path]]:
+        """
+        Pick the upload directory for a file and reserve room for it
+
+        Returns:
+            The directory, and the spool root the size was reserved under
+            (None if nothing was reserved)
+        """
+        self.touch(session_id)
+        if size is not None and self.ram_root is not None and size <= self.ram_file_limit:
+            if self._fit(self.ram_root, size, self.ram_quota_bytes):
+                directory = self._ram_session_path(session_id) / UPLOADS_DIR
+                directory.mkdir(parents=True, exist_ok=True)
+                return directory, self.ram_root
+        reserved = None
+        if size is not None and self.quota_bytes is not None:
+            if not self._fit(self.root, size, self.quota_bytes):
+                raise SpoolFullError(
+                    f"Upload of {size / 1024 / 1024:.1f}MB does not fit in the "
+                    f"{self.quota_bytes / 1024 / 1024:.0f}MB spool"
+                )
+            reserved = self.root
+        directory = self._session_path(self.root, session_id) / UPLOADS_DIR
+        directory.mkdir(parents=True, exist_ok=True)
+        return directory, reserved
+
+    def _fit(self, spool_root: Path, size: int, quota: int) -> bool:
+        """
+        Reserve size bytes under a spool root, making room if needed
+
+        Lapsed sessions are reaped first, then unheld uploads are evicted
+        least recently used first. Converted outputs are never evicted.
+        The check and the reservation happen under the lock, so concurrent
+        uploads cannot both claim the same free space.
+
+        Returns:
+            Whether the file fits within the quota (and was reserved)
+        """
+        if size > quota:
+            return False
+        with self._lock:
+            if spool_root not in self._used:
+                self._used[spool_root] = _usage(spool_root)[1]
+            if self._used[spool_root] + size > quota:
+                self.reap()
+                for path, _, file_size in _uploads_by_age(spool_root):
+                    if self._used[spool_root] + size <= quota:
+                        break
+                    if self._is_held(path):
+                        continue
+                    try:
+                        path.unlink()
+                    except OSError:
+                        continue
+                    self._used[spool_root] = max(0, self._used[spool_root] - file_size)
+                    self._evicted_files += 1
+                    # Uploads live in a directory named after their hash
+                    try:
+                        path.parent.rmdir()
+                    except OSError:
+                        pass
+                if self._used[spool_root] + size > quota:
+                    return False
+            self._used[spool_root] += size
+            return True
+
+    def _is_held(self, path: Path) -> bool:
+        """Whether a file is held (hold paths are resolved)"""
+        with self._lock:
+            return path.resolve() in self._held
+
+    def _holds_under(self, directory: Path) -> bool:
+        """Whether any held file lives below a directory"""
+        directory = directory.resolve()
+        with self._lock:
+            return any(directory in path.parents for path in self._held)
+
+    def _session_path(self, spool_root: Path, session_id: str) -> Path:
+        """Directory of a session under a spool root"""
+        if not SESSION_ID_PATTERN.match(session_id):
+            raise ValueError(f"Invalid spool session id: {session_id!r}")
+        return spool_root / session_id
+
+    def _ram_session_path(self, session_id: str) -> Optional[Path]:
+        """Directory of a session in the RAM spool, if there is one"""
+        if self.ram_root is None:
+            return None
+        return self._session_path(self.ram_root, session_id)
+
+def _usage(root: Path) -> Tuple[int, int]:
+    """Number of files and bytes below a directory"""
+    files, total = 0, 0
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            try:
+                total += os.stat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                continue
+            files += 1
+    return files, total
+
+def _uploads_by_age(root: Path) -> List[Tuple[Path, float, int]]:
+    """(path, atime-or-mtime, size) of every spooled upload, least recently used first"""
+    uploads = []
+    for upload_root in root.glob(f"*/{UPLOADS_DIR}"):
+        for dirpath, _, filenames in os.walk(upload_root):
+            for name in filenames:
+                path = Path(dirpath) / name
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                uploads.append((path, max(stat.st_atime, stat.st_mtime), stat.st_size))
+    uploads.sort(key=lambda upload: upload[1])
+    return uploads
+
+_shared_spool: Optional[SpoolManager] = None
+_shared_spool_lock = threading.Lock()
+
+def get_shared_spool() -> SpoolManager:
+    """
+    Get the process-wide spool, creating it on first use
+
+    The spool lives in the system temp directory with the default TTL and
+    quota; small uploads use /dev/shm when the host has a writable one.
+
+    Returns:
+        The shared SpoolManager
+    """
+    global _shared_spool
+    with _shared_spool_lock:
+        if _shared_spool is None:
+            ram_root = Path("/dev/shm")
+            _shared_spool = SpoolManager(
+                ram_root=ram_root if ram_root.is_dir() and os.access(ram_root, os.W_OK) else None,
+            )
+        return _shared_spool
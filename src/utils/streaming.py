@@ -0,0 +1,257 @@
+"""
+Incremental (streaming) converters for large documents
+
+Each streaming converter yields Markdown in pieces (pages, sheets, row
+batches) so output can be written and shown before the whole document is
+parsed, with memory bounded by the size of one piece.
+"""
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from dataclasses import dataclass
+import io
+
+# Constants
+DEFAULT_BATCH_ROWS = 1000  # Spreadsheet rows per emitted piece
+
+@dataclass
+class StreamProgress:
+    """Data class describing one emitted piece of a streaming conversion"""
+    index: int
+    total: Optional[int]
+    output_file: str
+    text: str
+
+def iter_pdf_pages(file_path: Union[str, Path], **options) -> Iterator[str]:
+    """
+    Yield the text of a PDF one page at a time
+
+    Uses the same pdfminer text pipeline as MarkItDown's PDF converter, so
+    the concatenated pages match a regular conversion, but each page is
+    released as soon as it has been emitted.
+
+    Args:
+        file_path: Path to the PDF
+
+    Yields:
+        Text of each page, terminated by a form feed like pdfminer's extract_text
+    """
+    from pdfminer.converter import TextConverter
+    from pdfminer.layout import LAParams
+    from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+    from pdfminer.pdfpage import PDFPage
+
+    buffer = io.StringIO()
+    resources = PDFResourceManager()
+    device = TextConverter(resources, buffer, laparams=LAParams())
+    interpreter = PDFPageInterpreter(resources, device)
+    try:
+        with open(file_path, 'rb') as f:
+            for page in PDFPage.get_pages(f):
+                interpreter.process_page(page)
+                text = buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                yield text
+    finally:
+        device.close()
+
+def count_pdf_pages(file_path: Union[str, Path], **options) -> Optional[int]:
+    """
+    Count the pages of a PDF without laying them out
+
+    Args:
+        file_path: Path to the PDF
+
+    Returns:
+        Number of pages, or None if the page tree cannot be read
+    """
+    from pdfminer.pdfpage import PDFPage
+
+    try:
+        with open(file_path, 'rb') as f:
+            return sum(1 for _ in PDFPage.get_pages(f))
+    except Exception:
+        return None
+
+def iter_xlsx_sheets(
+    file_path: Union[str, Path],
+    max_rows: Optional[int] = None,
+    max_cols: Optional[int] = None,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    **options
+) -> Iterator[Tuple[str, Iterator[str]]]:
+    """
+    Yield each worksheet of a workbook with an iterator over its Markdown
+
+    The workbook is opened in openpyxl's read-only mode, which parses rows
+    lazily from the XML instead of building every cell in memory. Each sheet
+    becomes a "## name" heading followed by a table whose header is the
+    first row, matching MarkItDown's layout. The per-sheet iterator must be
+    consumed before advancing to the next sheet.
+
+    Args:
+        file_path: Path to the .xlsx file
+        max_rows: Maximum data rows per sheet (None for all)
+        max_cols: Maximum columns per sheet (None for all)
+        batch_rows: Rows per emitted piece
+
+    Yields:
+        Tuples of (sheet name, iterator of Markdown pieces)
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            yield sheet.title, _iter_sheet_markdown(sheet, max_rows, max_cols, batch_rows)
+    finally:
+        # Read-only workbooks keep the archive open until closed
+        workbook.close()
+
+def _iter_sheet_markdown(
+    sheet: Any,
+    max_rows: Optional[int],
+    max_cols: Optional[int],
+    batch_rows: int
+) -> Iterator[str]:
+    """Render one read-only worksheet as a Markdown table in row batches"""
+    # Exporters often write wrong <dimension> tags; read rows as stored
+    sheet.reset_dimensions()
+    rows = sheet.iter_rows(values_only=True)
+
+    lines = [f"## {sheet.title}\n"]
+    header = next(rows, None)
+    if header is None:
+        yield lines[0] + "\n"
+        return
+    width = _row_width(header)
+    if max_cols is not None:
+        width = min(width, max_cols)
+    lines.append(_table_row(header, width))
+    lines.append("| " + " | ".join(["---"] * width) + " |")
+
+    count = 0
+    for row in rows:
+        if max_rows is not None and count >= max_rows:
+            lines.append(f"\n*Truncated after {max_rows} rows*")
+            break
+        lines.append(_table_row(row, width))
+        count += 1
+        if len(lines) >= batch_rows:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    # Close the table with a blank line, also when the rows ended on a batch boundary
+    yield "\n".join(lines) + "\n\n" if lines else "\n"
+
+def _row_width(row: Tuple[Any, ...]) -> int:
+    """Number of cells up to the last non-empty one (at least one)"""
+    width = len(row)
+    while width > 1 and row[width - 1] is None:
+        width -= 1
+    return max(width, 1)
+
+def _table_row(row: Tuple[Any, ...], width: int) -> str:
+    """Render cells as a Markdown table row padded or cut to width"""
+    cells = [_format_cell(row[i]) if i < len(row) else "" for i in range(width)]
+    return "| " + " | ".join(cells) + " |"
+
+def _format_cell(value: Any) -> str:
+    """Render a cell value safely inside a Markdown table"""
+    if value is None:
+        return ""
+    return str(value).replace("|", "\\|").replace("\r\n", "<br>").replace("\n", "<br>")
+
+def iter_xlsx(file_path: Union[str, Path], **options) -> Iterator[str]:
+    """
+    Yield the Markdown of a workbook sheet by sheet in row batches
+
+    Args:
+        file_path: Path to the .xlsx file
+        **options: max_rows, max_cols and batch_rows as for iter_xlsx_sheets
+
+    Yields:
+        Markdown pieces in workbook order
+    """
+    for _, pieces in iter_xlsx_sheets(file_path, **options):
+        yield from pieces
+
+def count_xlsx_batches(
+    file_path: Union[str, Path],
+    max_rows: Optional[int] = None,
+    batch_rows: int = DEFAULT_BATCH_ROWS,
+    **options
+) -> Optional[int]:
+    """
+    Estimate the number of pieces iter_xlsx will yield from sheet dimensions
+
+    Args:
+        file_path: Path to the .xlsx file
+        max_rows: Maximum data rows per sheet (None for all)
+        batch_rows: Rows per emitted piece
+
+    Returns:
+        Estimated piece count, or None if the workbook cannot be read or
+        a sheet does not record its dimensions
+    """
+    from openpyxl import load_workbook
+
+    try:
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+    except Exception:
+        return None
+    try:
+        total = 0
+        for sheet in workbook.worksheets:
+            if sheet.max_row is None:
+                # No <dimension> tag; the size is unknown without reading every row
+                return None
+            # Heading, header and separator share the first batch with the rows
+            lines = sheet.max_row + 2
+            if max_rows is not None:
+                lines = min(lines, max_rows + 3)
+            total += max(1, -(-lines // batch_rows))
+        return total
+    finally:
+        workbook.close()
+
+def write_xlsx_sheets(
+    file_path: Union[str, Path],
+    output_dir: Union[str, Path],
+    **options
+) -> List[Path]:
+    """
+    Write each worksheet of a workbook to its own Markdown file
+
+    Files are named "<index>-<sheet>.md" so they sort in workbook order.
+
+    Args:
+        file_path: Path to the .xlsx file
+        output_dir: Directory for the per-sheet files (created if missing)
+        **options: max_rows, max_cols and batch_rows as for iter_xlsx_sheets
+
+    Returns:
+        Paths of the written files in workbook order
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    written = []
+    for index, (name, pieces) in enumerate(iter_xlsx_sheets(file_path, **options), start=1):
+        safe_name = "".join(c if c.isalnum() or c in "-_." else "_" for c in name).strip("._") or "sheet"
+        sheet_file = output_dir / f"{index:02d}-{safe_name}.md"
+        with open(sheet_file, 'w', encoding='utf-8') as f:
+            for text in pieces:
+                f.write(text)
+        written.append(sheet_file)
+    return written
+
+# Format -> function yielding Markdown pieces
+STREAMING_CONVERTERS: Dict[str, Callable[..., Iterator[str]]] = {
+    'pdf': iter_pdf_pages,
+    'xlsx': iter_xlsx,
+}
+
+# Format -> function estimating how many pieces a file will produce
+STREAMING_COUNTERS: Dict[str, Callable[..., Optional[int]]] = {
+    'pdf': count_pdf_pages,
+    'xlsx': count_xlsx_batches,
+}
@@ -0,0 +1,412 @@
+"""
+Incremental directory sync
+
+Mirrors a source tree into Markdown, converting only files that are new
+or changed since the last run. A manifest in the output directory records
+each source's size, mtime, content hash, converter version and outputs:
+files whose size and mtime are unchanged are skipped without being read,
+files that were touched but hash the same are only re-stamped, and
+outputs of sources that disappeared are deleted.
+
+Watch mode re-syncs as soon as filesystem notifications arrive (via the
+optional watchdog package), falling back to periodic polling.
+"""
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+from dataclasses import dataclass, asdict, field
+from importlib import metadata
+import json
+import os
+import tempfile
+import threading
+import time
+
+from .. import __version__
+from .converters import MarkdownConverter, ConversionResult, SUPPORTED_FORMATS
+from .file_handlers import compute_file_hash
+
+# Constants
+MANIFEST_NAME = ".murkdown-manifest.json"
+MANIFEST_FORMAT = 1
+DEFAULT_POLL_INTERVAL = 5.0  # seconds between rescans without notifications
+DEFAULT_DEBOUNCE = 1.0  # seconds of quiet before syncing a burst of events
+
+@dataclass
+class ManifestEntry:
+    """Data class for the recorded state of one source file"""
+    size: int
+    mtime_ns: int
+    content_hash: str
+    converter_version: str
+    outputs: List[str] = field(default_factory=list)  # Relative to the output directory
+
+@dataclass
+class SyncReport:
+    """Data class for the outcome of one sync pass"""
+    converted: List[str] = field(default_factory=list)
+    unchanged: int = 0
+    removed: List[str] = field(default_factory=list)
+    failed: List[ConversionResult] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    @property
+    def changed(self) -> bool:
+        """Whether the pass touched any output"""
+        return bool(self.converted or self.removed)
+
+def converter_version(converter: MarkdownConverter, options: Dict[str, Any]) -> str:
+    """
+    Identify everything that shapes a converter's output
+
+    Upgrading MarkItDown or this package, or changing the rendering flags
+    or conversion options, changes the version and forces reconversion.
+
+    Args:
+        converter: Converter used for the sync
+        options: Conversion options
+
+    Returns:
+        Version string stored in the manifest
+    """
+    try:
+        markitdown_version = metadata.version("markitdown")
+    except metadata.PackageNotFoundError:
+        markitdown_version = "unknown"
+    flags = {
+        'fast': converter.fast_paths,
+        'ocr': converter.ocr,
+        'asr': converter.audio_backend,
+        'compact': converter.compact,
+        **options,
+    }
+    return f"murkdown-{__version__}+markitdown-{markitdown_version}:{json.dumps(flags, sort_keys=True, default=str)}"
+
+class DirectorySync:
+    """Keeps an output directory of Markdown in step with a source directory"""
+
+    def __init__(
+        self,
+        source_dir: Union[str, Path],
+        output_dir: Optional[Union[str, Path]] = None,
+        converter: Optional[MarkdownConverter] = None,
+        recursive: bool = True,
+        workers: int = 1,
+        **options
+    ):
+        """
+        Initialize the sync
+
+        Args:
+            source_dir: Directory to mirror
+            output_dir: Directory for the Markdown tree and the manifest
+                (defaults to source_dir, next to the inputs)
+            converter: Converter to use (defaults to a plain MarkdownConverter)
+            recursive: Mirror subdirectories too
+            workers: Worker processes for converting changed files
+            **options: Conversion options
+        """
+        self.source_dir = Path(source_dir).resolve()
+        self.output_dir = Path(output_dir).resolve() if output_dir is not None else self.source_dir
+        self.converter = converter if converter is not None else MarkdownConverter()
+        self.recursive = recursive
+        self.workers = workers
+        self.options = options
+        self.version = converter_version(self.converter, options)
+        self.manifest_path = self.output_dir / MANIFEST_NAME
+        self.entries: Dict[str, ManifestEntry] = self._load_manifest()
+
+    def sync(self, paths: Optional[Iterable[Union[str, Path]]] = None) -> SyncReport:
+        """
+        Convert new and changed sources and delete orphaned outputs
+
+        Args:
+            paths: Only consider these sources (e.g. from change
+                notifications); None rescans the whole tree
+
+        Returns:
+            SyncReport of the pass
+        """
+        started = time.perf_counter()
+        report = SyncReport()
+        if paths is None:
+            candidates = set(self._scan())
+            gone = set(self.entries) - candidates
+        else:
+            candidates, gone = set(), set()
+            for path in paths:
+                relative = self._relative(Path(path))
+                if relative is None:
+                    continue
+                if (self.source_dir / relative).is_file() and _is_supported(relative):
+                    candidates.add(relative)
+                elif relative in self.entries:
+                    gone.add(relative)
+
+        try:
+            # Snapshot each changed source before converting it, so an edit made
+            # during the conversion is picked up by the next pass
+            pending: Dict[str, ManifestEntry] = {}
+            for relative in sorted(candidates):
+                snapshot = self._check(relative, report)
+                if snapshot is not None:
+                    pending[relative] = snapshot
+            for result in self._convert(list(pending)):
+                self._record(result, pending, report)
+            for relative in sorted(gone):
+                self._remove(relative)
+                report.removed.append(relative)
+        finally:
+            self._save_manifest()
+        report.elapsed = time.perf_counter() - started
+        return report
+
+    def watch(
+        self,
+        on_report: Optional[Callable[[SyncReport], None]] = None,
+        stop: Optional[threading.Event] = None,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        debounce: float = DEFAULT_DEBOUNCE,
+    ) -> None:
+        """
+        Sync now, then keep syncing as the source tree changes
+
+        With watchdog installed, only the paths named by change
+        notifications are re-examined, a second or so after a burst of
+        events settles. Without it, the tree is rescanned every
+        poll_interval seconds (unchanged files cost one stat each).
+
+        Args:
+            on_report: Called with the report of every pass that changed something
+            stop: Event that ends the loop when set (runs until interrupted otherwise)
+            poll_interval: Seconds between rescans when polling
+            debounce: Seconds to wait for more events before syncing
+        """
+        stop = stop if stop is not None else threading.Event()
+        report = self.sync()
+        if on_report is not None:
+            on_report(report)
+
+        try:
+            from watchdog.observers import Observer
+        except ImportError:
+            while not stop.wait(poll_interval):
+                report = self.sync()
+                if report.changed or report.failed:
+                    if on_report is not None:
+                        on_report(report)
+            return
+
+        handler = _ChangeCollector()
+        observer = Observer()
+        observer.schedule(handler, str(self.source_dir), recursive=self.recursive)
+        observer.start()
+        try:
+            while not stop.is_set():
+                if not handler.wait(poll_interval) or stop.is_set():
+                    continue
+                # Let a burst of writes (e.g. a copy in progress) settle
+                while handler.wait(debounce, settle=True) and not stop.is_set():
+                    pass
+                paths, rescan = handler.drain()
+                report = self.sync(None if rescan else paths)
+                if (report.changed or report.failed) and on_report is not None:
+                    on_report(report)
+        finally:
+            observer.stop()
+            observer.join()
+
+    def _scan(self) -> List[str]:
+        """Relative paths of every supported source file"""
+        pattern = "**/*" if self.recursive else "*"
+        sources = []
+        for path in self.source_dir.glob(pattern):
+            relative = self._relative(path)
+            if relative is not None and path.is_file() and _is_supported(relative):
+                sources.append(relative)
+        return sources
+
+    def _relative(self, path: Path) -> Optional[str]:
+        """Source path relative to source_dir, or None if it is not a sync source"""
+        path = Path(os.path.abspath(path))
+        try:
+            relative = path.relative_to(self.source_dir)
+        except ValueError:
+            return None
+        if not self.recursive and len(relative.parts) > 1:
+            return None
+        # Never treat our own outputs as sources when they live in the tree
+        if self.output_dir != self.source_dir and self.output_dir in path.parents:
+            return None
+        return relative.as_posix()
+
+    def _check(self, relative: str, report: SyncReport) -> Optional[ManifestEntry]:
+        """
+        Compare a source with its manifest entry
+
+        Files with the recorded size and mtime are not read; touched files
+        whose content hash is unchanged are only re-stamped.
+
+        Returns:
+            The source's new manifest entry (without outputs) if it needs
+            converting, otherwise None
+        """
+        source = self.source_dir / relative
+        stat = source.stat()
+        entry = self.entries.get(relative)
+        if (
+            entry is not None
+            and entry.converter_version == self.version
+            and all((self.output_dir / output).exists() for output in entry.outputs)
+        ):
+            if stat.st_size == entry.size and stat.st_mtime_ns == entry.mtime_ns:
+                report.unchanged += 1
+                return None
+            content_hash = compute_file_hash(source)
+            if content_hash == entry.content_hash:
+                entry.size, entry.mtime_ns = stat.st_size, stat.st_mtime_ns
+                report.unchanged += 1
+                return None
+        else:
+            content_hash = compute_file_hash(source)
+        return ManifestEntry(
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            content_hash=content_hash,
+            converter_version=self.version,
+        )
+
+    def _convert(self, pending: List[str]) -> Iterable[ConversionResult]:
+        """Convert sources into the mirrored directory layout"""
+        by_dir: Dict[Path, List[Path]] = {}
+        for relative in pending:
+            source = self.source_dir / relative
+            by_dir.setdefault(self.output_dir / Path(relative).parent, []).append(source)
+        for output_dir, sources in by_dir.items():
+            if self.workers > 1 and len(sources) > 1:
+                yield from self.converter.convert_many(
+                    sources, workers=self.workers, output_dir=output_dir, **self.options
+                )
+            else:
+                for source in sources:
+                    yield self.converter.convert_file_streaming(source, output_dir=output_dir, **self.options)
+
+    def _record(self, result: ConversionResult, pending: Dict[str, ManifestEntry], report: SyncReport) -> None:
+        """Update the manifest from a conversion result"""
+        relative = self._relative(Path(result.original_file))
+        if not result.success:
+            # The stale entry (if any) keeps its old hash, so the next pass retries
+            report.failed.append(result)
+            return
+        entry = pending[relative]
+        entry.outputs = [
+            Path(os.path.abspath(output)).relative_to(self.output_dir).as_posix()
+            for output in (result.output_files or [result.output_file])
+        ]
+        previous = self.entries.get(relative)
+        self.entries[relative] = entry
+        if previous is not None:
+            self._delete_outputs(set(previous.outputs) - set(entry.outputs))
+        report.converted.append(relative)
+
+    def _remove(self, relative: str) -> None:
+        """Forget a vanished source and delete its outputs"""
+        entry = self.entries.pop(relative, None)
+        if entry is not None:
+            self._delete_outputs(set(entry.outputs))
+
+    def _delete_outputs(self, outputs: Set[str]) -> None:
+        """Delete outputs no other source still maps to (e.g. a.pdf and a.docx -> a.md)"""
+        in_use = {output for entry in self.entries.values() for output in entry.outputs}
+        for output in outputs - in_use:
+            path = self.output_dir / output
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                continue
+            # Drop directories the deletion emptied, up to the output root
+            for parent in path.parents:
+                if parent == self.output_dir or self.output_dir not in parent.parents:
+                    break
+                try:
+                    parent.rmdir()
+                except OSError:
+                    break
+
+    def _load_manifest(self) -> Dict[str, ManifestEntry]:
+        """Read the manifest, starting fresh if it is missing or unreadable"""
+        try:
+            data = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+            if data.get("format") != MANIFEST_FORMAT:
+                return {}
+            return {relative: ManifestEntry(**entry) for relative, entry in data["files"].items()}
+        except (OSError, ValueError, TypeError, KeyError):
+            return {}
+
+    def _save_manifest(self) -> None:
+        """Write the manifest atomically"""
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        data = {
+            "format": MANIFEST_FORMAT,
+            "source_dir": str(self.source_dir),
+            "files": {relative: asdict(entry) for relative, entry in sorted(self.entries.items())},
+        }
+        fd, part_path = tempfile.mkstemp(dir=self.output_dir, suffix=".part")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=1)
+            os.replace(part_path, self.manifest_path)
+        except BaseException:
+            os.unlink(part_path)
+            raise
+
+class _ChangeCollector:
+    """watchdog event handler that gathers changed paths for the next pass"""
+
+    def __init__(self):
+        """Initialize the collector"""
+        self._condition = threading.Condition()
+        self._paths: Set[str] = set()
+        self._rescan = False
+        self._events = 0
+
+    def dispatch(self, event) -> None:
+        """Record a filesystem event (called on the observer thread)"""
+        with self._condition:
+            if event.is_directory:
+                # Moves and deletions of whole folders name no files
+                self._rescan = self._rescan or event.event_type in ('moved', 'deleted')
+            else:
+                self._paths.add(event.src_path)
+                if getattr(event, 'dest_path', None):
+                    self._paths.add(event.dest_path)
+            self._events += 1
+            self._condition.notify_all()
+
+    def wait(self, timeout: float, settle: bool = False) -> bool:
+        """
+        Wait for events
+
+        Args:
+            timeout: Seconds to wait
+            settle: Report whether new events arrived within timeout, rather
+                than whether any are pending
+
+        Returns:
+            Whether there is (new) work
+        """
+        with self._condition:
+            seen = self._events
+            if not settle and (self._paths or self._rescan):
+                return True
+            return self._condition.wait_for(lambda: self._events != seen, timeout)
+
+    def drain(self) -> Tuple[Set[str], bool]:
+        """Take the pending paths and whether a full rescan is needed"""
+        with self._condition:
+            paths, self._paths = self._paths, set()
+            rescan, self._rescan = self._rescan, False
+            return paths, rescan
+
+def _is_supported(relative: str) -> bool:
+    """Whether a path has a convertible extension"""
+    return Path(relative).suffix.lower()[1:] in SUPPORTED_FORMATS
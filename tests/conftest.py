@@ -0,0 +1,46 @@
+"""
+Shared fixtures for the MurkDown test suite
+"""
+import contextlib
+import zipfile
+from pathlib import Path
+from typing import Dict
+
+import pytest
+
+@pytest.fixture
+def make_zip(tmp_path: Path):
+    """Build a ZIP archive from a {member name: bytes or str} mapping"""
+    def build(name: str, members: Dict[str, object]) -> Path:
+        zip_path = tmp_path / name
+        with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+            for member, data in members.items():
+                archive.writestr(member, data)
+        return zip_path
+    return build
+
+class FastPool:
+    """Converter pool stand-in handing out fast-path converters, which need no MarkItDown"""
+
+    def __init__(self, size: int = 1, gate=None):
+        from src.utils.converters import MarkdownConverter
+
+        self.size = size
+        self.gate = gate
+        self.converter = MarkdownConverter(fast_paths=True)
+
+    @contextlib.contextmanager
+    def lease(self, timeout=None):
+        if self.gate is not None:
+            self.gate.wait()
+        yield self.converter
+
+    @property
+    def stats(self):
+        from src.utils.pool import PoolStats
+
+        return PoolStats(size=self.size, in_use=0, waiting=0, peak_in_use=0, checkouts=0, timeouts=0, total_wait=0.0)
+
+@pytest.fixture
+def fast_pool() -> FastPool:
+    return FastPool()
@@ -0,0 +1,121 @@
+"""
+Tests for ZIP extraction limits and incremental ZIP output
+"""
+import os
+import zipfile
+
+import pytest
+
+from src.utils.archives import ArchiveError, ZipOutput, extract_zip, fit_for_download, zip_extracted_size
+
+def test_extract_skips_unsafe_and_unsupported_members(tmp_path, make_zip):
+    zip_path = make_zip("in.zip", {
+        "../escape.txt": "outside",
+        "/abs.txt": "absolute",
+        "c:evil.txt": "drive",
+        "__MACOSX/._a.txt": "fork",
+        ".hidden.txt": "hidden",
+        "tool.exe": "binary",
+        "docs/ok.txt": "inside",
+    })
+    dest = tmp_path / "dest"
+
+    extracted = extract_zip(zip_path, dest)
+
+    assert extracted == [dest / "docs" / "ok.txt"]
+    assert not (tmp_path / "escape.txt").exists()
+    assert sorted(p.name for p in dest.rglob("*") if p.is_file()) == ["ok.txt"]
+
+def test_extract_skips_symlinks(tmp_path):
+    zip_path = tmp_path / "links.zip"
+    with zipfile.ZipFile(zip_path, "w") as archive:
+        info = zipfile.ZipInfo("link.txt")
+        info.external_attr = (0o120777 << 16)
+        archive.writestr(info, "/etc/passwd")
+        archive.writestr("real.txt", "data")
+
+    assert [p.name for p in extract_zip(zip_path, tmp_path / "dest")] == ["real.txt"]
+
+def test_extract_enforces_file_count(tmp_path, make_zip):
+    zip_path = make_zip("many.zip", {f"{i}.txt": "x" for i in range(5)})
+
+    with pytest.raises(ArchiveError, match="more than 3 files"):
+        extract_zip(zip_path, tmp_path / "dest", max_files=3)
+
+def test_extract_enforces_total_size(tmp_path, make_zip):
+    zip_path = make_zip("big.zip", {"a.txt": "x" * 600, "b.txt": "y" * 600})
+
+    with pytest.raises(ArchiveError, match="expands beyond"):
+        extract_zip(zip_path, tmp_path / "dest", max_bytes=1000)
+
+def test_extract_stops_decompression_bomb(tmp_path, make_zip):
+    zip_path = make_zip("bomb.zip", {"bomb.txt": "0" * (1024 * 1024)})
+
+    with pytest.raises(ArchiveError, match="decompresses beyond"):
+        extract_zip(zip_path, tmp_path / "dest", max_ratio=10)
+    # No partial file is left behind
+    assert not any(p.is_file() for p in (tmp_path / "dest").rglob("*"))
+
+def test_invalid_archive_raises_archive_error(tmp_path):
+    bad = tmp_path / "bad.zip"
+    bad.write_bytes(b"garbage")
+
+    with pytest.raises(ArchiveError, match="Invalid ZIP"):
+        extract_zip(bad, tmp_path / "dest")
+
+def test_extracted_size_counts_convertible_members(make_zip):
+    zip_path = make_zip("in.zip", {"a.txt": "x" * 10, "b.exe": "y" * 100, "c.html": "z" * 5})
+
+    assert zip_extracted_size(zip_path) == 15
+
+def test_zip_output_renames_duplicates_and_appears_on_close(tmp_path):
+    source = tmp_path / "a.md"
+    source.write_text("# A\n")
+    output = ZipOutput(tmp_path / "out.zip")
+
+    names = [output.add_file(source), output.add_file(source), output.add_text("errors.txt", "none")]
+    assert not output.path.exists()
+    output.close()
+
+    assert names == ["a.md", "a-2.md", "errors.txt"]
+    with zipfile.ZipFile(output.path) as archive:
+        assert archive.read("a-2.md") == b"# A\n"
+    assert output.count == 3
+
+def test_zip_output_discard_leaves_nothing(tmp_path):
+    with pytest.raises(RuntimeError):
+        with ZipOutput(tmp_path / "out.zip") as output:
+            output.add_text("a.md", "x")
+            raise RuntimeError("stop")
+
+    assert list(tmp_path.iterdir()) == []
+
+def test_fit_for_download_keeps_small_files(tmp_path):
+    output = tmp_path / "doc.md"
+    output.write_text("# Small\n")
+
+    assert fit_for_download(output, limit=1024) == output
+    assert not (tmp_path / "doc.md.zip").exists()
+
+def test_fit_for_download_zips_large_files_once(tmp_path):
+    output = tmp_path / "doc.md"
+    output.write_text("| cell | cell |\n" * 10_000)
+
+    zipped = fit_for_download(output, limit=16 * 1024)
+
+    assert zipped == tmp_path / "doc.md.zip"
+    with zipfile.ZipFile(zipped) as archive:
+        assert archive.read("doc.md") == output.read_bytes()
+    mtime = zipped.stat().st_mtime_ns
+    assert fit_for_download(output, limit=16 * 1024) == zipped
+    assert zipped.stat().st_mtime_ns == mtime
+
+def test_fit_for_download_declines_what_does_not_fit(tmp_path):
+    output = tmp_path / "noise.md"
+    output.write_bytes(os.urandom(64 * 1024))
+    archive = tmp_path / "batch.zip"
+    archive.write_bytes(os.urandom(64 * 1024))
+
+    assert fit_for_download(output, limit=16 * 1024) is None
+    assert fit_for_download(archive, limit=16 * 1024) is None
+    assert not (tmp_path / "batch.zip.zip").exists()
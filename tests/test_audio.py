@@ -0,0 +1,89 @@
+"""
+Tests for chunked, parallel audio transcription
+"""
+import io
+import math
+import struct
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.utils import audio
+from src.utils.audio import RECOGNIZERS, format_timestamp, iter_audio_transcript, plan_segments, register_recognizer
+from src.utils.parallel import ordered_map
+
+def describe_segment(wav: bytes, language=None) -> str:
+    """Recognizer backend reporting the length of each segment it is given"""
+    with wave.open(io.BytesIO(wav)) as audio:
+        return f"{language or 'any'} {audio.getnframes() / audio.getframerate():.1f}s"
+
+def write_wav(path, pattern, rate=16000):
+    """Write a sequence of tone (True) and silence (False) seconds"""
+    second = {
+        True: b"".join(struct.pack("<h", int(8000 * math.sin(2 * math.pi * 440 * i / rate))) for i in range(rate)),
+        False: bytes(2 * rate),
+    }
+    with wave.open(str(path), "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(rate)
+        f.writeframes(b"".join(second[tone] for tone in pattern))
+
+def test_segments_merge_speech_up_to_the_limit():
+    ranges = [(0, 4000), (5000, 9000), (12000, 13000)]
+
+    assert plan_segments(ranges, 14000, max_segment_ms=10000, padding_ms=0) == [(0, 9000), (12000, 13000)]
+    assert plan_segments(ranges, 13100, max_segment_ms=10000, padding_ms=200) == [(0, 9200), (11800, 13100)]
+
+def test_overlong_speech_is_cut_into_equal_parts():
+    assert plan_segments([(1000, 26000)], 30000, max_segment_ms=10000, padding_ms=0) == [
+        (1000, 9333), (9333, 17666), (17666, 26000)
+    ]
+    assert plan_segments([], 5000) == []
+
+def test_timestamps():
+    assert format_timestamp(0) == "00:00:00"
+    assert format_timestamp(3_725_999) == "01:02:05"
+
+def test_ordered_map_keeps_input_order_with_a_bounded_window():
+    submitted = []
+
+    def items():
+        for value in range(10):
+            submitted.append(value)
+            yield (value,)
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = ordered_map(executor, lambda value: value * value, items(), window=3)
+        first = next(results)
+        assert len(submitted) == 3
+        assert [first, *results] == [value * value for value in range(10)]
+
+def test_recordings_are_transcribed_per_segment(tmp_path, monkeypatch):
+    pytest.importorskip("pydub")
+    monkeypatch.setitem(RECOGNIZERS, "describe", describe_segment)
+    path = tmp_path / "talk.wav"
+    # Longer than one segment, with a pause to split at
+    write_wav(path, [True] * 20 + [False] * 2 + [True] * 15)
+
+    transcript = "".join(iter_audio_transcript(path, audio_backend="describe", audio_language="en", audio_workers=2))
+
+    assert transcript == (
+        "### Audio Transcript:\n\n"
+        "**[00:00:00 – 00:00:20]** en 20.2s\n\n"
+        "**[00:00:21 – 00:00:37]** en 15.2s\n\n"
+    )
+
+def test_unknown_backends_are_rejected(tmp_path):
+    pytest.importorskip("pydub")
+
+    with pytest.raises(ValueError, match="Unknown audio backend"):
+        next(iter_audio_transcript(tmp_path / "talk.wav", audio_backend="nope"))
+
+def test_register_recognizer(monkeypatch):
+    monkeypatch.setattr(audio, "RECOGNIZERS", dict(RECOGNIZERS))
+
+    register_recognizer("describe", describe_segment)
+
+    assert audio.RECOGNIZERS["describe"] is describe_segment
@@ -0,0 +1,50 @@
+"""
+Tests for the synthetic benchmark corpus and report helpers
+"""
+import wave
+
+from benchmarks.bench_formats import compare, percentile, summarize
+from benchmarks.corpus import AUDIO_SECONDS_PER_PAGE, CHARS_PER_PAGE, generate_corpus
+from src.utils.sniff import sniff_file
+
+def test_corpus_is_deterministic_per_seed(tmp_path):
+    first = generate_corpus(tmp_path / "a", ["txt", "html"], sizes={"small": 2})
+    again = generate_corpus(tmp_path / "b", ["txt", "html"], sizes={"small": 2})
+    other = generate_corpus(tmp_path / "c", ["txt"], sizes={"small": 2}, seed=1)
+
+    assert [f.path.name for f in first] == ["small-2p.txt", "small-2p.html"]
+    assert [f.path.read_bytes() for f in first] == [f.path.read_bytes() for f in again]
+    assert other[0].path.read_bytes() != first[0].path.read_bytes()
+    assert first[0].bytes >= 2 * CHARS_PER_PAGE
+
+def test_existing_files_are_reused(tmp_path):
+    (corpus_file,) = generate_corpus(tmp_path, ["txt"], sizes={"small": 1})
+    corpus_file.path.write_text("edited")
+
+    (reused,) = generate_corpus(tmp_path, ["txt"], sizes={"small": 1})
+
+    assert reused.path.read_text() == "edited"
+
+def test_generated_files_match_their_format(tmp_path):
+    pdf, wav = generate_corpus(tmp_path, ["pdf", "wav"], sizes={"small": 3})
+
+    assert sniff_file(pdf.path) == "pdf"
+    assert pdf.path.read_bytes().count(b"/Type /Page ") == 3
+    with wave.open(str(wav.path)) as audio:
+        assert audio.getnframes() / audio.getframerate() == 3 * AUDIO_SECONDS_PER_PAGE
+
+def test_percentile_uses_nearest_rank():
+    values = [5, 1, 4, 2, 3]
+
+    assert percentile(values, 50) == 3
+    assert percentile(values, 95) == 5
+    assert percentile(values, 1) == 1
+    assert percentile([], 50) == 0.0
+
+def test_summary_and_comparison():
+    summary = summarize([0.5, 1.5], total_bytes=2 * 1024 * 1024, total_pages=10)
+
+    assert summary == {'runs': 2, 'p50_ms': 500.0, 'p95_ms': 1500.0, 'mb_per_s': 1.0, 'pages_per_s': 5.0}
+    baseline = {'results': {'txt': {'p50_ms': 100.0, 'mb_per_s': 2.0}, 'pdf': {'error': 'missing'}}}
+    current = {'results': {'txt': {'p50_ms': 150.0, 'p95_ms': 1.0, 'mb_per_s': 1.0}, 'pdf': {'p50_ms': 1.0}}}
+    assert compare(current, baseline) == ["txt    p50_ms +50.0%  mb_per_s -50.0%"]
@@ -0,0 +1,98 @@
+"""
+Tests for the content-addressed conversion cache
+"""
+from src.utils.cache import CachedConversion, ConversionCache
+from src.utils.converters import MarkdownConverter
+
+def test_keys_depend_on_content_and_options():
+    key = ConversionCache.make_key("abc", {"b": 1, "a": 2})
+
+    assert key == ConversionCache.make_key("abc", {"a": 2, "b": 1})
+    assert key != ConversionCache.make_key("abd", {"a": 2, "b": 1})
+    assert key != ConversionCache.make_key("abc", {"a": 2})
+    assert ConversionCache.make_key("abc") == ConversionCache.make_key("abc", {})
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = ConversionCache(max_items=2)
+    cache.put("a", CachedConversion("A"))
+    cache.put("b", CachedConversion("B"))
+    cache.get("a")
+    cache.put("c", CachedConversion("C"))
+
+    assert cache.get("b") is None
+    assert cache.get("a").content == "A"
+    assert cache.get("c").content == "C"
+    stats = cache.stats
+    assert (stats.memory_items, stats.evictions, stats.memory_hits, stats.misses) == (2, 1, 3, 1)
+
+def test_memory_tier_respects_byte_budget():
+    cache = ConversionCache(max_memory_bytes=10)
+    cache.put("big", CachedConversion("x" * 11))
+    cache.put("a", CachedConversion("x" * 6))
+    cache.put("b", CachedConversion("x" * 6))
+
+    assert cache.get("big") is None
+    assert cache.get("a") is None
+    assert cache.stats.memory_bytes == 6
+
+def test_memory_budget_counts_utf8_bytes():
+    cache = ConversionCache(max_memory_bytes=10)
+    cache.put("a", CachedConversion("ü" * 4))  # 4 characters, 8 bytes
+    cache.put("b", CachedConversion("é" * 2))
+
+    assert cache.get("a") is None
+    assert cache.get("b").content == "éé"
+    assert cache.stats.memory_bytes == 4
+
+def test_disk_tier_survives_a_new_cache(tmp_path):
+    ConversionCache(cache_dir=tmp_path).put("k" * 64, CachedConversion("# Doc", title="Doc"))
+
+    reopened = ConversionCache(cache_dir=tmp_path)
+
+    assert reopened.stats.disk_items == 1
+    entry = reopened.get("k" * 64)
+    assert (entry.content, entry.title) == ("# Doc", "Doc")
+    assert reopened.stats.disk_hits == 1
+    assert reopened.get("k" * 64) is entry  # Promoted to memory
+
+def test_disk_tier_evicts_to_budget(tmp_path):
+    cache = ConversionCache(max_items=0, cache_dir=tmp_path, max_disk_bytes=100)
+    for name in "abc":
+        cache.put(name * 64, CachedConversion("x" * 40))
+
+    assert cache.stats.disk_bytes <= 100
+    assert cache.get("a" * 64) is None
+    assert cache.get("c" * 64) is not None
+
+def test_clear_empties_both_tiers(tmp_path):
+    cache = ConversionCache(cache_dir=tmp_path)
+    cache.put("k" * 64, CachedConversion("x"))
+    cache.clear()
+
+    assert cache.get("k" * 64) is None
+    assert list(tmp_path.glob("*/*.json")) == []
+
+def test_converter_serves_repeated_content_from_cache(tmp_path):
+    converter = MarkdownConverter(cache=ConversionCache(), fast_paths=True)
+    first = tmp_path / "a.txt"
+    first.write_text("hello")
+    copy = tmp_path / "b.txt"
+    copy.write_text("hello")
+
+    assert converter.convert_file(first).cached is False
+    result = converter.convert_file(copy)
+
+    assert result.success and result.cached
+    assert (tmp_path / "b.md").read_text() == result.content
+
+def test_converter_misses_after_content_changes(tmp_path):
+    converter = MarkdownConverter(cache=ConversionCache(), fast_paths=True)
+    path = tmp_path / "a.txt"
+    path.write_text("hello")
+    converter.convert_file(path)
+    path.write_text("goodbye")
+
+    result = converter.convert_file(path)
+
+    assert result.cached is False
+    assert "goodbye" in result.content
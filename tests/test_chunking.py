@@ -0,0 +1,108 @@
+"""
+Tests for heading-aware, token-budgeted chunking
+"""
+import json
+
+import pytest
+
+from src.utils.chunking import MarkdownChunker, approximate_token_counts, iter_chunks, write_jsonl
+from src.utils.converters import MarkdownConverter
+
+def count_words(texts):
+    """Deterministic stand-in for a tokenizer: one token per word"""
+    return [len(text.split()) for text in texts]
+
+def paragraph(label, words):
+    return " ".join(f"{label}{i}" for i in range(words)) + "."
+
+DOCUMENT = "\n\n".join([
+    "# Guide",
+    paragraph("intro", 6),
+    "## Setup",
+    paragraph("a", 8),
+    paragraph("b", 8),
+    paragraph("c", 8),
+    "```\ncode line\n\nstill code\n```",
+    "## Usage",
+    paragraph("d", 4),
+]) + "\n"
+
+def chunk(text, max_tokens=20, overlap_tokens=0, pieces=None):
+    chunker = MarkdownChunker(max_tokens, overlap_tokens, counter=count_words, source="guide.md")
+    chunks = []
+    for piece in pieces or [text]:
+        chunks.extend(chunker.feed(piece))
+    return chunks + chunker.close()
+
+def test_headings_start_chunks_and_set_the_section():
+    chunks = chunk(DOCUMENT)
+
+    assert [c.section for c in chunks] == [["Guide"], ["Guide", "Setup"], ["Guide", "Setup"], ["Guide", "Usage"]]
+    assert chunks[0].text == "# Guide\n\n" + paragraph("intro", 6)
+    assert chunks[3].text == "## Usage\n\n" + paragraph("d", 4)
+    assert all(c.tokens <= 20 for c in chunks)
+    assert [c.index for c in chunks] == [0, 1, 2, 3]
+
+def test_offsets_point_into_the_document():
+    for c in chunk(DOCUMENT):
+        assert DOCUMENT[c.start:c.end] == c.text
+
+def test_fenced_code_stays_in_one_block():
+    chunks = chunk(DOCUMENT)
+
+    assert any(c.text.endswith("```\ncode line\n\nstill code\n```") for c in chunks)
+
+def test_split_chunks_repeat_the_tail_of_their_predecessor():
+    first, second = [c for c in chunk(DOCUMENT, overlap_tokens=8) if c.section == ["Guide", "Setup"]][:2]
+
+    assert second.text.startswith(paragraph("b", 8))
+    assert first.text.endswith(paragraph("b", 8))
+
+def test_piece_boundaries_do_not_change_the_chunks():
+    whole = chunk(DOCUMENT, overlap_tokens=4)
+    by_character = chunk(DOCUMENT, overlap_tokens=4, pieces=list(DOCUMENT))
+
+    assert [(c.text, c.start, c.end, c.section) for c in by_character] == [
+        (c.text, c.start, c.end, c.section) for c in whole
+    ]
+
+def test_oversized_blocks_are_split_at_sentences_then_words_then_characters():
+    text = "One two three. Four five six. Seven eight nine ten eleven.\n\n" + "x" * 50
+    chunker = MarkdownChunker(4, 0, counter=lambda texts: [len(t.split()) + len(t) // 10 for t in texts])
+
+    pieces = chunker.feed(text) + chunker.close()
+
+    assert all(p.tokens <= 4 for p in pieces)
+    assert "".join(p.text for p in pieces if p.text.startswith("x")) == "x" * 50
+    assert pieces[0].text.startswith("One two")
+
+def test_invalid_budgets():
+    with pytest.raises(ValueError):
+        MarkdownChunker(0, 0)
+    with pytest.raises(ValueError):
+        MarkdownChunker(10, 10)
+
+def test_jsonl_records(tmp_path):
+    output = tmp_path / "guide.jsonl"
+
+    count = write_jsonl(iter_chunks([DOCUMENT], max_tokens=30, overlap_tokens=0, source="guide.md"), output)
+
+    records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert len(records) == count
+    assert records[0]["id"] == "guide.md#0"
+    assert records[0]["section"] == ["Guide"]
+    assert set(records[0]) == {"id", "source", "index", "section", "start", "end", "tokens", "text"}
+
+def test_converter_writes_chunks_next_to_the_input(tmp_path):
+    path = tmp_path / "guide.txt"
+    path.write_text(DOCUMENT)
+
+    result = MarkdownConverter(fast_paths=True).convert_file_chunks(path, max_tokens=30, overlap_tokens=0)
+
+    assert result.success and result.output_file == str(tmp_path / "guide.jsonl")
+    records = [json.loads(line) for line in (tmp_path / "guide.jsonl").read_text(encoding="utf-8").splitlines()]
+    assert records[-1]["section"] == ["Guide", "Usage"]
+    assert all(record["source"] == "guide.txt" for record in records)
+
+def test_approximate_counts_track_word_pieces():
+    assert approximate_token_counts(["", "cat", "internationalization", "a, b."]) == [0, 1, 5, 4]
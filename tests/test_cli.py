@@ -0,0 +1,94 @@
+"""
+Tests for the murkdown command line interface
+"""
+import subprocess
+import sys
+from pathlib import Path
+
+from src.cli import expand_archives, expand_inputs, main
+
+def test_zip_members_without_output_dir_are_kept(tmp_path, make_zip):
+    zip_path = make_zip("batch.zip", {
+        "a.txt": "first document\n",
+        "sub/b.html": "<h1>Title</h1><p>body</p>",
+    })
+
+    assert main(["--fast", "-q", str(zip_path)]) == 0
+
+    first = tmp_path / "batch" / "a.md"
+    second = tmp_path / "batch" / "sub" / "b.md"
+    assert first.read_text(encoding="utf-8").strip() == "first document"
+    assert "Title" in second.read_text(encoding="utf-8")
+
+def test_zip_members_go_to_output_dir(tmp_path, make_zip):
+    zip_path = make_zip("batch.zip", {"a.txt": "hello\n"})
+    out = tmp_path / "out"
+
+    assert main(["--fast", "-q", "-o", str(out), str(zip_path)]) == 0
+
+    assert (out / "a.md").is_file()
+    assert not (tmp_path / "batch").exists()
+
+def test_zip_output_collects_members(tmp_path, make_zip):
+    import zipfile
+
+    zip_path = make_zip("batch.zip", {"a.txt": "hello\n", "b.txt": "world\n"})
+    archive = tmp_path / "md.zip"
+
+    assert main(["--fast", "-q", "--zip", str(archive), str(zip_path)]) == 0
+
+    with zipfile.ZipFile(archive) as result:
+        assert sorted(result.namelist()) == ["a.md", "b.md"]
+
+def test_expand_archives_reports_bad_archive(tmp_path):
+    bad = tmp_path / "bad.zip"
+    bad.write_bytes(b"not a zip")
+    plain = tmp_path / "doc.txt"
+    plain.write_text("x")
+
+    files, failed, member_dirs = expand_archives([plain, bad], tmp_path / "work")
+
+    assert files == [plain]
+    assert [Path(result.original_file) for result in failed] == [bad]
+    assert member_dirs == {}
+
+def test_plain_inputs_write_next_to_input(tmp_path):
+    source = tmp_path / "note.txt"
+    source.write_text("some text\n")
+
+    assert main(["--fast", "-q", str(source)]) == 0
+
+    assert (tmp_path / "note.md").read_text(encoding="utf-8").strip() == "some text"
+
+def test_expand_inputs_filters_expanded_files_only(tmp_path):
+    (tmp_path / "a.txt").write_text("a")
+    (tmp_path / "b.exe").write_bytes(b"MZ")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "c.html").write_text("<p>c</p>")
+    named = tmp_path / "notes.xyz"
+    named.write_text("x")
+
+    assert expand_inputs([str(tmp_path)]) == [tmp_path / "a.txt"]
+    assert expand_inputs([str(tmp_path)], recursive=True) == [tmp_path / "a.txt", tmp_path / "sub" / "c.html"]
+    assert expand_inputs([str(tmp_path / "*")]) == [tmp_path / "a.txt"]
+    assert expand_inputs([str(named), str(tmp_path / "a.txt"), str(tmp_path)]) == [named, tmp_path / "a.txt"]
+
+def test_exit_codes(tmp_path):
+    good = tmp_path / "a.txt"
+    good.write_text("hello")
+    bad = tmp_path / "b.xyz"
+    bad.write_text("x")
+
+    assert main(["--fast", "-q", str(good)]) == 0
+    assert (tmp_path / "a.md").read_text(encoding="utf-8").strip() == "hello"
+    assert main(["--fast", "-q", str(good), str(bad)]) == 1
+    assert main(["-q", str(tmp_path / "*.pdf")]) == 2
+
+def test_import_does_not_load_converters_or_streamlit():
+    code = "import sys, src.cli; print(sorted({'markitdown', 'streamlit', 'openpyxl', 'pdfminer'} & set(sys.modules)))"
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True,
+        cwd=Path(__file__).resolve().parent.parent,
+    ).stdout
+
+    assert output.strip() == "[]"
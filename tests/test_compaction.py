@@ -0,0 +1,109 @@
+"""
+Tests for single-pass Markdown compaction
+"""
+from src.utils.compaction import BOILERPLATE_MIN_REPEATS, FURNITURE_MIN_PAGES, MarkdownCompactor, compact_markdown, iter_compacted
+
+def page(*lines: str) -> str:
+    """One PDF-like page ending in a form feed"""
+    return "\n".join(lines) + "\n\f"
+
+def test_similar_edge_lines_on_two_pages_are_kept():
+    text = page("Step 1", "", "Mix the flour and the water.") + page("Step 2", "", "Knead the dough well.")
+
+    output, stats = compact_markdown(text)
+
+    assert "Step 1" in output
+    assert "Step 2" in output
+    assert stats.furniture_lines == 0
+
+def test_lone_number_at_page_edge_is_kept():
+    text = page("Results for the year", "", "Revenue grew by a tenth.", "2023") + page("Outlook", "", "More of the same.")
+
+    output, _ = compact_markdown(text)
+
+    assert "2023" in output.splitlines()
+
+def test_numbers_that_do_not_follow_the_page_are_kept():
+    text = "".join(page(f"Step {n * 3}", "", f"Body of page {n} is unique here.") for n in range(1, 6))
+
+    output, stats = compact_markdown(text)
+
+    assert [line for line in output.splitlines() if line.startswith("Step")] == [f"Step {n * 3}" for n in range(1, 6)]
+    assert stats.furniture_lines == 0
+
+def test_running_headers_and_page_numbers_are_dropped_once_repeated():
+    pages = 6
+    text = "".join(
+        page("Acme Annual Report 2024", "", f"Unique body text number {n} on this page.", "", f"Page {n} of {pages}")
+        for n in range(1, pages + 1)
+    )
+
+    output, stats = compact_markdown(text)
+    lines = output.splitlines()
+
+    kept = FURNITURE_MIN_PAGES - 1
+    assert lines.count("Acme Annual Report 2024") == kept
+    assert [line for line in lines if line.startswith("Page ")] == [f"Page {n} of {pages}" for n in range(1, kept + 1)]
+    assert all(f"Unique body text number {n} on this page." in lines for n in range(1, pages + 1))
+    assert stats.furniture_lines == 2 * (pages - kept)
+
+def test_fenced_code_is_kept_byte_for_byte():
+    code = "```python\ndef f(a,    b):\t\n    return a  +  b   \n\n\n```"
+    text = f"Intro   text   \n\n{code}\n\nAfter.\n"
+
+    output, _ = compact_markdown(text)
+
+    assert code in output
+    assert output.startswith("Intro text\n")
+
+def test_whitespace_tables_and_empty_sections():
+    text = (
+        "# Title\n\n## Empty\n\n## Filled\n\nSome   words\there.   \n\n\n\n"
+        "| a    | b   |\n|------|:---:|\n| 1    | 2   |\n"
+    )
+
+    output, stats = compact_markdown(text)
+
+    assert output == "# Title\n\n## Filled\n\nSome words here.\n\n| a | b |\n| --- | :---: |\n| 1 | 2 |\n"
+    assert stats.empty_sections == 1
+    assert stats.bytes_saved == len(text) - len(output)
+
+def test_repeated_boilerplate_is_dropped_after_min_repeats():
+    disclaimer = "This document is provided for information purposes only."
+    copies = BOILERPLATE_MIN_REPEATS + 2
+    text = "".join(f"{disclaimer}\n\nPart {n}.\n\n" for n in range(copies)) + "Yes.\n\nYes.\n"
+
+    output, stats = compact_markdown(text)
+
+    assert output.count(disclaimer) == BOILERPLATE_MIN_REPEATS - 1
+    assert output.count("Yes.") == 2
+    assert stats.duplicate_lines == copies - (BOILERPLATE_MIN_REPEATS - 1)
+
+def test_line_repeated_under_different_headings_is_kept():
+    step = "- Preheat the oven to 180 degrees Celsius for ten minutes."
+    text = (
+        f"# Bread\n\n{step}\n- Bake for forty minutes.\n\n"
+        f"# Cake\n\n{step}\n- Bake for twenty-five minutes.\n"
+    )
+
+    output, stats = compact_markdown(text)
+
+    assert output.count(step) == 2
+    assert output.index("# Cake") < output.rindex(step)
+    assert stats.duplicate_lines == 0
+
+def test_streamed_output_matches_whole_document():
+    pages = [
+        page("Header", "", f"Paragraph   {n} with    padding.", "", "| x  | y |", "", str(n))
+        for n in range(1, 8)
+    ]
+    whole, stats = compact_markdown("".join(pages))
+
+    # Split the pieces mid-line to exercise the partial line handling
+    text = "".join(pages)
+    pieces = [text[i:i + 7] for i in range(0, len(text), 7)]
+    compactor = MarkdownCompactor()
+    streamed = "".join(iter_compacted(pieces, compactor))
+
+    assert streamed == whole
+    assert compactor.stats.bytes_saved == stats.bytes_saved
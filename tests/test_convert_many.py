@@ -0,0 +1,52 @@
+"""
+Tests for parallel batch conversion
+"""
+from pathlib import Path
+
+from src.utils.cache import ConversionCache
+from src.utils.converters import MarkdownConverter
+
+def write_inputs(directory: Path, count: int):
+    paths = []
+    for i in range(count):
+        path = directory / f"doc{i}.txt"
+        path.write_text(f"document {i}\n")
+        paths.append(path)
+    return paths
+
+def test_converts_every_file_in_worker_processes(tmp_path):
+    inputs = write_inputs(tmp_path, 4)
+    output_dir = tmp_path / "out"
+
+    results = list(MarkdownConverter(fast_paths=True).convert_many(inputs, workers=2, output_dir=output_dir))
+
+    assert sorted(Path(r.original_file).name for r in results) == [p.name for p in inputs]
+    assert all(r.success for r in results)
+    for i in range(4):
+        assert f"document {i}" in (output_dir / f"doc{i}.md").read_text()
+
+def test_failures_do_not_affect_other_files(tmp_path):
+    inputs = write_inputs(tmp_path, 2)
+    unsupported = tmp_path / "tool.exe"
+    unsupported.write_bytes(b"MZ")
+    missing = tmp_path / "missing.txt"
+
+    results = {
+        Path(r.original_file).name: r
+        for r in MarkdownConverter(fast_paths=True).convert_many([unsupported, *inputs, missing], workers=2)
+    }
+
+    assert not results["tool.exe"].success
+    assert "does not exist" in results["missing.txt"].error
+    assert results["doc0.txt"].success and results["doc1.txt"].success
+
+def test_cache_hits_skip_the_workers_and_worker_results_fill_the_cache(tmp_path):
+    converter = MarkdownConverter(cache=ConversionCache(), fast_paths=True)
+    inputs = write_inputs(tmp_path, 2)
+
+    first = list(converter.convert_many(inputs, workers=1))
+    second = list(converter.convert_many(inputs, workers=1))
+
+    assert [r.cached for r in first] == [False, False]
+    assert [r.cached for r in second] == [True, True]
+    assert converter.cache.stats.hits == 2
@@ -0,0 +1,100 @@
+"""
+Tests for MinHash LSH near-duplicate detection
+"""
+import random
+
+import pytest
+
+from src.utils.dedup import lsh_params
+
+def test_lsh_params_keep_the_candidate_threshold_below_the_target():
+    for threshold in (0.5, 0.8, 0.95):
+        bands, rows = lsh_params(128, threshold)
+
+        assert bands * rows == 128
+        assert (1 / bands) ** (1 / rows) < threshold
+    assert lsh_params(128, 0.8) == (16, 8)
+    assert lsh_params(7, 0.01) == (7, 1)
+
+@pytest.fixture
+def index():
+    pytest.importorskip("numpy")
+    from src.utils.dedup import NearDuplicateIndex
+    return NearDuplicateIndex(threshold=0.8)
+
+def document(seed, words=400):
+    rng = random.Random(seed)
+    return " ".join(f"w{rng.randrange(5000)}" for _ in range(words))
+
+def edited(text, every):
+    """Change one word in every `every`"""
+    words = text.split()
+    return " ".join("changed" if i % every == 0 else word for i, word in enumerate(words))
+
+def test_near_duplicates_match_and_distinct_documents_do_not(index):
+    original = document(1)
+
+    assert index.check("a.md", original) is None
+    match = index.check("b.md", edited(original, 200))
+
+    assert match.key == "b.md" and match.duplicate_of == "a.md"
+    assert 0.8 <= match.similarity < 1.0
+    assert index.check("c.md", document(2)) is None
+    assert index.check("d.md", edited(original, 4)) is None
+    assert len(index) == 4
+
+def test_reconverting_a_document_does_not_match_itself(index):
+    text = document(1)
+    index.check("a.md", text)
+
+    assert index.check("a.md", text) is None
+    assert len(index) == 1
+
+def test_skipped_duplicates_are_not_indexed(index):
+    text = document(1)
+    index.check("a.md", text)
+
+    assert index.check("b.md", text, index_duplicates=False).duplicate_of == "a.md"
+    assert index.check("c.md", text).duplicate_of == "a.md"
+    assert len(index) == 2
+
+def test_texts_without_words_are_ignored(index):
+    assert index.check("empty.md", "| --- | --- |\n") is None
+    assert len(index) == 0
+
+def test_similarity_estimates_jaccard(index):
+    first = document(3, words=2000)
+    words = first.split()
+    second = " ".join(words[:1000] + document(4, words=1000).split())
+    shingles = [
+        {tuple(text.split()[i:i + 5]) for i in range(len(text.split()) - 4)} for text in (first, second)
+    ]
+    jaccard = len(shingles[0] & shingles[1]) / len(shingles[0] | shingles[1])
+    signatures = [index.signature(text) for text in (first, second)]
+
+    assert float((signatures[0] == signatures[1]).mean()) == pytest.approx(jaccard, abs=0.1)
+
+def test_saved_indexes_keep_matching(index, tmp_path):
+    from src.utils.dedup import NearDuplicateIndex
+
+    text = document(1)
+    index.check("a.md", text)
+    index.save(tmp_path / "index.npz")
+
+    loaded = NearDuplicateIndex.load(tmp_path / "index.npz")
+
+    assert (loaded.threshold, len(loaded)) == (0.8, 1)
+    assert loaded.check("b.md", edited(text, 200)).duplicate_of == "a.md"
+    assert NearDuplicateIndex.load(tmp_path / "index.npz", threshold=0.5).threshold == 0.5
+
+def test_cli_drops_near_duplicate_outputs(tmp_path, index):
+    from src.cli import main
+
+    text = document(1)
+    (tmp_path / "a.txt").write_text(text)
+    (tmp_path / "b.txt").write_text(edited(text, 200))
+
+    assert main(["--fast", "-q", "--dedup", "skip", str(tmp_path / "a.txt"), str(tmp_path / "b.txt")]) == 0
+
+    assert (tmp_path / "a.md").exists()
+    assert not (tmp_path / "b.md").exists()
@@ -0,0 +1,70 @@
+"""
+Tests for the lightweight text and HTML converters
+"""
+import codecs
+
+import pytest
+
+from src.utils import fast_paths
+from src.utils.converters import MarkdownConverter
+from src.utils.fast_paths import convert_html, convert_text, detect_encoding
+
+@pytest.mark.parametrize("head, html, expected", [
+    (codecs.BOM_UTF8 + b"text", False, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE + "text".encode("utf-16-le"), False, "utf-16"),
+    (b'<meta charset="iso-8859-1"><p>caf\xe9', True, "iso8859-1"),
+    (b'<meta charset="no-such-codec">', True, "utf-8"),
+    ("café".encode("utf-8")[:-1], False, "utf-8"),
+    (b"caf\xe9 cr\xe8me", False, "cp1252"),
+])
+def test_detect_encoding(head, html, expected):
+    assert detect_encoding(head, html) == expected
+
+def test_text_line_endings_are_normalized_across_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(fast_paths, "READ_CHUNK_SIZE", 3)
+    monkeypatch.setattr(fast_paths, "DETECT_BYTES", 3)
+    path = tmp_path / "doc.txt"
+    path.write_bytes(b"ab\r\ncd\ref\x00g\r")
+
+    assert convert_text(path) == ("ab\ncd\nefg\n", None)
+
+def test_multibyte_characters_split_across_chunks(tmp_path, monkeypatch):
+    monkeypatch.setattr(fast_paths, "READ_CHUNK_SIZE", 1)
+    monkeypatch.setattr(fast_paths, "DETECT_BYTES", 4)
+    path = tmp_path / "doc.txt"
+    path.write_text("déjà vu ☕", encoding="utf-8")
+
+    assert convert_text(path)[0] == "déjà vu ☕"
+
+def test_html_renders_common_elements(tmp_path):
+    path = tmp_path / "page.html"
+    path.write_text(
+        "<html><head><title> The  Page </title><style>p{}</style></head><body>"
+        "<h2>Intro</h2><p>Some <strong>bold</strong> and <a href='/x'>a link</a>.</p>"
+        "<ul><li>one</li><li>two<ol><li>nested</li></ol></li></ul>"
+        "<table><tr><th>A</th><th>B|C</th></tr><tr><td>1</td><td>2</td></tr></table>"
+        "<pre>code\n  kept</pre><script>ignored()</script>"
+        "</body></html>"
+    )
+
+    markdown, title = convert_html(path)
+
+    assert title == "The Page"
+    assert markdown == (
+        "## Intro\n\n"
+        "Some **bold** and [a link](/x).\n\n"
+        "- one\n- two\n  1. nested\n\n"
+        "| A | B\\|C |\n| --- | --- |\n| 1 | 2 |\n\n"
+        "```\ncode\n  kept\n```\n\n"
+    )
+
+def test_converter_uses_fast_paths_only_when_enabled(tmp_path):
+    path = tmp_path / "page.html"
+    path.write_text("<title>T</title><p>hi</p>")
+    fast = MarkdownConverter(fast_paths=True)
+
+    result = fast.convert_file(path)
+
+    assert (result.content, result.title) == ("hi\n\n", "T")
+    assert fast._markitdown is None
+    assert list(fast.iter_markdown(path)) == ["hi\n\n"]
@@ -0,0 +1,79 @@
+"""
+Tests for spooling uploads and request bodies to disk
+"""
+import io
+
+import pytest
+
+from src.utils import file_handlers
+from src.utils.converters import MarkdownConverter
+from src.utils.file_handlers import (
+    compute_buffer_hash,
+    compute_file_hash,
+    save_uploaded_file,
+    spool_stream,
+    spooled_hash,
+)
+
+@pytest.fixture
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(file_handlers, "HASH_CHUNK_SIZE", 4)
+
+def test_uploads_are_stored_under_their_content_hash(tmp_path, small_chunks):
+    data = b"hello spooled world"
+    upload = io.BytesIO(data)
+    upload.name = "dir/notes.txt"
+
+    path = save_uploaded_file(upload, tmp_path)
+
+    assert path == tmp_path / compute_buffer_hash(data) / "notes.txt"
+    assert path.read_bytes() == data
+    assert spooled_hash(path) == compute_file_hash(path)
+    assert list(tmp_path.rglob("*.part")) == []
+
+def test_file_objects_are_hashed_while_written(tmp_path, small_chunks):
+    data = b"x" * 10 + b"y" * 7
+    source = tmp_path / "source" / "upload.txt"
+    source.parent.mkdir()
+    source.write_bytes(data)
+
+    with open(source, "rb") as upload:
+        upload.read(3)
+        path = save_uploaded_file(upload, tmp_path / "spool")
+
+    assert path == tmp_path / "spool" / compute_buffer_hash(data) / "upload.txt"
+    assert path.read_bytes() == data
+
+def test_same_bytes_reuse_the_spooled_file(tmp_path):
+    first = spool_stream(io.BytesIO(b"same"), "a.txt", tmp_path)
+    mtime = first.stat().st_mtime_ns
+
+    again = spool_stream(io.BytesIO(b"same"), "a.txt", tmp_path)
+
+    assert again == first
+    assert first.stat().st_mtime_ns == mtime
+    assert list(tmp_path.rglob("*.part")) == []
+
+def test_length_limits_the_bytes_read(tmp_path):
+    stream = io.BytesIO(b"bodytrailing")
+
+    path = spool_stream(stream, "a.txt", tmp_path, length=4)
+
+    assert path.read_bytes() == b"body"
+    assert stream.read() == b"trailing"
+
+def test_short_streams_leave_nothing_behind(tmp_path):
+    with pytest.raises(OSError, match="3 bytes early"):
+        spool_stream(io.BytesIO(b"abc"), "a.txt", tmp_path, length=6)
+
+    assert list(tmp_path.iterdir()) == []
+
+def test_convert_stream_rejects_without_parsing():
+    converter = MarkdownConverter()
+
+    unsupported = converter.convert_stream(io.BytesIO(b"MZ"), "tool.exe")
+    mismatched = converter.convert_stream(io.BytesIO(b"%PDF-1.7\n"), "notes.txt")
+
+    assert not unsupported.success and "Unsupported" in unsupported.error
+    assert not mismatched.success and mismatched.detected_format == "pdf"
+    assert converter._markitdown is None
@@ -0,0 +1,96 @@
+"""
+Tests for the persistent conversion history
+"""
+import threading
+
+import pytest
+
+from src.utils.converters import ConversionResult
+from src.utils.file_handlers import compute_file_hash
+from src.utils.history import HistoryStore
+
+@pytest.fixture
+def history(tmp_path):
+    store = HistoryStore(tmp_path / "history.sqlite3")
+    yield store
+    store.close()
+
+def result(name="a.txt", success=True, output_file=None, **fields):
+    return ConversionResult(
+        success=success,
+        original_file=name,
+        output_file=output_file,
+        error=None if success else "broken",
+        detected_format="txt",
+        timings={"total": 0.5, "convert": 0.4},
+        **fields
+    )
+
+def test_record_and_find_by_hash(history, tmp_path):
+    output = tmp_path / "a.md"
+    output.write_text("# A\n")
+    history.record(result(output_file=str(output), input_bytes=3), session_id="s", content_hash="h1")
+    history.record(result(success=False), session_id="s", content_hash="h2")
+
+    entry = history.find("h1")
+
+    assert entry.file_name == "a.txt"
+    assert entry.output_available
+    assert entry.timings == {"total": 0.5, "convert": 0.4}
+    assert entry.to_result().input_bytes == 3
+    # Failed conversions are never reused
+    assert history.find("h2") is None
+    assert history.find("unknown") is None
+
+def test_find_returns_most_recent_success(history):
+    history.record(result(output_file="/first.md"), content_hash="h")
+    history.record(result(output_file="/second.md"), content_hash="h")
+
+    assert history.find("h").output_file == "/second.md"
+
+def test_given_hash_is_stored_without_reading_the_input(history, tmp_path):
+    source = tmp_path / "in.txt"
+    source.write_text("content")
+
+    history.record(result(name=str(source)), content_hash="precomputed")
+    history.record(result(name=str(source)))
+
+    assert history.find("precomputed") is not None
+    assert history.find(compute_file_hash(source)) is not None
+
+def test_pages_are_newest_first_and_scoped_to_sessions(history):
+    for index in range(5):
+        history.record(result(name=f"{index}.txt"), session_id="a")
+    history.record(result(name="other.txt"), session_id="b")
+
+    assert [e.file_name for e in history.page("a", page=0, page_size=2)] == ["4.txt", "3.txt"]
+    assert [e.file_name for e in history.page("a", page=2, page_size=2)] == ["0.txt"]
+    assert history.count("a") == 5
+    assert history.count() == 6
+
+def test_prune_keeps_newest_entries(history):
+    for index in range(10):
+        history.record(result(name=f"{index}.txt"))
+
+    assert history.prune(3) == 7
+
+    assert [e.file_name for e in history.page()] == ["9.txt", "8.txt", "7.txt"]
+
+def test_database_runs_in_wal_mode(history):
+    mode = history._connection().execute("PRAGMA journal_mode").fetchone()[0]
+
+    assert mode == "wal"
+
+def test_concurrent_writers(history):
+    def write(thread):
+        for index in range(20):
+            history.record(result(name=f"{thread}-{index}.txt"), session_id=str(thread))
+
+    threads = [threading.Thread(target=write, args=(thread,)) for thread in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert history.count() == 80
+    assert all(history.count(str(thread)) == 20 for thread in range(4))
@@ -0,0 +1,70 @@
+"""
+Tests for conversions in supervised worker processes
+"""
+import os
+
+import pytest
+
+from src.utils.cache import ConversionCache
+from src.utils.isolation import LIMIT_MEMORY, LIMIT_TIMEOUT, IsolatedConverter, process_rss
+
+@pytest.fixture
+def isolated():
+    converters = []
+
+    def build(**kwargs):
+        converter = IsolatedConverter(fast_paths=True, **kwargs)
+        converters.append(converter)
+        return converter
+    yield build
+    for converter in converters:
+        converter.close()
+
+def make_input(directory, name="doc.txt", text="hello"):
+    path = directory / name
+    path.write_text(text)
+    return path
+
+def test_converts_in_a_child_process(tmp_path, isolated):
+    converter = isolated()
+    progress = []
+
+    result = converter.convert_file_streaming(make_input(tmp_path), output_dir=tmp_path / "out",
+                                              on_progress=progress.append)
+
+    assert result.success
+    assert (tmp_path / "out" / "doc.md").read_text() == "hello"
+    assert [p.text for p in progress] == ["hello"]
+    assert converter._process.pid != os.getpid()
+
+def test_timeouts_kill_the_child_and_the_next_conversion_gets_a_new_one(tmp_path, isolated):
+    converter = isolated(timeout=0.001)
+    path = make_input(tmp_path)
+
+    result = converter.convert_file(path)
+
+    assert not result.success
+    assert result.limit_exceeded == LIMIT_TIMEOUT
+    assert "time limit" in result.error
+    assert converter.restarts == 1 and converter._process is None
+    converter.timeout = 30
+    assert converter.convert_file(path).success
+
+def test_invalid_files_and_cache_hits_never_reach_the_child(tmp_path, isolated):
+    converter = isolated(cache=ConversionCache())
+    path = make_input(tmp_path)
+    converter.convert_file(path)
+    converter.close()
+
+    cached = converter.convert_file(path)
+    missing = converter.convert_file(tmp_path / "missing.txt")
+
+    assert cached.success and cached.cached
+    assert not missing.success
+    assert converter._process is None
+
+def test_limit_messages_and_rss(isolated):
+    converter = isolated(max_rss_bytes=256 * 1024 * 1024)
+
+    assert "256MB memory limit" in converter._limit_message(LIMIT_MEMORY)
+    assert process_rss(os.getpid()) > 0
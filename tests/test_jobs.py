@@ -0,0 +1,92 @@
+"""
+Tests for background conversion jobs
+"""
+import threading
+import time
+
+import pytest
+
+from conftest import FastPool
+from src.utils.jobs import JobManager, JobStatus, QueueFullError
+from src.utils.spool import SpoolManager
+
+@pytest.fixture
+def gate():
+    """Event the workers wait on before converting; set it to let them run"""
+    event = threading.Event()
+    yield event
+    event.set()
+
+def make_input(directory, name="doc.txt", text="hello"):
+    path = directory / name
+    path.write_text(text)
+    return path
+
+def test_jobs_convert_in_the_background(tmp_path, fast_pool):
+    jobs = JobManager(pool=fast_pool, max_workers=1)
+    job = jobs.submit(make_input(tmp_path), output_dir=tmp_path / "out")
+
+    finished = jobs.wait(job.job_id, timeout=5)
+
+    assert finished.status is JobStatus.DONE
+    assert finished.result.success
+    assert finished.output_file == str(tmp_path / "out" / "doc.md")
+    assert finished.progress == 1.0
+    assert finished.run_time >= 0 and finished.queue_wait >= 0
+    jobs.shutdown()
+
+def test_streaming_jobs_drop_content_when_asked(tmp_path, fast_pool):
+    jobs = JobManager(pool=fast_pool, max_workers=1, keep_content=False)
+    job = jobs.submit(make_input(tmp_path), stream=True)
+
+    jobs.wait(job.job_id, timeout=5)
+
+    assert job.result.success and job.result.content is None
+    assert "hello" in (tmp_path / "doc.md").read_text()
+    jobs.shutdown()
+
+def test_full_queue_rejects_new_jobs(tmp_path, gate):
+    jobs = JobManager(pool=FastPool(gate=gate), max_workers=1, max_pending=1)
+    running = jobs.submit(make_input(tmp_path, "a.txt"))
+    while running.status is JobStatus.QUEUED:
+        time.sleep(0.01)
+    jobs.submit(make_input(tmp_path, "b.txt"))
+
+    with pytest.raises(QueueFullError):
+        jobs.submit(make_input(tmp_path, "c.txt"))
+    assert jobs.pending_count() == 1
+    assert jobs.stats()["running"] == 1
+    gate.set()
+    jobs.shutdown()
+
+def test_finished_jobs_are_forgotten_after_retention(tmp_path, fast_pool):
+    jobs = JobManager(pool=fast_pool, max_workers=1, retention=0)
+    first = jobs.submit(make_input(tmp_path, "a.txt"))
+    jobs.wait(first.job_id, timeout=5)
+
+    second = jobs.submit(make_input(tmp_path, "b.txt"))
+
+    assert jobs.get(first.job_id) is None
+    assert jobs.get(second.job_id) is second
+    jobs.shutdown()
+
+def test_inputs_are_held_in_the_spool_until_the_job_finishes(tmp_path, gate):
+    spool = SpoolManager(tmp_path / "spool", quota_bytes=None)
+    upload = make_input(spool.upload_dir("session"))
+    jobs = JobManager(pool=FastPool(gate=gate), max_workers=1, spool=spool)
+
+    job = jobs.submit(upload)
+
+    assert spool.stats.held_files == 1
+    gate.set()
+    jobs.wait(job.job_id, timeout=5)
+    assert spool.stats.held_files == 0
+    jobs.shutdown()
+
+def test_unknown_jobs(fast_pool):
+    jobs = JobManager(pool=fast_pool, max_workers=1)
+
+    assert jobs.get("missing") is None
+    assert jobs.wait("missing") is None
+    assert jobs.queue_position("missing") == 0
+    jobs.shutdown()
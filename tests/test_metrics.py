@@ -0,0 +1,80 @@
+"""
+Tests for stage timing and the metrics registry
+"""
+import time
+
+from src.utils.converters import ConversionResult, MarkdownConverter
+from src.utils.metrics import MetricsRegistry, StageTimer, record_conversion
+
+def test_stage_timer_accumulates_repeated_stages():
+    timer = StageTimer()
+    for _ in range(2):
+        with timer.stage('parse'):
+            time.sleep(0.01)
+    try:
+        with timer.stage('write'):
+            raise ValueError
+    except ValueError:
+        pass
+
+    timings = timer.finish()
+
+    assert timings['parse'] >= 0.02
+    assert 'write' in timings
+    assert timings['total'] >= timings['parse'] + timings['write']
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    for value in (0.1, 0.3, 2.0, 500.0):
+        registry.observe('latency', 'Latency', value, buckets=(0.1, 0.5, 1.0), format='pdf')
+
+    series = registry.get('latency').series[(('format', 'pdf'),)]
+
+    assert series.buckets == [1, 2, 2]
+    assert series.count == 4 and series.sum == 502.4
+    assert series.quantile(0.5, (0.1, 0.5, 1.0)) == 0.5
+    assert series.quantile(0.95, (0.1, 0.5, 1.0)) == float('inf')
+
+def test_prometheus_export():
+    registry = MetricsRegistry()
+    registry.inc('requests_total', 'Requests', path='a"b\\c\nd')
+    registry.inc('requests_total', 'Requests', 2, path='a"b\\c\nd')
+    registry.observe('latency', 'Latency', 0.25, buckets=(0.5, 1.0))
+
+    assert registry.export_prometheus() == (
+        "# HELP latency Latency\n"
+        "# TYPE latency histogram\n"
+        'latency_bucket{le="0.5"} 1\n'
+        'latency_bucket{le="1"} 1\n'
+        'latency_bucket{le="+Inf"} 1\n'
+        "latency_sum 0.25\n"
+        "latency_count 1\n"
+        "# HELP requests_total Requests\n"
+        "# TYPE requests_total counter\n"
+        'requests_total{path="a\\"b\\\\c\\nd"} 3\n'
+    )
+
+def test_record_conversion_feeds_the_format_summary():
+    registry = MetricsRegistry()
+    ok = ConversionResult(success=True, detected_format='txt', input_bytes=1024 * 1024, output_bytes=10)
+    ok.timings = {'parse': 0.2, 'total': 0.3}
+    failed = ConversionResult(success=False, detected_format='txt')
+    cached = ConversionResult(success=True, detected_format='txt', cached=True)
+
+    for result in (ok, failed, cached):
+        record_conversion(result, registry)
+
+    row = registry.format_summary()['txt']
+    assert (row['conversions'], row['errors'], row['cached']) == (3, 1, 1)
+    assert row['input_mb'] == 1.0
+    assert row['mean_s'] == 0.3
+    assert registry.get('murkdown_stage_seconds').series[(('format', 'txt'), ('stage', 'parse'))].count == 1
+
+def test_conversions_report_stage_timings(tmp_path):
+    path = tmp_path / "doc.txt"
+    path.write_text("hello")
+
+    result = MarkdownConverter(fast_paths=True).convert_file(path)
+
+    assert {'validate', 'parse', 'write', 'total'} <= set(result.timings)
+    assert result.detected_format == 'txt'
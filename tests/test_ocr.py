@@ -0,0 +1,56 @@
+"""
+Tests for the OCR stage
+"""
+import pytest
+
+from benchmarks.corpus import generate_corpus
+from src.utils.converters import _append_ocr_text
+from src.utils.ocr import has_text_layer, iter_pdf_pages_ocr, ocr_available
+
+def test_text_layer_threshold_ignores_whitespace():
+    assert has_text_layer("x" * 32)
+    assert not has_text_layer(" \n\f".join("x" * 31))
+    assert has_text_layer("abc", min_chars=3)
+
+def test_recognized_text_is_appended_as_a_section():
+    assert _append_ocr_text("![photo](a.png)\n", " Hello \n") == "![photo](a.png)\n\n## Text (OCR)\n\nHello\n"
+    assert _append_ocr_text("", "Hello") == "## Text (OCR)\n\nHello\n"
+    assert _append_ocr_text("# Image", "  ") == "# Image"
+    assert _append_ocr_text(None, "") == ""
+
+def test_skew_is_estimated_from_text_lines():
+    pytest.importorskip("numpy")
+    image_module = pytest.importorskip("PIL.Image")
+    from PIL import ImageDraw
+    from src.utils.ocr import estimate_skew, preprocess
+
+    page = image_module.new("L", (600, 600), 255)
+    draw = ImageDraw.Draw(page)
+    for y in range(60, 560, 40):
+        draw.rectangle((50, y, 550, y + 8), fill=0)
+    tilted = page.rotate(3, resample=image_module.BICUBIC, fillcolor=255)
+
+    assert estimate_skew(page) == 0.0
+    assert estimate_skew(tilted) == pytest.approx(-3.0, abs=0.5)
+    assert preprocess(tilted.convert("RGB")).mode == "L"
+
+def test_pages_with_a_text_layer_skip_ocr(tmp_path):
+    pytest.importorskip("pdfminer")
+    (pdf,) = generate_corpus(tmp_path, ["pdf"], sizes={"small": 2})
+
+    pages = list(iter_pdf_pages_ocr(pdf.path, ocr_workers=1))
+
+    assert len(pages) == 2
+    assert all(has_text_layer(page) and page.endswith("\f") for page in pages)
+
+@pytest.mark.skipif(not ocr_available(), reason="needs pytesseract, Pillow, numpy and tesseract")
+def test_images_are_recognized(tmp_path):
+    from PIL import Image, ImageDraw, ImageFont
+    from src.utils.ocr import ocr_image_file
+
+    image = Image.new("RGB", (900, 200), "white")
+    ImageDraw.Draw(image).text((40, 60), "MURKDOWN", fill="black", font=ImageFont.load_default(size=80))
+    path = tmp_path / "word.png"
+    image.save(path)
+
+    assert "MURKDOWN" in ocr_image_file(path)
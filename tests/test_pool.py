@@ -0,0 +1,60 @@
+"""
+Tests for the shared converter pool
+"""
+import threading
+import time
+
+import pytest
+
+from src.utils.cache import ConversionCache
+from src.utils.pool import ConverterPool, PoolTimeoutError
+
+def test_converters_are_reused_and_share_the_cache():
+    cache = ConversionCache()
+    pool = ConverterPool(size=2, cache=cache, warm=False)
+
+    with pool.lease() as first:
+        with pool.lease() as second:
+            assert first is not second
+            assert pool.stats.in_use == 2
+    with pool.lease() as again:
+        assert again in (first, second)
+
+    assert first.cache is cache and second.cache is cache
+    stats = pool.stats
+    assert (stats.in_use, stats.peak_in_use, stats.checkouts) == (0, 2, 3)
+
+def test_checkout_times_out_when_exhausted():
+    pool = ConverterPool(size=1, warm=False)
+
+    with pool.lease():
+        with pytest.raises(PoolTimeoutError):
+            pool.checkout(timeout=0.01)
+
+    assert pool.stats.timeouts == 1
+    assert pool.stats.in_use == 0
+
+def test_waiting_checkouts_get_returned_converters():
+    pool = ConverterPool(size=1, warm=False)
+    converter = pool.checkout()
+    leased = []
+    waiter = threading.Thread(target=lambda: leased.append(pool.checkout(timeout=5)))
+    waiter.start()
+    while pool.stats.waiting == 0:
+        time.sleep(0.001)
+
+    pool.checkin(converter)
+    waiter.join()
+
+    assert leased == [converter]
+    assert pool.stats.saturation == 1.0
+
+def test_stats_properties():
+    pool = ConverterPool(size=4, warm=False)
+
+    with pool.lease():
+        stats = pool.stats
+
+    assert stats.available == 3
+    assert stats.saturation == 0.25
+    assert stats.average_wait >= 0
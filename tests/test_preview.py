@@ -0,0 +1,61 @@
+"""
+Tests for the windowed Markdown preview
+"""
+from src.utils import preview
+from src.utils.preview import MarkdownPreview, open_preview
+
+def test_pages_split_on_line_boundaries(tmp_path):
+    path = tmp_path / "doc.md"
+    path.write_text("".join(f"line {i}\n" for i in range(25)))
+
+    doc = MarkdownPreview(path, lines_per_page=10)
+
+    assert doc.line_count == 25
+    assert doc.page_count == 3
+    assert doc.read_page(0) == ("".join(f"line {i}\n" for i in range(10)), False)
+    assert doc.read_page(2) == ("".join(f"line {i}\n" for i in range(20, 25)), False)
+    assert doc.read_page(3) == ("", False)
+    assert doc.page_of_line(24) == 2
+    assert doc.page_of_line(99) == 2
+
+def test_empty_file_has_one_page(tmp_path):
+    path = tmp_path / "empty.md"
+    path.write_text("")
+
+    doc = MarkdownPreview(path)
+
+    assert doc.page_count == 1
+    assert doc.read_page(0) == ("", False)
+
+def test_outline_skips_fenced_code(tmp_path):
+    path = tmp_path / "doc.md"
+    path.write_text("# Title\ntext\n```\n# not a heading\n```\n## Section ##\n#nospace\n")
+
+    outline = MarkdownPreview(path).outline
+
+    assert [(h.level, h.title, h.line) for h in outline] == [(1, "Title", 0), (2, "Section", 5)]
+
+def test_windows_are_capped(tmp_path, monkeypatch):
+    monkeypatch.setattr(preview, "MAX_WINDOW_BYTES", 8)
+    path = tmp_path / "doc.md"
+    path.write_text("0123456789\nabc\n")
+
+    doc = MarkdownPreview(path)
+
+    assert doc.read_lines(0, 2) == ("01234567", True)
+    assert doc.read_lines(1, 2) == ("abc\n", False)
+
+def test_byte_ranges_replace_split_characters(tmp_path):
+    path = tmp_path / "doc.md"
+    path.write_text("aé\n", encoding="utf-8")
+
+    assert MarkdownPreview(path).read_bytes(0, 2) == ("a�", False)
+
+def test_open_preview_reindexes_changed_files(tmp_path):
+    path = tmp_path / "doc.md"
+    path.write_text("one\n")
+    first = open_preview(path)
+
+    assert open_preview(path) is first
+    path.write_text("one\ntwo\n")
+    assert open_preview(path).line_count == 2
@@ -0,0 +1,107 @@
+"""
+Tests for cost-aware fair scheduling
+"""
+import threading
+import time
+
+from conftest import FastPool
+from src.utils.jobs import JobManager, JobStatus
+from src.utils.scheduler import FairScheduler, estimate_cost
+
+def drain(scheduler):
+    items = []
+    while len(scheduler):
+        items.append(scheduler.get(timeout=0))
+    return items
+
+def test_costs_follow_format_and_size(tmp_path):
+    small_txt = tmp_path / "a.txt"
+    small_txt.write_bytes(b"x" * 1024)
+    big_txt = tmp_path / "b.txt"
+    big_txt.write_bytes(b"x" * 4 * 1024 * 1024)
+    small_pdf = tmp_path / "c.pdf"
+    small_pdf.write_bytes(b"x" * 1024)
+
+    assert estimate_cost(small_txt) < estimate_cost(big_txt) < estimate_cost(small_pdf)
+    assert estimate_cost(tmp_path / "missing.mp3") == 1.0
+    assert estimate_cost(tmp_path / "missing.xyz") == 0.2
+
+def test_cheapest_job_of_a_client_goes_first():
+    scheduler = FairScheduler(max_wait=None)
+    for name, cost in (("big", 9.0), ("small", 1.0), ("medium", 3.0), ("small-2", 1.0)):
+        scheduler.put(name, cost, "alice")
+
+    assert scheduler.order() == ["small", "small-2", "medium", "big"]
+    assert drain(scheduler) == ["small", "small-2", "medium", "big"]
+
+def test_clients_share_the_workers():
+    scheduler = FairScheduler(max_wait=None)
+    for i in range(4):
+        scheduler.put(f"a{i}", 2.0, "alice")
+    scheduler.put("b0", 2.0, "bob")
+    scheduler.put("b1", 2.0, "bob")
+
+    assert drain(scheduler) == ["a0", "b0", "a1", "b1", "a2", "a3"]
+
+def test_small_jobs_overtake_a_large_one_from_another_client():
+    scheduler = FairScheduler(max_wait=None)
+    scheduler.put("huge", 100.0, "alice")
+    for i in range(3):
+        scheduler.put(f"tiny{i}", 0.1, "bob")
+
+    assert drain(scheduler) == ["tiny0", "tiny1", "tiny2", "huge"]
+
+def test_returning_clients_do_not_bank_credit():
+    scheduler = FairScheduler(max_wait=None)
+    for i in range(3):
+        scheduler.put(f"a{i}", 1.0, "alice")
+    assert scheduler.get(timeout=0) == "a0"
+    assert scheduler.get(timeout=0) == "a1"
+    # Bob was idle while Alice was served; he starts at the current virtual time,
+    # not 2s behind her, so he does not get all his jobs in before her next one
+    for i in range(3):
+        scheduler.put(f"b{i}", 1.0, "bob")
+
+    assert drain(scheduler) == ["b0", "a2", "b1", "b2"]
+
+def test_starving_jobs_are_dispatched_next():
+    scheduler = FairScheduler(max_wait=0.05)
+    scheduler.put("huge", 100.0, "alice")
+    time.sleep(0.06)
+    scheduler.put("tiny", 0.1, "bob")
+
+    assert scheduler.order() == ["huge", "tiny"]
+    assert drain(scheduler) == ["huge", "tiny"]
+    assert scheduler.expedited == 1
+
+def test_get_waits_for_items_and_close_releases_waiters():
+    scheduler = FairScheduler()
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(scheduler.get(timeout=5)))
+    waiter.start()
+    scheduler.put("job", 1.0)
+    waiter.join()
+
+    assert results == ["job"]
+    assert scheduler.get(timeout=0.01) is None
+    scheduler.close()
+    assert scheduler.get() is None
+
+def test_queue_positions_follow_the_schedule(tmp_path):
+    gate = threading.Event()
+    jobs = JobManager(pool=FastPool(gate=gate), max_workers=1, max_wait=None)
+    inputs = {}
+    for name, size in (("running", 1), ("big", 8 * 1024 * 1024), ("small", 1)):
+        inputs[name] = tmp_path / f"{name}.txt"
+        inputs[name].write_bytes(b"x" * size)
+    running = jobs.submit(inputs["running"], client_id="alice")
+    while running.status is JobStatus.QUEUED:
+        time.sleep(0.01)
+    big = jobs.submit(inputs["big"], client_id="alice")
+    small = jobs.submit(inputs["small"], client_id="bob")
+
+    positions = [jobs.queue_position(job.job_id) for job in (running, small, big)]
+    assert positions == [0, 0, 1]
+    gate.set()
+    jobs.shutdown()
+    assert big.done and small.finished_at <= big.finished_at
@@ -0,0 +1,150 @@
+"""
+Tests for the HTTP conversion service
+"""
+import http.client
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from conftest import FastPool
+from src.server import ConversionService, make_server
+from src.utils.file_handlers import compute_buffer_hash
+from src.utils.history import HistoryStore
+
+@pytest.fixture
+def serve(tmp_path):
+    """Start a server on a free port; yields a factory taking ConversionService options"""
+    servers = []
+
+    def start(pool=None, **options):
+        service = ConversionService(
+            workers=1,
+            spool_dir=tmp_path / "spool",
+            pool=pool or FastPool(),
+            history=HistoryStore(tmp_path / "history.sqlite3"),
+            **options
+        )
+        server = make_server("127.0.0.1", 0, service)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return service, server.server_port
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+def request(port, method, path, body=None):
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    connection.request(method, path, body=body)
+    response = connection.getresponse()
+    data = response.read()
+    connection.close()
+    return response.status, dict(response.getheaders()), data
+
+def spooled_files(service):
+    # os.walk tolerates directories removed while it runs
+    return [Path(root) / name for root, _, names in os.walk(service.spool.root) for name in names]
+
+def wait_until(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+def test_convert_returns_markdown_and_deletes_files(serve):
+    service, port = serve()
+
+    status, headers, body = request(port, "POST", "/convert?filename=note.txt", b"hello   world\n")
+
+    assert status == 200
+    assert headers["Content-Type"].startswith("text/markdown")
+    assert body.decode("utf-8").strip() == "hello   world"
+    assert wait_until(lambda: not spooled_files(service))
+
+def test_job_result_can_be_downloaded_once(serve):
+    service, port = serve()
+
+    status, headers, body = request(port, "POST", "/jobs?filename=note.txt", b"queued text\n")
+    assert status == 202
+    job_id = json.loads(body)["job_id"]
+    assert headers["Location"] == f"/jobs/{job_id}"
+    service.jobs.wait(job_id, 5)
+
+    status, _, body = request(port, "GET", f"/jobs/{job_id}")
+    payload = json.loads(body)
+    assert payload["status"] == "done" and payload["success"] is True
+    assert {"estimated_cost", "queue_wait", "run_time"} <= payload.keys()
+
+    # The history gets the hash the spool computed while receiving the body
+    entry = service.jobs.history.page()[0]
+    assert entry.content_hash == compute_buffer_hash(b"queued text\n")
+
+    assert request(port, "GET", f"/jobs/{job_id}/result")[2].strip() == b"queued text"
+    assert wait_until(lambda: not spooled_files(service))
+    assert request(port, "GET", f"/jobs/{job_id}/result")[0] == 410
+
+def test_files_of_forgotten_jobs_are_deleted(serve):
+    service, port = serve(retention=0)
+
+    first = json.loads(request(port, "POST", "/jobs?filename=a.txt", b"first\n")[2])["job_id"]
+    service.jobs.wait(first, 5)
+    assert spooled_files(service)
+
+    # The next upload prunes the expired job and its files
+    second = json.loads(request(port, "POST", "/jobs?filename=b.txt", b"second\n")[2])["job_id"]
+    service.jobs.wait(second, 5)
+
+    assert service.jobs.get(first) is None
+    assert sorted(p.name for p in spooled_files(service)) == ["b.md", "b.txt"]
+
+def test_full_queue_answers_429(serve):
+    gate = threading.Event()
+    service, port = serve(pool=FastPool(gate=gate), max_pending=1)
+    try:
+        running = json.loads(request(port, "POST", "/jobs?filename=a.txt", b"a\n")[2])["job_id"]
+        assert wait_until(lambda: service.jobs.get(running).status.value == "running")
+        assert request(port, "POST", "/jobs?filename=b.txt", b"b\n")[0] == 202
+
+        status, headers, body = request(port, "POST", "/jobs?filename=c.txt", b"c\n")
+
+        assert status == 429
+        assert headers["Retry-After"].isdigit()
+        assert "full" in json.loads(body)["error"]
+    finally:
+        gate.set()
+
+def test_upload_beyond_spool_quota_answers_507(serve):
+    service, port = serve(spool_quota_bytes=16)
+
+    status, headers, _ = request(port, "POST", "/jobs?filename=big.txt", b"x" * 64)
+
+    assert status == 507
+    assert "Retry-After" in headers
+    assert not spooled_files(service)
+
+@pytest.mark.parametrize("path, expected", [
+    ("/jobs?filename=", 400),
+    ("/jobs?filename=tool.exe", 415),
+    ("/nowhere", 404),
+])
+def test_rejected_uploads(serve, path, expected):
+    _, port = serve()
+
+    assert request(port, "POST", path, b"data")[0] == expected
+
+def test_health_reports_job_counts(serve):
+    _, port = serve()
+
+    status, _, body = request(port, "GET", "/health")
+
+    payload = json.loads(body)
+    assert status == 200
+    assert payload["jobs"]["workers"] == 1
+    assert payload["pool"]["size"] == 1
@@ -0,0 +1,90 @@
+"""
+Tests for content sniffing and format checks
+"""
+import codecs
+import io
+import zipfile
+
+import pytest
+
+from src.utils.converters import MarkdownConverter, _route_extension
+from src.utils.sniff import check_format, sniff_bytes, sniff_file, sniff_stream
+
+@pytest.mark.parametrize("header, expected", [
+    (b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n", "pdf"),
+    (b"\r\n  %PDF-1.4\n", "pdf"),
+    (codecs.BOM_UTF8 + b"%PDF-1.5\n", "pdf"),
+    (b"\x89PNG\r\n\x1a\n" + b"\x00" * 8, "png"),
+    (b"\xff\xd8\xff\xe0\x00\x10JFIF", "jpg"),
+    (b"RIFF\x24\x00\x00\x00WAVEfmt ", "wav"),
+    (b"ID3\x04\x00\x00\x00\x00\x00\x00", "mp3"),
+    (b"<!DOCTYPE html><html><body>hi</body></html>", "html"),
+    (b"plain words\n", "txt"),
+    ("café crème\n".encode("utf-8"), "txt"),
+    (b"", "txt"),
+    (b"\x00\x01\x02\x03\x04binary", None),
+])
+def test_signatures(header, expected):
+    assert sniff_bytes(header) == expected
+
+@pytest.mark.parametrize("text", [
+    b"Notes on the format: every file starts with %PDF-1.7 and ends with %%EOF.\n",
+    b"<html><body><p>Header bytes are %PDF-1.4</p></body></html>",
+    b"# Markdown\n\n`%PDF-` marks a PDF.\n",
+])
+def test_text_mentioning_pdf_signature_is_not_pdf(text):
+    assert sniff_bytes(text) in ("txt", "html")
+    assert check_format("txt", sniff_bytes(text)) is None
+
+def test_office_package_is_identified_from_its_parts(tmp_path):
+    path = tmp_path / "doc.docx"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("[Content_Types].xml", "<Types/>")
+        archive.writestr("word/document.xml", "<w:document/>")
+
+    assert sniff_file(path) == "docx"
+
+def test_plain_zip_is_zip(tmp_path):
+    path = tmp_path / "a.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("a.txt", "x")
+
+    assert sniff_file(path) == "zip"
+
+def test_sniff_stream_restores_position():
+    stream = io.BytesIO(b"xx%PDF-1.7\n")
+    stream.seek(2)
+
+    assert sniff_stream(stream) == "pdf"
+    assert stream.tell() == 2
+
+def test_sniff_file_sees_changes(tmp_path):
+    path = tmp_path / "f.bin"
+    path.write_bytes(b"plain text")
+    assert sniff_file(path) == "txt"
+
+    path.write_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * 16)
+
+    assert sniff_file(path) == "png"
+
+def test_check_format():
+    assert check_format("html", "txt") is None
+    assert check_format("jpeg", "jpg") is None
+    assert "PNG" in check_format("pdf", "png")
+    assert "Could not recognize" in check_format("pdf", None)
+
+def test_mismatched_files_are_rejected_before_parsing(tmp_path):
+    disguised = tmp_path / "scan.pdf"
+    disguised.write_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * 16)
+    converter = MarkdownConverter()
+
+    result = converter.convert_file(disguised)
+
+    assert not result.success and "PNG" in result.error
+    assert converter._markitdown is None
+
+def test_route_extension():
+    assert _route_extension("PDF", "pdf") == ".pdf"
+    assert _route_extension("jpeg", "jpg") == ".jpg"
+    assert _route_extension("html", "txt") == ".html"
+    assert _route_extension("txt", None) == ".txt"
@@ -0,0 +1,161 @@
+"""
+Tests for the upload spool: leases, TTL reaping, holds and the quota
+"""
+import os
+import threading
+import time
+
+import pytest
+
+from src.utils.spool import SpoolFullError, SpoolManager
+
+def age(path, seconds):
+    """Move a directory's lease back in time"""
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+def spool_file(directory, name, size):
+    target = directory / name
+    target.write_bytes(b"x" * size)
+    return target
+
+def test_lapsed_sessions_are_reaped(tmp_path):
+    spool = SpoolManager(tmp_path / "spool", ttl=60, quota_bytes=None)
+    old = spool.touch("old")
+    fresh = spool.touch("fresh")
+    age(old, 120)
+
+    assert spool.reap() == 1
+
+    assert not old.exists()
+    assert fresh.exists()
+    assert spool.stats.reaped_sessions == 1
+
+def test_touch_renews_the_lease(tmp_path):
+    spool = SpoolManager(tmp_path / "spool", ttl=60, quota_bytes=None)
+    session = spool.touch("s")
+    age(session, 120)
+
+    spool.touch("s")
+
+    assert spool.reap() == 0
+    assert session.exists()
+
+def test_held_files_keep_their_session(tmp_path):
+    spool = SpoolManager(tmp_path / "spool", ttl=60, quota_bytes=None)
+    upload = spool_file(spool.upload_dir("s"), "a.txt", 10)
+    age(spool.root / "s", 120)
+
+    with spool.holding(upload):
+        assert spool.reap() == 0
+        spool.remove_session("s")
+        assert upload.exists()
+
+    assert spool.reap() == 1
+    assert not upload.exists()
+
+def test_quota_evicts_least_recently_used_uploads(tmp_path):
+    spool = SpoolManager(tmp_path / "spool", quota_bytes=100)
+    first = spool_file(spool.upload_dir("s", 40), "first.txt", 40)
+    second = spool_file(spool.upload_dir("s", 40), "second.txt", 40)
+    old = time.time() - 100
+    os.utime(first, (old, old))
+
+    spool.upload_dir("s", 40)
+
+    assert not first.exists()
+    assert second.exists()
+    assert spool.stats.evicted_files == 1
+
+def test_quota_never_evicts_held_uploads_or_outputs(tmp_path):
+    spool = SpoolManager(tmp_path / "spool", quota_bytes=100)
+    held = spool_file(spool.upload_dir("s", 60), "held.txt", 60)
+    output = spool_file(spool.output_dir("s"), "held.md", 30)
+    # Outputs are not reserved; the periodic recount picks them up
+    spool.reap()
+
+    with spool.holding(held):
+        with pytest.raises(SpoolFullError):
+            spool.upload_dir("s", 40)
+
+    assert held.exists() and output.exists()
+
+def test_concurrent_reservations_cannot_exceed_the_quota(tmp_path):
+    spool = SpoolManager(tmp_path / "spool", quota_bytes=100)
+    start, done = threading.Barrier(8), threading.Event()
+    granted, rejected = [], []
+
+    def upload(n):
+        start.wait()
+        try:
+            with spool.reserving(f"s{n}", 40):
+                granted.append(n)
+                # Still writing: the reservation must hold
+                done.wait(5)
+        except SpoolFullError:
+            rejected.append(n)
+
+    threads = [threading.Thread(target=upload, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    deadline = time.time() + 5
+    while len(granted) + len(rejected) < 8 and time.time() < deadline:
+        time.sleep(0.01)
+    done.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(granted) == 2
+    assert len(rejected) == 6
+
+def test_failed_save_releases_its_reservation(tmp_path):
+    spool = SpoolManager(tmp_path / "spool", quota_bytes=100)
+
+    with pytest.raises(OSError, match="save failed"):
+        with spool.reserving("s", 80):
+            raise OSError("save failed")
+
+    with spool.reserving("s", 80) as directory:
+        held = spool_file(directory, "a.txt", 80)
+    with spool.holding(held):
+        with pytest.raises(SpoolFullError):
+            spool.upload_dir("s", 40)
+    assert spool.stats.evicted_files == 0
+
+def test_removed_sessions_free_their_space(tmp_path):
+    spool = SpoolManager(tmp_path / "spool", quota_bytes=100)
+    with spool.reserving("a", 80) as directory:
+        spool_file(directory, "a.txt", 80)
+
+    spool.remove_session("a")
+
+    spool.upload_dir("b", 80)
+    assert spool.stats.evicted_files == 0
+
+def test_upload_larger_than_quota_is_rejected(tmp_path):
+    spool = SpoolManager(tmp_path / "spool", quota_bytes=100)
+
+    with pytest.raises(SpoolFullError):
+        spool.upload_dir("s", 101)
+
+def test_small_uploads_go_to_the_ram_spool(tmp_path):
+    spool = SpoolManager(tmp_path / "spool", ram_root=tmp_path / "shm", ram_file_limit=50, quota_bytes=None)
+
+    assert spool.upload_dir("s", 10).is_relative_to(tmp_path / "shm")
+    assert spool.upload_dir("s", 100).is_relative_to(tmp_path / "spool")
+
+@pytest.mark.parametrize("session_id", ["../escape", "a/b", "", "x" * 65])
+def test_invalid_session_ids_are_rejected(tmp_path, session_id):
+    spool = SpoolManager(tmp_path / "spool")
+
+    with pytest.raises(ValueError):
+        spool.touch(session_id)
+
+def test_owns_only_paths_inside_the_spool(tmp_path):
+    spool = SpoolManager(tmp_path / "spool", ram_root=tmp_path / "shm")
+    inside = spool.output_dir("s") / "a.md"
+
+    assert spool.owns(inside)
+    assert spool.owns(spool.ram_root / "s" / "uploads" / "a.txt")
+    assert not spool.owns(tmp_path / "elsewhere.md")
+    assert not spool.owns(spool.root / ".." / "escape.md")
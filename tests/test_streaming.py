@@ -0,0 +1,68 @@
+"""
+Tests for incremental (streaming) conversion
+"""
+from pathlib import Path
+
+import pytest
+
+from benchmarks.corpus import generate_corpus
+from src.utils import streaming
+from src.utils.cache import ConversionCache
+from src.utils.converters import MarkdownConverter
+
+@pytest.fixture
+def paged_txt(monkeypatch):
+    """Stream .txt files one line per piece, observing the output file between pieces"""
+    seen = []
+
+    def iter_lines(file_path, **options):
+        with open(file_path, encoding="utf-8") as f:
+            for line in f:
+                seen.append(Path(file_path).with_suffix(".md").read_text(encoding="utf-8"))
+                yield line
+
+    monkeypatch.setitem(streaming.STREAMING_CONVERTERS, "txt", iter_lines)
+    monkeypatch.setitem(streaming.STREAMING_COUNTERS, "txt", lambda file_path, **options: 3)
+    return seen
+
+def test_pieces_are_flushed_to_the_output_as_they_arrive(tmp_path, paged_txt):
+    path = tmp_path / "doc.txt"
+    path.write_text("one\ntwo\nthree\n")
+    progress = []
+
+    result = MarkdownConverter().convert_file_streaming(path, on_progress=progress.append)
+
+    assert result.success and result.content is None
+    assert Path(result.output_file).read_text() == "one\ntwo\nthree\n"
+    assert paged_txt == ["", "one\n", "one\ntwo\n"]
+    assert [(p.index, p.total, p.text) for p in progress] == [(0, 3, "one\n"), (1, 3, "two\n"), (2, 3, "three\n")]
+
+def test_streamed_outputs_are_cached_and_replayed_whole(tmp_path, paged_txt):
+    converter = MarkdownConverter(cache=ConversionCache())
+    path = tmp_path / "doc.txt"
+    path.write_text("one\ntwo\n")
+    converter.convert_file_streaming(path)
+    progress = []
+
+    result = converter.convert_file_streaming(path, on_progress=progress.append)
+
+    assert result.cached
+    assert [(p.index, p.total, p.text) for p in progress] == [(0, 1, "one\ntwo\n")]
+
+def test_invalid_files_fail_before_streaming(tmp_path, paged_txt):
+    result = MarkdownConverter().convert_file_streaming(tmp_path / "missing.txt")
+
+    assert not result.success and "does not exist" in result.error
+
+def test_pdf_pages_stream_one_at_a_time(tmp_path):
+    pytest.importorskip("pdfminer")
+    (pdf,) = generate_corpus(tmp_path, ["pdf"], sizes={"small": 3})
+    progress = []
+
+    result = MarkdownConverter().convert_file_streaming(pdf.path, output_dir=tmp_path / "out", on_progress=progress.append)
+
+    assert result.success
+    assert streaming.count_pdf_pages(pdf.path) == 3
+    assert [(p.index, p.total) for p in progress] == [(0, 3), (1, 3), (2, 3)]
+    assert all(p.text.endswith("\f") for p in progress)
+    assert Path(result.output_file).read_text(encoding="utf-8") == "".join(p.text for p in progress)
@@ -0,0 +1,123 @@
+"""
+Tests for incremental directory sync and its manifest
+"""
+import json
+import os
+import threading
+
+import pytest
+
+from src.utils import sync as sync_module
+from src.utils.converters import MarkdownConverter
+from src.utils.sync import MANIFEST_NAME, DirectorySync
+
+@pytest.fixture
+def tree(tmp_path):
+    source = tmp_path / "src"
+    (source / "sub").mkdir(parents=True)
+    (source / "a.txt").write_text("alpha")
+    (source / "sub" / "b.txt").write_text("beta")
+    (source / "skip.exe").write_bytes(b"MZ")
+    return source
+
+@pytest.fixture
+def hashed(monkeypatch):
+    """Relative names of the files hashed by sync passes"""
+    calls = []
+    real_hash = sync_module.compute_file_hash
+
+    def counting_hash(path):
+        calls.append(path.name)
+        return real_hash(path)
+    monkeypatch.setattr(sync_module, "compute_file_hash", counting_hash)
+    return calls
+
+def make_sync(source, output, **options):
+    return DirectorySync(source, output, converter=MarkdownConverter(fast_paths=True), **options)
+
+def test_first_pass_mirrors_the_tree(tree, tmp_path):
+    out = tmp_path / "out"
+
+    report = make_sync(tree, out).sync()
+
+    assert sorted(report.converted) == ["a.txt", "sub/b.txt"]
+    assert (out / "a.md").read_text() == "alpha"
+    assert (out / "sub" / "b.md").read_text() == "beta"
+    manifest = json.loads((out / MANIFEST_NAME).read_text())
+    assert manifest["files"]["sub/b.txt"]["outputs"] == ["sub/b.md"]
+
+def test_unchanged_files_are_not_read(tree, tmp_path, hashed):
+    make_sync(tree, tmp_path / "out").sync()
+    hashed.clear()
+
+    report = make_sync(tree, tmp_path / "out").sync()
+
+    assert (report.converted, report.unchanged, hashed) == ([], 2, [])
+    assert not report.changed
+
+def test_touched_files_with_the_same_content_are_restamped(tree, tmp_path, hashed):
+    make_sync(tree, tmp_path / "out").sync()
+    os.utime(tree / "a.txt", ns=(1, 1))
+    hashed.clear()
+
+    report = make_sync(tree, tmp_path / "out").sync()
+    again = make_sync(tree, tmp_path / "out").sync()
+
+    assert (report.converted, report.unchanged, hashed) == ([], 2, ["a.txt"])
+    assert again.unchanged == 2 and hashed == ["a.txt"]
+
+def test_changed_and_deleted_sources(tree, tmp_path):
+    out = tmp_path / "out"
+    make_sync(tree, out).sync()
+    (tree / "a.txt").write_text("alpha two")
+    (tree / "sub" / "b.txt").unlink()
+
+    report = make_sync(tree, out).sync()
+
+    assert report.converted == ["a.txt"] and report.removed == ["sub/b.txt"]
+    assert (out / "a.md").read_text() == "alpha two"
+    assert not (out / "sub").exists()
+
+def test_missing_outputs_and_option_changes_force_reconversion(tree, tmp_path):
+    out = tmp_path / "out"
+    make_sync(tree, out).sync()
+    (out / "a.md").unlink()
+
+    assert make_sync(tree, out).sync().converted == ["a.txt"]
+    assert sorted(make_sync(tree, out, max_rows=5).sync().converted) == ["a.txt", "sub/b.txt"]
+
+def test_unreadable_manifest_starts_fresh(tree, tmp_path):
+    out = tmp_path / "out"
+    make_sync(tree, out).sync()
+    (out / MANIFEST_NAME).write_text("{not json")
+
+    assert len(make_sync(tree, out).sync().converted) == 2
+
+def test_targeted_passes_only_examine_the_named_paths(tree, tmp_path):
+    out = tmp_path / "out"
+    syncer = make_sync(tree, out)
+    syncer.sync()
+    (tree / "a.txt").write_text("changed")
+    (tree / "sub" / "b.txt").unlink()
+    (tree / "c.txt").write_text("new")
+
+    report = syncer.sync([tree / "c.txt", tree / "sub" / "b.txt", tmp_path / "elsewhere.txt"])
+
+    assert (report.converted, report.removed) == (["c.txt"], ["sub/b.txt"])
+    assert (out / "a.md").read_text() == "alpha"
+
+def test_syncs_in_place_without_an_output_dir(tree):
+    syncer = make_sync(tree, None, recursive=False)
+
+    assert syncer.sync().converted == ["a.txt"]
+    assert (tree / "a.md").read_text() == "alpha"
+    assert syncer.sync().unchanged == 1
+
+def test_watch_syncs_before_waiting(tree, tmp_path):
+    stop = threading.Event()
+    stop.set()
+    reports = []
+
+    make_sync(tree, tmp_path / "out").watch(on_report=reports.append, stop=stop, poll_interval=0.01)
+
+    assert len(reports) == 1 and len(reports[0].converted) == 2
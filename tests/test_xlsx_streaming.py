@@ -0,0 +1,73 @@
+"""
+Tests for memory-bounded streaming Excel conversion
+"""
+import pytest
+
+from src.utils.converters import MarkdownConverter
+from src.utils.streaming import _format_cell, _row_width, _table_row
+
+def test_rows_are_padded_cut_and_escaped():
+    assert _row_width(("a", None, "c", None, None)) == 3
+    assert _row_width((None, None)) == 1
+    assert _table_row(("a", 1), 3) == "| a | 1 |  |"
+    assert _table_row(("a", "b", "c"), 2) == "| a | b |"
+    assert _format_cell("x|y\r\nz\nw") == "x\\|y<br>z<br>w"
+    assert _format_cell(None) == ""
+
+@pytest.fixture
+def workbook(tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    path = tmp_path / "book.xlsx"
+    book = openpyxl.Workbook()
+    sales = book.active
+    sales.title = "Sales 2024"
+    sales.append(["Region", "Total", None])
+    for i in range(5):
+        sales.append([f"r{i}", i * 10, "extra"])
+    book.create_sheet("Empty")
+    book.save(path)
+    return path
+
+def test_sheets_stream_in_row_batches(workbook):
+    from src.utils.streaming import count_xlsx_batches, iter_xlsx
+
+    pieces = list(iter_xlsx(workbook, batch_rows=4))
+
+    assert pieces[0] == "## Sales 2024\n\n| Region | Total |\n| --- | --- |\n| r0 | 0 |\n"
+    assert "".join(pieces).endswith("| r4 | 40 |\n\n## Empty\n\n")
+    assert len(pieces) == 4
+    assert count_xlsx_batches(workbook, batch_rows=4) == 3
+
+def test_row_and_column_limits(workbook):
+    from src.utils.streaming import iter_xlsx
+
+    text = "".join(iter_xlsx(workbook, max_rows=2, max_cols=1))
+
+    assert "| Region |\n| --- |\n| r0 |\n| r1 |\n\n*Truncated after 2 rows*" in text
+    assert "r2" not in text
+
+def test_one_file_per_sheet(workbook, tmp_path):
+    result = MarkdownConverter().convert_sheets(workbook, output_dir=tmp_path / "out")
+
+    assert result.success
+    assert [p.rsplit("/", 1)[1] for p in result.output_files] == ["01-Sales_2024.md", "02-Empty.md"]
+    assert (tmp_path / "out" / "book-sheets" / "02-Empty.md").read_text() == "## Empty\n\n"
+
+def test_streaming_conversion_writes_the_whole_workbook(workbook, tmp_path):
+    progress = []
+
+    result = MarkdownConverter().convert_file_streaming(workbook, output_dir=tmp_path / "out", max_rows=3,
+                                                        on_progress=progress.append)
+
+    assert result.success
+    text = (tmp_path / "out" / "book.md").read_text()
+    assert text == "".join(p.text for p in progress)
+    assert "*Truncated after 3 rows*" in text and "## Empty" in text
+
+def test_batch_size_does_not_change_the_output(workbook):
+    from src.utils.streaming import iter_xlsx
+
+    expected = "".join(iter_xlsx(workbook))
+
+    for batch_rows in range(1, 9):
+        assert "".join(iter_xlsx(workbook, batch_rows=batch_rows)) == expected